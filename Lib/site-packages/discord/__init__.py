@@ -18,7 +18,8 @@ __version__ = '2.5.2'
 __path__ = __import__('pkgutil').extend_path(__path__, __name__)
 
 import logging
-from typing import NamedTuple, Literal
+import os
+from typing import Any, Dict, List, NamedTuple, Literal, Tuple
 
 from .client import *
 from .appinfo import *
@@ -47,7 +48,6 @@ from .object import *
 from .reaction import *
 from . import (
     utils as utils,
-    opus as opus,
     abc as abc,
     ui as ui,
     app_commands as app_commands,
@@ -55,13 +55,10 @@ from . import (
 from .enums import *
 from .embeds import *
 from .mentions import *
-from .shard import *
-from .player import *
 from .webhook import *
 from .voice_client import *
 from .audit_logs import *
 from .raw_models import *
-from .team import *
 from .sticker import *
 from .stage_instance import *
 from .scheduled_event import *
@@ -75,6 +72,54 @@ from .subscription import *
 from .presences import *
 
 
+# Submodules nothing else in the library imports at load time. With the
+# DISCORD_LAZY_IMPORTS environment variable set they are only imported the
+# first time one of their names is accessed, which keeps the voice stack
+# (opus, ctypes, subprocess, audioop) out of processes that never use voice.
+# Key: submodule name, Value: the public names it exports
+_lazy_submodules: Dict[str, Tuple[str, ...]] = {
+    'opus': (),
+    'player': (
+        'AudioSource',
+        'PCMAudio',
+        'FFmpegAudio',
+        'FFmpegPCMAudio',
+        'FFmpegOpusAudio',
+        'PCMVolumeTransformer',
+    ),
+    'shard': ('AutoShardedClient', 'ShardInfo', 'SessionStartLimits'),
+    'team': ('Team', 'TeamMember'),
+}
+_lazy_names: Dict[str, str] = {name: module for module, names in _lazy_submodules.items() for name in names}
+
+if os.environ.get('DISCORD_LAZY_IMPORTS'):
+
+    def __getattr__(name: str) -> Any:
+        import importlib
+
+        if name in _lazy_submodules:
+            # importing a submodule binds it on the package by itself
+            return importlib.import_module(f'.{name}', __name__)
+
+        try:
+            module = _lazy_names[name]
+        except KeyError:
+            raise AttributeError(f'module {__name__!r} has no attribute {name!r}') from None
+
+        value = getattr(importlib.import_module(f'.{module}', __name__), name)
+        globals()[name] = value
+        return value
+
+    def __dir__() -> List[str]:
+        return sorted(set(globals()) | set(_lazy_submodules) | set(_lazy_names))
+
+else:
+    from . import opus as opus
+    from .shard import *
+    from .player import *
+    from .team import *
+
+
 class VersionInfo(NamedTuple):
     major: int
     minor: int
@@ -93,4 +138,4 @@ logging.getLogger(__name__).addHandler(logging.NullHandler())
 if len(MissingApplicationID.__bases__) == 1:
     MissingApplicationID.__bases__ = (app_commands.AppCommandError, ClientException)
 
-del logging, NamedTuple, Literal, VersionInfo
+del logging, os, Any, Dict, List, NamedTuple, Literal, Tuple, VersionInfo
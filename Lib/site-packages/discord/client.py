@@ -245,6 +245,16 @@ class Client:
         By default, this flag is set to ``True`` only when :attr:`Intents.presences` is enabled and :attr:`Intents.members`
         is disabled, otherwise it's set to ``False``.
 
+        .. versionadded:: 2.5
+    skip_unobserved_events: :class:`bool`
+        Whether to skip parsing gateway events that no event handler, listener or
+        :meth:`wait_for` would receive, as long as they wouldn't update the cache either.
+        This covers events such as message edits, reactions, typing and presences.
+        Skipped events never build their models, which saves a lot of CPU on large bots.
+        :func:`on_socket_event_type` is still dispatched for them.
+
+        Defaults to ``False``.
+
         .. versionadded:: 2.5
     http_trace: :class:`aiohttp.TraceConfig`
         The trace configuration to use for tracking HTTP requests the library does using ``aiohttp``.
@@ -498,6 +508,10 @@ class Client:
         # Schedules the task
         return self.loop.create_task(wrapped, name=f'discord.py: {event_name}')
 
+    def _has_listener(self, event: str, /) -> bool:
+        # Whether dispatching this event would reach an event handler or a wait_for.
+        return hasattr(self, 'on_' + event) or bool(self._listeners.get(event))
+
     def dispatch(self, event: str, /, *args: Any, **kwargs: Any) -> None:
         _log.debug('Dispatching event %s', event)
         method = 'on_' + event
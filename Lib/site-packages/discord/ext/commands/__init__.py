@@ -19,3 +19,18 @@ from .flags import *
 from .help import *
 from .parameters import *
 from .hybrid import *
+
+import os as _os
+
+if _os.environ.get('DISCORD_LAZY_IMPORTS'):
+
+    def __getattr__(name: str):
+        # AutoShardedBot is defined on first access (see bot.py)
+        if name == 'AutoShardedBot':
+            from .bot import AutoShardedBot
+
+            return AutoShardedBot
+        raise AttributeError(f'module {__name__!r} has no attribute {name!r}')
+
+    def __dir__():
+        return sorted(set(globals()) | {'AutoShardedBot'})
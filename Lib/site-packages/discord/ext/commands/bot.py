@@ -30,6 +30,7 @@ import collections
 import collections.abc
 import inspect
 import importlib.util
+import os
 import sys
 import logging
 import types
@@ -230,6 +231,9 @@ class BotBase(GroupMixin[None]):
         for event in self.extra_events.get(ev, []):
             self._schedule_event(event, ev, *args, **kwargs)  # type: ignore
 
+    def _has_listener(self, event_name: str, /) -> bool:
+        return super()._has_listener(event_name) or bool(self.extra_events.get('on_' + event_name))  # type: ignore
+
     @discord.utils.copy_doc(discord.Client.close)
     async def close(self) -> None:
         for extension in tuple(self.__extensions):
@@ -1514,17 +1518,43 @@ class Bot(BotBase, discord.Client):
     pass
 
 
-class AutoShardedBot(BotBase, discord.AutoShardedClient):
-    """This is similar to :class:`.Bot` except that it is inherited from
-    :class:`discord.AutoShardedClient` instead.
+def _define_auto_sharded_bot() -> Type[Any]:
+    class AutoShardedBot(BotBase, discord.AutoShardedClient):
+        """This is similar to :class:`.Bot` except that it is inherited from
+        :class:`discord.AutoShardedClient` instead.
 
-    .. container:: operations
+        .. container:: operations
 
-        .. describe:: async with x
+            .. describe:: async with x
 
-            Asynchronously initialises the bot and automatically cleans.
+                Asynchronously initialises the bot and automatically cleans.
 
-            .. versionadded:: 2.0
-    """
+                .. versionadded:: 2.0
+        """
 
-    pass
+        pass
+
+    AutoShardedBot.__qualname__ = 'AutoShardedBot'
+    return AutoShardedBot
+
+
+if TYPE_CHECKING:
+
+    class AutoShardedBot(BotBase, discord.AutoShardedClient):
+        pass
+
+elif os.environ.get('DISCORD_LAZY_IMPORTS'):
+    # discord.shard is imported lazily (see discord/__init__.py), so the bot built on
+    # top of it is only defined the first time it is accessed. It is left out of
+    # __all__ so that star imports don't access it; discord.ext.commands forwards it.
+    __all__ = tuple(name for name in __all__ if name != 'AutoShardedBot')
+
+    def __getattr__(name: str) -> Any:
+        if name != 'AutoShardedBot':
+            raise AttributeError(f'module {__name__!r} has no attribute {name!r}')
+
+        value = globals()[name] = _define_auto_sharded_bot()
+        return value
+
+else:
+    AutoShardedBot = _define_auto_sharded_bot()
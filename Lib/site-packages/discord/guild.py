@@ -665,17 +665,17 @@ class Guild(Hashable):
             for thread in threads:
                 self._add_thread(Thread(guild=self, state=self._state, data=thread))
 
-        if 'stage_instances' in guild:
+        if 'stage_instances' in guild and state.cache_stage_instances:
             for s in guild['stage_instances']:
                 stage_instance = StageInstance(guild=self, data=s, state=self._state)
                 self._stage_instances[stage_instance.id] = stage_instance
 
-        if 'guild_scheduled_events' in guild:
+        if 'guild_scheduled_events' in guild and state.cache_guild_scheduled_events:
             for s in guild['guild_scheduled_events']:
                 scheduled_event = ScheduledEvent(data=s, state=self._state)
                 self._scheduled_events[scheduled_event.id] = scheduled_event
 
-        if 'soundboard_sounds' in guild:
+        if 'soundboard_sounds' in guild and state.cache_guild_expressions:
             for s in guild['soundboard_sounds']:
                 soundboard_sound = SoundboardSound(guild=self, data=s, state=self._state)
                 self._add_soundboard_sound(soundboard_sound)
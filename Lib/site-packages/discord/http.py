@@ -107,15 +107,16 @@ if TYPE_CHECKING:
 
 
 async def json_or_text(response: aiohttp.ClientResponse) -> Union[Dict[str, Any], str]:
-    text = await response.text(encoding='utf-8')
+    # The JSON decoder takes the raw body, so it's only decoded into a str when it isn't JSON
+    body = await response.read()
     try:
         if response.headers['content-type'] == 'application/json':
-            return utils._from_json(text)
+            return utils._from_json(body)
     except KeyError:
         # Thanks Cloudflare
         pass
 
-    return text
+    return body.decode('utf-8')
 
 
 class MultipartParameters(NamedTuple):
@@ -381,6 +382,11 @@ class Ratelimit:
             f'<RateLimitBucket limit={self.limit} remaining={self.remaining} pending_requests={len(self._pending_requests)}>'
         )
 
+    @property
+    def pending(self) -> int:
+        """:class:`int`: The number of requests waiting for this bucket to free up."""
+        return len(self._pending_requests)
+
     def reset(self):
         self.remaining = self.limit - self.outgoing
         self.expires = None
@@ -569,6 +575,21 @@ class HTTPClient:
             self._try_clear_expired_ratelimits()
         return value
 
+    def peek_ratelimit(self, route: Route) -> Optional[Ratelimit]:
+        """Returns the rate limit bucket requests to this route currently use.
+
+        Unlike :meth:`get_ratelimit` this never creates a bucket, so it returns
+        ``None`` if no request has been made to the route yet (or its bucket expired).
+        """
+        route_key = route.key
+        try:
+            bucket_hash = self._bucket_hashes[route_key]
+        except KeyError:
+            key = f'{route_key}:{route.major_parameters}'
+        else:
+            key = f'{bucket_hash}:{route.major_parameters}'
+        return self._buckets.get(key)
+
     async def request(
         self,
         route: Route,
@@ -805,6 +826,28 @@ class HTTPClient:
         if self.__session:
             await self.__session.close()
 
+    async def warm_connections(self, count: int = 1) -> int:
+        """Opens up to ``count`` keep-alive connections to the API ahead of time,
+        so later requests skip the DNS lookup and the TLS handshake.
+
+        This requests ``GET /gateway``, which needs no authorization and has no
+        rate limit bucket, so it does not use up any of the bot's own limits.
+        Returns how many of the requests were answered.
+        """
+        if not self.__session:
+            return 0
+
+        url = Route('GET', '/gateway').url
+        headers = {'User-Agent': self.user_agent}
+
+        async def ping() -> bool:
+            async with self.__session.get(url, headers=headers, proxy=self.proxy, proxy_auth=self.proxy_auth) as response:
+                await response.read()
+                return response.status < 500
+
+        results = await asyncio.gather(*(ping() for _ in range(count)), return_exceptions=True)
+        return sum(result is True for result in results)
+
     # login management
 
     async def static_login(self, token: str) -> user.User:
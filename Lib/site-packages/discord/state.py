@@ -25,7 +25,7 @@ DEALINGS IN THE SOFTWARE.
 from __future__ import annotations
 
 import asyncio
-from collections import deque, OrderedDict
+from collections import OrderedDict
 import copy
 import logging
 from typing import (
@@ -42,7 +42,8 @@ from typing import (
     Sequence,
     Generic,
     Tuple,
-    Deque,
+    Iterable,
+    Iterator,
     Literal,
     overload,
 )
@@ -161,6 +162,117 @@ class ChunkRequest:
                 future.set_result(self.buffer)
 
 
+class MessageCache:
+    """An insertion ordered cache of messages keyed by their ID.
+
+    Once it holds ``maxlen`` messages, adding another evicts the oldest one,
+    just like a :class:`collections.deque` with a ``maxlen`` would, but looking
+    up or removing a message by ID is O(1). Iteration goes from the oldest
+    message to the newest. Adding a message that is already cached replaces it
+    and makes it the newest.
+    """
+
+    __slots__ = ('maxlen', '_messages')
+
+    def __init__(self, messages: Iterable[Message] = (), *, maxlen: Optional[int] = None) -> None:
+        self.maxlen: Optional[int] = maxlen
+        self._messages: OrderedDict[int, Message] = OrderedDict()
+        for message in messages:
+            self.append(message)
+
+    def __repr__(self) -> str:
+        return f'<MessageCache len={len(self._messages)} maxlen={self.maxlen}>'
+
+    def __len__(self) -> int:
+        return len(self._messages)
+
+    def __iter__(self) -> Iterator[Message]:
+        return iter(self._messages.values())
+
+    def __reversed__(self) -> Iterator[Message]:
+        return reversed(self._messages.values())
+
+    def __contains__(self, message: Any) -> bool:
+        return self._messages.get(getattr(message, 'id', None)) == message
+
+    def append(self, message: Message) -> None:
+        messages = self._messages
+        messages[message.id] = message
+        messages.move_to_end(message.id)
+        if self.maxlen is not None and len(messages) > self.maxlen:
+            messages.popitem(last=False)
+
+    def get(self, message_id: Optional[int]) -> Optional[Message]:
+        return self._messages.get(message_id)  # type: ignore # None is never a key, so it finds nothing
+
+    def pop(self, message_id: int) -> Optional[Message]:
+        return self._messages.pop(message_id, None)
+
+
+def _message_cached(key: str) -> Callable[[ConnectionState, Dict[str, Any]], bool]:
+    def check(state: ConnectionState, data: Dict[str, Any]) -> bool:
+        return state._get_message(int(data[key])) is not None
+
+    return check
+
+
+def _message_update_needed(state: ConnectionState, data: Dict[str, Any]) -> bool:
+    # Components may belong to a tracked view, which has to see them.
+    return 'components' in data or state._get_message(int(data['id'])) is not None
+
+
+def _bulk_delete_needed(state: ConnectionState, data: Dict[str, Any]) -> bool:
+    return any(state._get_message(int(message_id)) is not None for message_id in data['ids'])
+
+
+def _presence_needed(state: ConnectionState, data: Dict[str, Any]) -> bool:
+    guild = state._get_guild(utils._get_as_snowflake(data, 'guild_id'))
+    return guild is not None and guild.get_member(int(data['user']['id'])) is not None
+
+
+def _typing_needed(state: ConnectionState, data: Dict[str, Any]) -> bool:
+    # Typing in a DM can add the user to the channel's recipients.
+    return 'guild_id' not in data
+
+
+# Events whose parsers exist to build models for listeners. Each maps to the events its
+# parser can dispatch and, when the parser also updates the cache, a check for whether
+# this payload would touch cached state. With ``skip_unobserved_events`` a payload is only
+# parsed when one of its events has a listener (or ``wait_for``) or the cache needs it.
+_SKIPPABLE_EVENTS: Dict[str, Tuple[Tuple[str, ...], Optional[Callable[[ConnectionState, Dict[str, Any]], bool]]]] = {
+    'MESSAGE_UPDATE': (('raw_message_edit', 'message_edit'), _message_update_needed),
+    'MESSAGE_DELETE': (('raw_message_delete', 'message_delete'), _message_cached('id')),
+    'MESSAGE_DELETE_BULK': (('raw_bulk_message_delete', 'bulk_message_delete'), _bulk_delete_needed),
+    'MESSAGE_REACTION_ADD': (('raw_reaction_add', 'reaction_add'), _message_cached('message_id')),
+    'MESSAGE_REACTION_REMOVE': (('raw_reaction_remove', 'reaction_remove'), _message_cached('message_id')),
+    'MESSAGE_REACTION_REMOVE_ALL': (('raw_reaction_clear', 'reaction_clear'), _message_cached('message_id')),
+    'MESSAGE_REACTION_REMOVE_EMOJI': (('raw_reaction_clear_emoji', 'reaction_clear_emoji'), _message_cached('message_id')),
+    'MESSAGE_POLL_VOTE_ADD': (('raw_poll_vote_add', 'poll_vote_add'), _message_cached('message_id')),
+    'MESSAGE_POLL_VOTE_REMOVE': (('raw_poll_vote_remove', 'poll_vote_remove'), _message_cached('message_id')),
+    'PRESENCE_UPDATE': (('raw_presence_update', 'presence_update', 'user_update'), _presence_needed),
+    'TYPING_START': (('typing', 'raw_typing'), _typing_needed),
+    'INVITE_CREATE': (('invite_create',), None),
+    'INVITE_DELETE': (('invite_delete',), None),
+    'WEBHOOKS_UPDATE': (('webhooks_update',), None),
+    'GUILD_INTEGRATIONS_UPDATE': (('guild_integrations_update',), None),
+    'INTEGRATION_CREATE': (('integration_create',), None),
+    'INTEGRATION_UPDATE': (('integration_update',), None),
+    'INTEGRATION_DELETE': (('raw_integration_delete',), None),
+    'GUILD_AUDIT_LOG_ENTRY_CREATE': (('audit_log_entry_create',), None),
+    'AUTO_MODERATION_RULE_CREATE': (('automod_rule_create',), None),
+    'AUTO_MODERATION_RULE_UPDATE': (('automod_rule_update',), None),
+    'AUTO_MODERATION_RULE_DELETE': (('automod_rule_delete',), None),
+    'AUTO_MODERATION_ACTION_EXECUTION': (('automod_action',), None),
+    'VOICE_CHANNEL_EFFECT_SEND': (('voice_channel_effect',), None),
+    'ENTITLEMENT_CREATE': (('entitlement_create',), None),
+    'ENTITLEMENT_UPDATE': (('entitlement_update',), None),
+    'ENTITLEMENT_DELETE': (('entitlement_delete',), None),
+    'SUBSCRIPTION_CREATE': (('subscription_create',), None),
+    'SUBSCRIPTION_UPDATE': (('subscription_update',), None),
+    'SUBSCRIPTION_DELETE': (('subscription_delete',), None),
+}
+
+
 _log = logging.getLogger(__name__)
 
 
@@ -272,8 +384,30 @@ class ConnectionState(Generic[ClientT]):
             if attr.startswith('parse_'):
                 parsers[attr[6:].upper()] = func
 
+        if options.get('skip_unobserved_events', False):
+            for event, (dispatched, needed) in _SKIPPABLE_EVENTS.items():
+                parsers[event] = self._make_observed_parser(parsers[event], dispatched, needed)
+
         self.clear()
 
+    def _make_observed_parser(
+        self,
+        parser: Callable[[Any], None],
+        dispatched: Tuple[str, ...],
+        needed: Optional[Callable[[ConnectionState, Dict[str, Any]], bool]],
+    ) -> Callable[[Any], None]:
+        # Listeners can be added and removed at any time, so they're checked per payload.
+        # That's a few lookups, far cheaper than the models the parser would build.
+        def parse_if_observed(data: Any) -> None:
+            if needed is not None and needed(self, data):
+                return parser(data)
+            client = self._get_client()
+            for event in dispatched:
+                if client._has_listener(event):
+                    return parser(data)
+
+        return parse_if_observed
+
     # For some reason Discord still sends emoji/sticker data in payloads
     # This makes it hard to actually swap out the appropriate store methods
     # So this is checked instead, it's a small penalty to pay
@@ -281,6 +415,18 @@ class ConnectionState(Generic[ClientT]):
     def cache_guild_expressions(self) -> bool:
         return self._intents.emojis_and_stickers
 
+    # Scheduled events and stage instances are also sent in GUILD_CREATE regardless,
+    # so bots that opted out of them shouldn't pay to cache them either
+    @property
+    def cache_guild_scheduled_events(self) -> bool:
+        return self._intents.guild_scheduled_events
+
+    @property
+    def cache_stage_instances(self) -> bool:
+        # Stage instances come with the guilds intent, but without voice states
+        # there is no way to tell who is on stage, so they aren't worth keeping
+        return self._intents.voice_states
+
     async def close(self) -> None:
         for voice in self.voice_clients:
             try:
@@ -310,9 +456,9 @@ class ConnectionState(Generic[ClientT]):
         # extra dict to look up private channels by user id
         self._private_channels_by_user: Dict[int, DMChannel] = {}
         if self.max_messages is not None:
-            self._messages: Optional[Deque[Message]] = deque(maxlen=self.max_messages)
+            self._messages: Optional[MessageCache] = MessageCache(maxlen=self.max_messages)
         else:
-            self._messages: Optional[Deque[Message]] = None
+            self._messages: Optional[MessageCache] = None
 
     def process_chunk_requests(self, guild_id: int, nonce: Optional[str], members: List[Member], complete: bool) -> None:
         removed = []
@@ -524,7 +670,7 @@ class ConnectionState(Generic[ClientT]):
                 self._private_channels_by_user.pop(recipient.id, None)
 
     def _get_message(self, msg_id: Optional[int]) -> Optional[Message]:
-        return utils.find(lambda m: m.id == msg_id, reversed(self._messages)) if self._messages else None
+        return self._messages.get(msg_id) if self._messages is not None else None
 
     def _add_guild_from_data(self, data: GuildPayload) -> Guild:
         guild = Guild(data=data, state=self)
@@ -699,12 +845,14 @@ class ConnectionState(Generic[ClientT]):
         self.dispatch('raw_message_delete', raw)
         if self._messages is not None and found is not None:
             self.dispatch('message_delete', found)
-            self._messages.remove(found)
+            self._messages.pop(found.id)
 
     def parse_message_delete_bulk(self, data: gw.MessageDeleteBulkEvent) -> None:
         raw = RawBulkMessageDeleteEvent(data)
         if self._messages:
-            found_messages = [message for message in self._messages if message.id in raw.message_ids]
+            found_messages = [message for message_id in raw.message_ids if (message := self._messages.get(message_id)) is not None]
+            # Oldest first, the order they had in the cache
+            found_messages.sort(key=lambda message: message.id)
         else:
             found_messages = []
         raw.cached_messages = found_messages
@@ -713,7 +861,7 @@ class ConnectionState(Generic[ClientT]):
             self.dispatch('bulk_message_delete', found_messages)
             for msg in found_messages:
                 # self._messages won't be None here
-                self._messages.remove(msg)  # type: ignore
+                self._messages.pop(msg.id)  # type: ignore
 
     def parse_message_update(self, data: gw.MessageUpdateEvent) -> None:
         channel, _ = self._get_guild_channel(data)
@@ -1354,7 +1502,7 @@ class ConnectionState(Generic[ClientT]):
 
         # do a cleanup of the messages cache
         if self._messages is not None:
-            self._messages: Optional[Deque[Message]] = deque(
+            self._messages: Optional[MessageCache] = MessageCache(
                 (msg for msg in self._messages if msg.guild != guild), maxlen=self.max_messages
             )
 
@@ -1498,7 +1646,8 @@ class ConnectionState(Generic[ClientT]):
         guild = self._get_guild(int(data['guild_id']))
         if guild is not None:
             stage_instance = StageInstance(guild=guild, state=self, data=data)
-            guild._stage_instances[stage_instance.id] = stage_instance
+            if self.cache_stage_instances:
+                guild._stage_instances[stage_instance.id] = stage_instance
             self.dispatch('stage_instance_create', stage_instance)
         else:
             _log.debug('STAGE_INSTANCE_CREATE referencing unknown guild ID: %s. Discarding.', data['guild_id'])
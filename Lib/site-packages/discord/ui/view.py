@@ -23,12 +23,13 @@ DEALINGS IN THE SOFTWARE.
 """
 
 from __future__ import annotations
-from typing import Any, Callable, ClassVar, Coroutine, Dict, Iterator, List, Optional, Sequence, TYPE_CHECKING, Tuple, Type
+from typing import Any, Callable, ClassVar, Coroutine, Dict, Iterator, List, Optional, Sequence, Set, TYPE_CHECKING, Tuple, Type
 from functools import partial
 from itertools import groupby
 
 import asyncio
 import logging
+import math
 import sys
 import time
 import os
@@ -191,28 +192,18 @@ class View:
         self._cache_key: Optional[int] = None
         self.__cancel_callback: Optional[Callable[[View], None]] = None
         self.__timeout_expiry: Optional[float] = None
-        self.__timeout_task: Optional[asyncio.Task[None]] = None
+        self.__timer_wheel: Optional[_TimerWheel] = None
         self.__stopped: asyncio.Future[bool] = asyncio.get_running_loop().create_future()
 
     def __repr__(self) -> str:
         return f'<{self.__class__.__name__} timeout={self.timeout} children={len(self._children)}>'
 
-    async def __timeout_task_impl(self) -> None:
-        while True:
-            # Guard just in case someone changes the value of the timeout at runtime
-            if self.timeout is None:
-                return
-
-            if self.__timeout_expiry is None:
-                return self._dispatch_timeout()
-
-            # Check if we've elapsed our currently set timeout
-            now = time.monotonic()
-            if now >= self.__timeout_expiry:
-                return self._dispatch_timeout()
-
-            # Wait N seconds to see if timeout data has been refreshed
-            await asyncio.sleep(self.__timeout_expiry - now)
+    def _timer_deadline(self) -> Optional[float]:
+        # Asked by the timer wheel when this view's slot comes due.
+        # Guard just in case someone changes the value of the timeout at runtime
+        if self.timeout is None:
+            return None
+        return self.__timeout_expiry
 
     def is_dispatchable(self) -> bool:
         # this is used by webhooks to check whether a view requires a state attached
@@ -252,15 +243,16 @@ class View:
 
     @timeout.setter
     def timeout(self, value: Optional[float]) -> None:
-        # If the timeout task is already running this allows it to update
-        # the expiry while it's running
-        if self.__timeout_task is not None:
+        self.__timeout = value
+
+        # If the view is already waiting on the timer wheel this moves its expiry
+        if self.__timer_wheel is not None:
             if value is not None:
                 self.__timeout_expiry = time.monotonic() + value
             else:
                 self.__timeout_expiry = None
 
-        self.__timeout = value
+            self.__timer_wheel.add(self)
 
     @property
     def children(self) -> List[Item[Self]]:
@@ -439,13 +431,16 @@ class View:
     def _start_listening_from_store(self, store: ViewStore) -> None:
         self.__cancel_callback = partial(store.remove_view)
         if self.timeout:
-            if self.__timeout_task is not None:
-                self.__timeout_task.cancel()
+            if self.__timer_wheel is not None:
+                self.__timer_wheel.remove(self)
 
             self.__timeout_expiry = time.monotonic() + self.timeout
-            self.__timeout_task = asyncio.create_task(self.__timeout_task_impl())
+            self.__timer_wheel = store._timer_wheel
+            self.__timer_wheel.add(self)
 
     def _dispatch_timeout(self):
+        # The timer wheel has already let go of the view by now
+        self.__timer_wheel = None
         if self.__stopped.done():
             return
 
@@ -493,9 +488,9 @@ class View:
             self.__stopped.set_result(False)
 
         self.__timeout_expiry = None
-        if self.__timeout_task is not None:
-            self.__timeout_task.cancel()
-            self.__timeout_task = None
+        if self.__timer_wheel is not None:
+            self.__timer_wheel.remove(self)
+            self.__timer_wheel = None
 
         if self.__cancel_callback:
             self.__cancel_callback(self)
@@ -534,6 +529,153 @@ class View:
         return await self.__stopped
 
 
+class _TimerWheel:
+    """A hierarchical timing wheel that times out views.
+
+    Deadlines are rounded up to ticks of :attr:`RESOLUTION` seconds and filed
+    into :attr:`LEVELS` wheels of ``2 ** BITS`` slots each, every level spanning
+    ``2 ** BITS`` times as many ticks as the one below. Adding and removing a view
+    are O(1), and a single event loop timer drives every expiry, woken only for
+    slots that have something in them, no matter how many views are waiting.
+
+    Deadlines are checked lazily: when a view's slot comes due the view is asked
+    for its deadline again and filed again if it has moved. So refreshing a
+    timeout after an interaction only has to update the view's expiry.
+    """
+
+    RESOLUTION: ClassVar[float] = 0.1
+    BITS: ClassVar[int] = 6
+    LEVELS: ClassVar[int] = 4
+
+    SLOTS: ClassVar[int] = 1 << BITS
+    MASK: ClassVar[int] = SLOTS - 1
+    # Deadlines further out than this are filed at the far end and filed again from there
+    SPAN: ClassVar[int] = 1 << (BITS * LEVELS)
+
+    def __init__(self) -> None:
+        self._levels: List[List[Set[View]]] = [[set() for _ in range(self.SLOTS)] for _ in range(self.LEVELS)]
+        # view: the slot it is filed in
+        self._slot_of: Dict[View, Set[View]] = {}
+        self._origin: float = time.monotonic()
+        # The last tick that was processed
+        self._current: int = 0
+        self._handle: Optional[asyncio.TimerHandle] = None
+        self._wake_tick: int = 0
+        self._advancing: bool = False
+
+    def __len__(self) -> int:
+        return len(self._slot_of)
+
+    def _tick_of(self, when: float) -> int:
+        return math.ceil((when - self._origin) / self.RESOLUTION)
+
+    def _now_tick(self) -> int:
+        return int((time.monotonic() - self._origin) // self.RESOLUTION)
+
+    def add(self, view: View) -> None:
+        """Files a view under its current deadline, replacing where it was filed before."""
+        self.remove(view)
+        deadline = view._timer_deadline()
+        if deadline is None:
+            return
+
+        if not self._slot_of:
+            # Nothing was waiting, so the wheel may have stood still for a while
+            self._current = max(self._current, self._now_tick())
+
+        self._file(view, self._tick_of(deadline))
+
+    def remove(self, view: View) -> None:
+        slot = self._slot_of.pop(view, None)
+        if slot is not None:
+            slot.discard(view)
+
+        if not self._slot_of and self._handle is not None:
+            self._handle.cancel()
+            self._handle = None
+
+    def _file(self, view: View, tick: int) -> None:
+        delta = min(max(tick - self._current, 1), self.SPAN - 1)
+        tick = self._current + delta
+        level = (delta.bit_length() - 1) // self.BITS
+        shift = self.BITS * level
+        slot = self._levels[level][(tick >> shift) & self.MASK]
+        slot.add(view)
+        self._slot_of[view] = slot
+
+        # A slot above the first level comes due when its block of ticks starts,
+        # that's when its views are filed again further down
+        due = (tick >> shift) << shift
+        if not self._advancing and (self._handle is None or due < self._wake_tick):
+            self._schedule(due)
+
+    def _schedule(self, tick: int) -> None:
+        if self._handle is not None:
+            self._handle.cancel()
+
+        self._wake_tick = tick
+        delay = self._origin + tick * self.RESOLUTION - time.monotonic()
+        self._handle = asyncio.get_running_loop().call_later(max(delay, 0.0), self._advance)
+
+    def _next_due(self) -> Optional[int]:
+        # The first tick with a non-empty slot, if any
+        best: Optional[int] = None
+        for level, slots in enumerate(self._levels):
+            shift = self.BITS * level
+            base = self._current >> shift
+            for offset in range(1, self.SLOTS + 1):
+                if slots[(base + offset) & self.MASK]:
+                    due = (base + offset) << shift
+                    if best is None or due < best:
+                        best = due
+                    break
+        return best
+
+    def _advance(self) -> None:
+        self._handle = None
+        now = self._now_tick()
+        tick: Optional[int] = self._wake_tick
+        self._advancing = True
+        try:
+            # Catch up on every slot that came due, in case the loop was late to wake us
+            while tick is not None:
+                self._process(tick)
+                tick = self._next_due()
+                if tick is not None and tick > now:
+                    break
+        finally:
+            self._advancing = False
+
+        if tick is not None:
+            self._schedule(tick)
+
+    def _process(self, tick: int) -> None:
+        self._current = tick
+        due: List[View] = []
+        for level in range(self.LEVELS - 1, -1, -1):
+            shift = self.BITS * level
+            if tick & ((1 << shift) - 1) == 0:
+                slot = self._levels[level][(tick >> shift) & self.MASK]
+                due.extend(slot)
+                slot.clear()
+
+        expired: List[View] = []
+        for view in due:
+            del self._slot_of[view]
+            deadline = view._timer_deadline()
+            if deadline is None:
+                continue
+
+            deadline_tick = self._tick_of(deadline)
+            if deadline_tick <= tick:
+                expired.append(view)
+            else:
+                self._file(view, deadline_tick)
+
+        for view in expired:
+            view._dispatch_timeout()
+
+
 class ViewStore:
     def __init__(self, state: ConnectionState):
         # entity_id: {(component_type, custom_id): Item}
@@ -545,6 +687,8 @@ class ViewStore:
         # component_type is the key
         self._dynamic_items: Dict[re.Pattern[str], Type[DynamicItem[Item[Any]]]] = {}
         self._state: ConnectionState = state
+        # Times out every view in the store
+        self._timer_wheel: _TimerWheel = _TimerWheel()
 
     @property
     def persistent_views(self) -> Sequence[View]:
@@ -82,6 +82,13 @@ except ModuleNotFoundError:
 else:
     HAS_ORJSON = True
 
+try:
+    import msgspec  # type: ignore
+except ModuleNotFoundError:
+    HAS_MSGSPEC = False
+else:
+    HAS_MSGSPEC = True
+
 try:
     import zstandard  # type: ignore
 except ImportError:
@@ -158,7 +165,7 @@ if TYPE_CHECKING:
     class _DecompressionContext(Protocol):
         COMPRESSION_TYPE: str
 
-        def decompress(self, data: bytes, /) -> str | None:
+        def decompress(self, data: bytes, /) -> bytes | None:
             ...
 
     P = ParamSpec('P')
@@ -659,19 +666,62 @@ def _is_submodule(parent: str, child: str) -> bool:
     return parent == child or child.startswith(parent + '.')
 
 
+def _stdlib_to_json(obj: Any) -> str:
+    return json.dumps(obj, separators=(',', ':'), ensure_ascii=True)
+
+
+# Every JSON backend that is installed, by name, as (encoder, decoder).
+# Decoders accept both str and bytes.
+_JSON_BACKENDS: Dict[str, Tuple[Callable[[Any], str], Callable[[Union[str, bytes]], Any]]] = {
+    'json': (_stdlib_to_json, json.loads),
+}
+
 if HAS_ORJSON:
 
-    def _to_json(obj: Any) -> str:
+    def _orjson_to_json(obj: Any) -> str:
         return orjson.dumps(obj).decode('utf-8')
 
-    _from_json = orjson.loads  # type: ignore
+    _JSON_BACKENDS['orjson'] = (_orjson_to_json, orjson.loads)
 
-else:
+if HAS_MSGSPEC:
+    _msgspec_encoder = msgspec.json.Encoder()
+    _msgspec_decoder = msgspec.json.Decoder()
+
+    def _msgspec_to_json(obj: Any) -> str:
+        return _msgspec_encoder.encode(obj).decode('utf-8')
+
+    _JSON_BACKENDS['msgspec'] = (_msgspec_to_json, _msgspec_decoder.decode)
 
-    def _to_json(obj: Any) -> str:
-        return json.dumps(obj, separators=(',', ':'), ensure_ascii=True)
 
-    _from_json = json.loads
+def _set_json_backend(name: str) -> str:
+    """Switches the JSON backend used for HTTP and gateway payloads.
+
+    ``'auto'`` picks the fastest one installed, preferring orjson, then msgspec,
+    then the standard library. Returns the name of the backend now in use.
+
+    Raises
+    -------
+    ValueError
+        The backend is unknown or not installed.
+    """
+    global _to_json, _from_json, _json_backend
+
+    if name == 'auto':
+        name = next(backend for backend in ('orjson', 'msgspec', 'json') if backend in _JSON_BACKENDS)
+
+    try:
+        _to_json, _from_json = _JSON_BACKENDS[name]
+    except KeyError:
+        raise ValueError(f'JSON backend {name!r} is not installed') from None
+
+    _json_backend = name
+    return name
+
+
+_to_json: Callable[[Any], str]
+_from_json: Callable[[Union[str, bytes]], Any]
+_json_backend: str
+_set_json_backend('auto')
 
 
 def _parse_ratelimit_header(request: Any, *, use_clock: bool = False) -> float:
@@ -1451,33 +1501,52 @@ if _HAS_ZSTD:
             decompressor = zstandard.ZstdDecompressor()
             self.context = decompressor.decompressobj()
 
-        def decompress(self, data: bytes, /) -> str | None:
-            # Each WS message is a complete gateway message
-            return self.context.decompress(data).decode('utf-8')
+        def decompress(self, data: bytes, /) -> bytes | None:
+            # Each WS message is a complete gateway message.
+            # The JSON decoder takes bytes, so there's no need to copy it into a str first.
+            return self.context.decompress(data)
 
     _ActiveDecompressionContext: Type[_DecompressionContext] = _ZstdDecompressionContext
 else:
 
     class _ZlibDecompressionContext:
-        __slots__ = ('context', 'buffer')
+        __slots__ = ('context', 'buffer', 'size')
 
         COMPRESSION_TYPE: str = 'zlib-stream'
+        # Largest buffer kept around once a split message is done; a rare huge one
+        # (e.g. a big GUILD_CREATE) shouldn't pin its memory for the whole session.
+        MAX_KEPT_BUFFER: int = 1 << 20
 
         def __init__(self) -> None:
+            # Holds the frames of a message that was split over several WS messages.
+            # It is reused between messages, ``size`` is how much of it is in use.
             self.buffer: bytearray = bytearray()
+            self.size: int = 0
             self.context = zlib.decompressobj()
 
-        def decompress(self, data: bytes, /) -> str | None:
-            self.buffer.extend(data)
-
+        def decompress(self, data: bytes, /) -> bytes | None:
+            # Returns bytes: the JSON decoder takes them, so there's no need to copy them into a str first.
             # Check whether ending is Z_SYNC_FLUSH
             if len(data) < 4 or data[-4:] != b'\x00\x00\xff\xff':
+                self._append(data)
                 return
 
-            msg = self.context.decompress(self.buffer)
-            self.buffer = bytearray()
-
-            return msg.decode('utf-8')
+            if not self.size:
+                # Nearly every message comes in one piece, so it's inflated straight from the frame
+                return self.context.decompress(data)
+
+            self._append(data)
+            with memoryview(self.buffer)[: self.size] as view:
+                msg = self.context.decompress(view)
+            self.size = 0
+            if len(self.buffer) > self.MAX_KEPT_BUFFER:
+                self.buffer = bytearray()
+            return msg
+
+        def _append(self, data: bytes) -> None:
+            end = self.size + len(data)
+            self.buffer[self.size : end] = data
+            self.size = end
 
     _ActiveDecompressionContext: Type[_DecompressionContext] = _ZlibDecompressionContext
 
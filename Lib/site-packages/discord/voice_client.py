@@ -29,10 +29,8 @@ import logging
 import struct
 from typing import Any, Callable, List, Optional, TYPE_CHECKING, Tuple, Union
 
-from . import opus
 from .gateway import *
 from .errors import ClientException
-from .player import AudioPlayer, AudioSource
 from .utils import MISSING
 from .voice_state import VoiceConnectionState
 
@@ -43,6 +41,7 @@ if TYPE_CHECKING:
     from .state import ConnectionState
     from .user import ClientUser
     from .opus import Encoder, APPLICATION_CTL, BAND_CTL, SIGNAL_CTL
+    from .player import AudioPlayer, AudioSource
     from .channel import StageChannel, VoiceChannel
     from . import abc
 
@@ -499,6 +498,11 @@ class VoiceClient(VoiceProtocol):
         if self.is_playing():
             raise ClientException('Already playing audio.')
 
+        # opus and the player pull in ctypes, subprocess and audioop, so they
+        # are only imported once something actually wants to play audio.
+        from . import opus
+        from .player import AudioPlayer, AudioSource
+
         if not isinstance(source, AudioSource):
             raise TypeError(f'source must be an AudioSource not {source.__class__.__name__}')
 
@@ -549,6 +553,8 @@ class VoiceClient(VoiceProtocol):
 
     @source.setter
     def source(self, value: AudioSource) -> None:
+        from .player import AudioSource
+
         if not isinstance(value, AudioSource):
             raise TypeError(f'expected AudioSource not {value.__class__.__name__}.')
 
@@ -576,6 +582,7 @@ class VoiceClient(VoiceProtocol):
         opus.OpusError
             Encoding the data failed.
         """
+        from . import opus
 
         self.checked_add('sequence', 1, 65535)
         if encode:
@@ -0,0 +1,184 @@
+import asyncio
+import heapq
+import itertools
+import time
+from contextlib import asynccontextmanager
+
+import config
+
+# --- Admission Control ---
+# Every story generation is one Gemini call. Under a spike we would rather tell a few
+# people "busy, try again" straight away than let latency climb for everyone.
+# Turns in stories that are already running are worth the most, so they are the last
+# to be shed; brand new stories are shed first.
+# Callers check() before they change any story state, then hold a slot (admit()) only
+# around the Gemini call itself, so the averages measure Gemini and not Discord sends.
+
+# Priorities (higher wins when a slot frees up)
+NEW_STORY = 0
+TURN = 1
+
+# Weight of the newest sample in the moving averages
+EWMA_ALPHA = 0.2
+
+
+class Overloaded(Exception):
+    """Raised when a generation is shed instead of admitted."""
+
+
+class AdmissionController:
+    """
+    Tracks in-flight generations and queue wait time, and decides who gets a slot.
+    """
+
+    TUNABLES = ('max_in_flight', 'max_queued', 'max_queue_wait', 'new_story_load')
+
+    def __init__(self, settings=None):
+        self.in_flight = 0
+        self._waiters = []  # heap of (-priority, sequence, future)
+        self._sequence = itertools.count()
+
+        # Thresholds come from the [admission] settings and can be tuned at runtime through `!admission`
+        self.apply_settings(settings or config.current)
+
+        # Moving averages, in seconds
+        self.avg_generation_time = 0.0
+        self.avg_queue_wait = 0.0
+
+        # Counters for `!admission`
+        self.admitted = 0
+        self.shed = {NEW_STORY: 0, TURN: 0}
+
+    @property
+    def queued(self):
+        return len(self._waiters)
+
+    def expected_wait(self):
+        """Estimates how long a newly queued request would wait for a slot."""
+        if not self.max_in_flight:
+            return float('inf')
+        return self.avg_generation_time * (self.queued + 1) / self.max_in_flight
+
+    def _should_shed(self, priority):
+        if priority == NEW_STORY:
+            # New stories never queue, and back off before the slots are full
+            return self.queued > 0 or self.in_flight >= self.max_in_flight * self.new_story_load
+        if self.in_flight < self.max_in_flight and not self._waiters:
+            return False
+        return self.queued >= self.max_queued or self.expected_wait() > self.max_queue_wait
+
+    def check(self, priority):
+        """Raises Overloaded right away if a request of this priority would be shed now."""
+        if self._should_shed(priority):
+            self.shed[priority] += 1
+            raise Overloaded()
+
+    async def acquire(self, priority):
+        """
+        Waits for a generation slot, or raises Overloaded if the request is shed.
+        """
+        self.check(priority)
+
+        if self.in_flight < self.max_in_flight and not self._waiters:
+            self.in_flight += 1
+            self.admitted += 1
+            return
+
+        future = asyncio.get_running_loop().create_future()
+        entry = (-priority, next(self._sequence), future)
+        heapq.heappush(self._waiters, entry)
+        started = time.monotonic()
+        try:
+            await asyncio.wait_for(asyncio.shield(future), timeout=self.max_queue_wait)
+        except asyncio.TimeoutError:
+            if future.done() and not future.cancelled():
+                # The slot was handed over just as we timed out; give it back
+                self.release()
+            else:
+                future.cancel()
+                self._remove_waiter(entry)
+            self.shed[priority] += 1
+            raise Overloaded() from None
+        except asyncio.CancelledError:
+            if future.done() and not future.cancelled():
+                self.release()
+            else:
+                future.cancel()
+                self._remove_waiter(entry)
+            raise
+
+        waited = time.monotonic() - started
+        self.avg_queue_wait += EWMA_ALPHA * (waited - self.avg_queue_wait)
+        self.admitted += 1
+
+    def _remove_waiter(self, entry):
+        try:
+            self._waiters.remove(entry)
+        except ValueError:
+            return
+        heapq.heapify(self._waiters)
+
+    def release(self):
+        """Frees a slot, handing it straight to the highest priority waiter if there is one."""
+        while self._waiters:
+            _, _, future = heapq.heappop(self._waiters)
+            if not future.done():
+                future.set_result(True)  # in_flight stays the same: the slot changes hands
+                return
+        self.in_flight -= 1
+
+    @asynccontextmanager
+    async def admit(self, priority):
+        """
+        Holds a generation slot for the duration of the block.
+        Raises Overloaded before entering the block if the request is shed.
+        """
+        await self.acquire(priority)
+        started = time.monotonic()
+        try:
+            yield
+        finally:
+            elapsed = time.monotonic() - started
+            self.avg_generation_time += EWMA_ALPHA * (elapsed - self.avg_generation_time)
+            self.release()
+
+    def set_threshold(self, name, value):
+        """Updates one of the tunable thresholds."""
+        if name not in self.TUNABLES:
+            raise ValueError(f"Unknown setting {name!r}. Pick one of: {', '.join(self.TUNABLES)}")
+        current = getattr(self, name)
+        value = type(current)(value)
+        if value < 0:
+            raise ValueError(f"{name} can't be negative")
+        setattr(self, name, value)
+        self._admit_waiters()
+
+    def apply_settings(self, settings):
+        """Takes the thresholds from (reloaded) Settings, replacing any `!admission` tweaks."""
+        for name in self.TUNABLES:
+            setattr(self, name, getattr(settings.admission, name))
+        self._admit_waiters()
+
+    def _admit_waiters(self):
+        # A larger limit may let queued requests in right away
+        while self._waiters and self.in_flight < self.max_in_flight:
+            self.in_flight += 1
+            self.release()
+
+    def stats(self):
+        """Returns a snapshot of the controller's state for reporting."""
+        return {
+            'in_flight': self.in_flight,
+            'queued': self.queued,
+            'avg_generation_time': round(self.avg_generation_time, 2),
+            'avg_queue_wait': round(self.avg_queue_wait, 2),
+            'admitted': self.admitted,
+            'shed_new_stories': self.shed[NEW_STORY],
+            'shed_turns': self.shed[TURN],
+            **{name: getattr(self, name) for name in self.TUNABLES},
+        }
+
+
+# The one controller shared by every cog. It lives outside the extensions so reloads keep it.
+controller = AdmissionController()
+config.subscribe(controller.apply_settings)
@@ -0,0 +1,174 @@
+"""
+Memory benchmark for the client cache profiles in client_profile.py.
+
+Feeds synthetic GUILD_CREATE payloads (and a stream of MESSAGE_CREATEs) into a
+discord.py ConnectionState built with each profile's options, and reports the
+memory held per 1,000 guilds. Each profile runs in a fresh interpreter.
+
+    python benchmarks/cache_profile_benchmark.py [--guilds 1000] [--messages 5000]
+"""
+import argparse
+import json
+import os
+import subprocess
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Shape of a typical mid-sized guild
+ROLES = 30
+CHANNELS = 40
+THREADS = 5
+EMOJIS = 50
+STICKERS = 10
+SOUNDS = 8
+STAGE_INSTANCES = 2
+SCHEDULED_EVENTS = 5
+MEMBERS = 25
+
+
+def _snowflakes(start):
+    counter = start
+    while True:
+        counter += 1
+        yield counter
+
+
+def guild_payload(guild_id, ids):
+    """Builds a GUILD_CREATE payload with the shape above."""
+    user = lambda: {'id': str(next(ids)), 'username': 'someone', 'discriminator': '0', 'avatar': None, 'global_name': 'Someone'}
+    channels = [
+        {'id': str(guild_id * 1000 + c), 'type': 0, 'name': f'channel-{c}', 'position': c, 'guild_id': str(guild_id), 'permission_overwrites': [], 'topic': 'x' * 40, 'nsfw': False, 'parent_id': None}
+        for c in range(CHANNELS)
+    ]
+    return {
+        'id': str(guild_id),
+        'name': f'Guild {guild_id}',
+        'member_count': 500,
+        'owner_id': '1',
+        'features': ['COMMUNITY', 'NEWS'],
+        'roles': [
+            {'id': str(next(ids)), 'name': f'role-{r}', 'permissions': '0', 'position': r, 'color': 0, 'hoist': False, 'managed': False, 'mentionable': False, 'flags': 0}
+            for r in range(ROLES)
+        ],
+        'channels': channels,
+        'threads': [
+            {'id': str(next(ids)), 'type': 11, 'name': f'thread-{t}', 'guild_id': str(guild_id), 'parent_id': channels[0]['id'], 'owner_id': '1', 'thread_metadata': {'archived': False, 'auto_archive_duration': 1440, 'archive_timestamp': '2025-01-01T00:00:00+00:00', 'locked': False}, 'message_count': 0, 'member_count': 1, 'rate_limit_per_user': 0}
+            for t in range(THREADS)
+        ],
+        'emojis': [
+            {'id': str(next(ids)), 'name': f'emoji{e}', 'roles': [], 'require_colons': True, 'managed': False, 'animated': False, 'available': True}
+            for e in range(EMOJIS)
+        ],
+        'stickers': [
+            {'id': str(next(ids)), 'name': f'sticker{s}', 'description': 'a sticker', 'tags': 'smile', 'type': 2, 'format_type': 1, 'available': True, 'guild_id': str(guild_id)}
+            for s in range(STICKERS)
+        ],
+        'soundboard_sounds': [
+            {'sound_id': str(next(ids)), 'name': f'sound{s}', 'volume': 1.0, 'emoji_id': None, 'emoji_name': None, 'guild_id': str(guild_id), 'available': True}
+            for s in range(SOUNDS)
+        ],
+        'stage_instances': [
+            {'id': str(next(ids)), 'guild_id': str(guild_id), 'channel_id': channels[1]['id'], 'topic': 'Stage', 'privacy_level': 2, 'discoverable_disabled': False, 'guild_scheduled_event_id': None}
+            for s in range(STAGE_INSTANCES)
+        ],
+        'guild_scheduled_events': [
+            {'id': str(next(ids)), 'guild_id': str(guild_id), 'channel_id': None, 'creator_id': '1', 'name': f'event{s}', 'description': 'party', 'scheduled_start_time': '2025-01-01T00:00:00+00:00', 'scheduled_end_time': '2025-01-02T00:00:00+00:00', 'privacy_level': 2, 'status': 1, 'entity_type': 3, 'entity_id': None, 'entity_metadata': {'location': 'here'}, 'user_count': 3}
+            for s in range(SCHEDULED_EVENTS)
+        ],
+        'members': [
+            {'user': user(), 'roles': [], 'joined_at': '2024-01-01T00:00:00+00:00', 'deaf': False, 'mute': False, 'flags': 0}
+            for m in range(MEMBERS)
+        ],
+        'voice_states': [],
+        'presences': [],
+    }
+
+
+def message_payload(guild_id, channel_id, ids):
+    """Builds a MESSAGE_CREATE payload from a random user."""
+    return {
+        'id': str(next(ids)),
+        'channel_id': str(channel_id),
+        'guild_id': str(guild_id),
+        'author': {'id': str(next(ids)), 'username': 'writer', 'discriminator': '0', 'avatar': None, 'global_name': 'Writer'},
+        'member': {'roles': [], 'joined_at': '2024-01-01T00:00:00+00:00', 'deaf': False, 'mute': False, 'flags': 0},
+        'content': 'And then the dragon said hello to the knight, who was very surprised. ' * 2,
+        'timestamp': '2025-01-01T00:00:00+00:00',
+        'edited_timestamp': None,
+        'tts': False,
+        'mention_everyone': False,
+        'mentions': [],
+        'mention_roles': [],
+        'attachments': [],
+        'embeds': [],
+        'pinned': False,
+        'type': 0,
+    }
+
+
+def measure(profile, guilds, messages):
+    """Builds a ConnectionState for the profile, loads it up and returns its memory use."""
+    import gc
+    import resource
+    import tracemalloc
+
+    sys.path.insert(0, ROOT)
+    import client_profile
+    from discord.state import ConnectionState
+
+    options = client_profile.client_options(profile)
+    ids = _snowflakes(10**17)
+    payloads = [guild_payload(10**6 + g, ids) for g in range(guilds)]
+    message_payloads = [message_payload(10**6 + m % guilds, (10**6 + m % guilds) * 1000, ids) for m in range(messages)]
+
+    gc.collect()
+    rss_before = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    tracemalloc.start()
+
+    state = ConnectionState(dispatch=lambda *args, **kwargs: None, handlers={}, hooks={}, http=None, **options)
+    for payload in payloads:
+        state._add_guild_from_data(payload)
+    del payloads
+    for payload in message_payloads:
+        state.parse_message_create(payload)
+    del message_payloads
+
+    gc.collect()
+    traced, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    rss_after = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return {'traced_bytes': traced, 'rss_growth_kib': rss_after - rss_before, 'guilds': len(state._guilds)}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--guilds", type=int, default=1000)
+    parser.add_argument("--messages", type=int, default=5000)
+    parser.add_argument("--profile", help=argparse.SUPPRESS)  # used by the child processes
+    args = parser.parse_args()
+
+    if args.profile:
+        print(json.dumps(measure(args.profile, args.guilds, args.messages)))
+        return
+
+    results = {}
+    for profile in ('default', 'lean'):
+        proc = subprocess.run(
+            [sys.executable, "-W", "ignore", __file__, "--profile", profile, "--guilds", str(args.guilds), "--messages", str(args.messages)],
+            cwd=ROOT, capture_output=True, text=True, check=True,
+        )
+        results[profile] = json.loads(proc.stdout.strip().splitlines()[-1])
+
+    scale = 1000 / args.guilds
+    for profile, result in results.items():
+        print(
+            f"{profile:>8}: {result['traced_bytes'] * scale / 2**20:8.1f} MiB traced, "
+            f"{result['rss_growth_kib'] * scale / 1024:8.1f} MiB RSS growth per 1,000 guilds"
+        )
+    saved = 1 - results['lean']['traced_bytes'] / results['default']['traced_bytes']
+    print(f"\nlean profile holds {saved:.0%} less memory")
+
+
+if __name__ == "__main__":
+    main()
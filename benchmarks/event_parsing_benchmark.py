@@ -0,0 +1,113 @@
+"""
+Benchmark for parsing gateway events nobody listens to (skip_unobserved_events in the
+vendored discord/state.py).
+
+Feeds a mix of MESSAGE_UPDATE, MESSAGE_DELETE, TYPING_START and PRESENCE_UPDATE payloads,
+the kind a big server sends all day, through ConnectionState's parsers, the same functions
+the gateway calls, with the option off and on. Nothing listens for any of them, like
+Story Weaver.
+
+    python benchmarks/event_parsing_benchmark.py [--events 20000]
+"""
+import argparse
+import os
+import random
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+import discord  # noqa: E402
+
+from client_profile import client_options  # noqa: E402
+
+GUILD_ID = 100
+CHANNEL_ID = 200
+
+
+def user(user_id):
+    return {'id': str(user_id), 'username': f'reader{user_id}', 'discriminator': '0', 'avatar': None, 'global_name': None}
+
+
+def message_update(rng):
+    message_id = rng.randrange(10**17, 10**18)
+    return {
+        'id': str(message_id),
+        'channel_id': str(CHANNEL_ID),
+        'guild_id': str(GUILD_ID),
+        'author': user(rng.randrange(1, 5000)),
+        'content': "Once upon a time, in a castle made of clouds... " * 4,
+        'timestamp': '2024-01-01T00:00:00+00:00',
+        'edited_timestamp': '2024-01-01T00:01:00+00:00',
+        'tts': False,
+        'mention_everyone': False,
+        'mentions': [],
+        'mention_roles': [],
+        'attachments': [],
+        'embeds': [],
+        'pinned': False,
+        'type': 0,
+    }
+
+
+def message_delete(rng):
+    return {'id': str(rng.randrange(10**17, 10**18)), 'channel_id': str(CHANNEL_ID), 'guild_id': str(GUILD_ID)}
+
+
+def typing_start(rng):
+    user_id = rng.randrange(1, 5000)
+    return {
+        'channel_id': str(CHANNEL_ID),
+        'guild_id': str(GUILD_ID),
+        'user_id': str(user_id),
+        'timestamp': 1704067200,
+        'member': {'user': user(user_id), 'roles': [], 'joined_at': '2023-01-01T00:00:00+00:00', 'deaf': False, 'mute': False},
+    }
+
+
+def presence_update(rng):
+    return {
+        'user': {'id': str(rng.randrange(1, 5000))},
+        'guild_id': str(GUILD_ID),
+        'status': 'online',
+        'activities': [{'name': 'a story', 'type': 0}],
+        'client_status': {'desktop': 'online'},
+    }
+
+
+EVENTS = (
+    ('MESSAGE_UPDATE', message_update),
+    ('MESSAGE_DELETE', message_delete),
+    ('TYPING_START', typing_start),
+    ('PRESENCE_UPDATE', presence_update),
+)
+
+
+def run(skip, payloads):
+    options = client_options()
+    options['skip_unobserved_events'] = skip
+    client = discord.Client(**options)
+    parsers = client._connection.parsers
+    started = time.perf_counter()
+    for event, data in payloads:
+        parsers[event](data)
+    return time.perf_counter() - started
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--events", type=int, default=20_000)
+    args = parser.parse_args()
+
+    rng = random.Random(47)
+    payloads = [(event, build(rng)) for event, build in (rng.choice(EVENTS) for _ in range(args.events))]
+
+    print(f"{'skip_unobserved_events':>22} {'total ms':>10} {'per event us':>13}")
+    for skip in (False, True):
+        elapsed = run(skip, payloads)
+        print(f"{str(skip):>22} {elapsed * 1e3:>10.1f} {elapsed / args.events * 1e6:>13.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,177 @@
+"""
+Benchmark for gateway decompression (_ZlibDecompressionContext in the vendored
+discord/utils.py).
+
+Compresses gateway traffic into a zlib stream the way Discord does (one stream per
+connection, a sync flush after every message) and feeds it through the old and new
+decompression contexts, each followed by the JSON decode the gateway does. Reports CPU
+per event and the bytes each path copies: frames into the reassembly buffer, the
+inflated message, and (old path) the str it was decoded into.
+
+To record real traffic, run the bot with `enable_debug_events=True` in its client
+options and a listener that appends each payload as a line:
+
+    @bot.event
+    async def on_socket_raw_receive(msg):
+        capture.write(msg + "\\n")
+
+then:
+
+    python benchmarks/gateway_decompression_benchmark.py gateway.jsonl [--frame-size 4096]
+
+Without a capture, a synthetic session is used: READY, a batch of large GUILD_CREATEs,
+then a stream of messages, typing and presence updates. --frame-size splits each message
+over WS frames of at most that many bytes, which exercises reassembly.
+"""
+import argparse
+import json
+import os
+import random
+import sys
+import time
+import zlib
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from discord import utils  # noqa: E402
+
+try:
+    import orjson
+except ModuleNotFoundError:
+    orjson = None
+
+SYNC_FLUSH_SUFFIX = b'\x00\x00\xff\xff'
+
+
+class LegacyZlibContext:
+    """What the context used to do, counting what it copies."""
+
+    def __init__(self):
+        self.buffer = bytearray()
+        self.context = zlib.decompressobj()
+        self.copied = 0
+
+    def decompress(self, data):
+        self.buffer.extend(data)
+        self.copied += len(data)
+        if len(data) < 4 or data[-4:] != SYNC_FLUSH_SUFFIX:
+            return None
+        msg = self.context.decompress(self.buffer)
+        self.buffer = bytearray()
+        text = msg.decode('utf-8')
+        self.copied += len(msg) + len(text)
+        return text
+
+
+class CountingZlibContext(utils._ZlibDecompressionContext):
+    """The current context, counting what it copies."""
+
+    __slots__ = ('copied',)
+
+    def __init__(self):
+        super().__init__()
+        self.copied = 0
+
+    def decompress(self, data):
+        msg = super().decompress(data)
+        if msg is not None:
+            self.copied += len(msg)
+        return msg
+
+    def _append(self, data):
+        self.copied += len(data)
+        super()._append(data)
+
+
+def synthetic_session(rng, guilds=25, events=20_000):
+    def user(user_id):
+        return {'id': str(user_id), 'username': f'reader{user_id}', 'discriminator': '0', 'avatar': None, 'global_name': 'Réadér ✨'}
+
+    def member(user_id):
+        return {'user': user(user_id), 'roles': [], 'joined_at': '2023-01-01T00:00:00+00:00', 'deaf': False, 'mute': False}
+
+    payloads = [{'op': 0, 's': 1, 't': 'READY', 'd': {
+        'v': 10, 'user': user(1), 'session_id': 'x' * 32, 'resume_gateway_url': 'wss://gateway.discord.gg',
+        'guilds': [{'id': str(1000 + g), 'unavailable': True} for g in range(guilds)], 'application': {'id': '1', 'flags': 0},
+    }}]
+    for g in range(guilds):
+        guild_id = str(1000 + g)
+        payloads.append({'op': 0, 's': len(payloads) + 1, 't': 'GUILD_CREATE', 'd': {
+            'id': guild_id, 'name': f'Story Circle {g}', 'member_count': 500,
+            'channels': [{'id': str(10**6 + g * 1000 + c), 'type': 0, 'name': f'tale-{c}', 'position': c, 'permission_overwrites': []} for c in range(200)],
+            'members': [member(rng.randrange(10**5, 10**6)) for _ in range(500)],
+            'roles': [{'id': str(10**7 + g * 100 + r), 'name': f'role {r}', 'permissions': '0', 'position': r, 'color': 0} for r in range(50)],
+        }})
+    for _ in range(events):
+        guild_id = str(1000 + rng.randrange(guilds))
+        channel_id = str(10**6 + rng.randrange(guilds * 1000))
+        kind = rng.random()
+        if kind < 0.5:
+            event, data = 'MESSAGE_CREATE', {
+                'id': str(rng.randrange(10**17, 10**18)), 'channel_id': channel_id, 'guild_id': guild_id,
+                'author': user(rng.randrange(10**5, 10**6)), 'content': "Once upon a time... " * rng.randrange(1, 20),
+                'timestamp': '2024-01-01T00:00:00+00:00', 'edited_timestamp': None, 'tts': False, 'mention_everyone': False,
+                'mentions': [], 'mention_roles': [], 'attachments': [], 'embeds': [], 'pinned': False, 'type': 0,
+            }
+        elif kind < 0.8:
+            event, data = 'TYPING_START', {'channel_id': channel_id, 'guild_id': guild_id, 'user_id': str(rng.randrange(10**5, 10**6)), 'timestamp': 1704067200}
+        else:
+            event, data = 'PRESENCE_UPDATE', {'user': {'id': str(rng.randrange(10**5, 10**6))}, 'guild_id': guild_id, 'status': 'online', 'activities': []}
+        payloads.append({'op': 0, 's': len(payloads) + 1, 't': event, 'd': data})
+    return [json.dumps(payload, ensure_ascii=False) for payload in payloads]
+
+
+def compress_stream(messages, frame_size):
+    """Compresses messages like the gateway does. Returns the WS frames for each message."""
+    compressor = zlib.compressobj()
+    streamed = []
+    for message in messages:
+        data = compressor.compress(message.encode('utf-8')) + compressor.flush(zlib.Z_SYNC_FLUSH)
+        if frame_size:
+            streamed.append([data[i:i + frame_size] for i in range(0, len(data), frame_size)])
+        else:
+            streamed.append([data])
+    return streamed
+
+
+def run(context, decode, streamed):
+    started = time.perf_counter()
+    for frames in streamed:
+        for frame in frames:
+            msg = context.decompress(frame)
+            if msg is not None:
+                decode(msg)
+    return time.perf_counter() - started
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("capture", nargs='?', help="gateway payloads, one JSON object per line")
+    parser.add_argument("--frame-size", type=int, default=0, help="split messages over WS frames of this many bytes")
+    args = parser.parse_args()
+
+    if args.capture:
+        with open(args.capture, encoding='utf-8') as file:
+            messages = [line.rstrip('\n') for line in file if line.strip()]
+    else:
+        messages = synthetic_session(random.Random(48))
+    streamed = compress_stream(messages, args.frame_size)
+    inflated = sum(len(message.encode('utf-8')) for message in messages)
+    compressed = sum(len(frame) for frames in streamed for frame in frames)
+    print(f"{len(messages)} events, {inflated / 1e6:.1f} MB inflated, {compressed / 1e6:.1f} MB on the wire")
+
+    decoders = [('json', json.loads)]
+    if orjson is not None:
+        decoders.append(('orjson', orjson.loads))
+
+    print(f"{'decoder':>8} {'context':>8} {'us/event':>9} {'MB copied':>10} {'copied/inflated':>16}")
+    for name, decode in decoders:
+        for label, factory in (('old', LegacyZlibContext), ('new', CountingZlibContext)):
+            context = factory()
+            elapsed = run(context, decode, streamed)
+            print(f"{name:>8} {label:>8} {elapsed / len(messages) * 1e6:>9.2f} {context.copied / 1e6:>10.1f} {context.copied / inflated:>16.2f}")
+
+
+if __name__ == "__main__":
+    main()
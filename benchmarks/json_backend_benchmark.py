@@ -0,0 +1,138 @@
+"""
+Micro-benchmarks for the JSON backends (see json_codec.py and discord/utils.py).
+
+Times every installed backend (stdlib json, orjson, msgspec) on:
+- decoding gateway payloads: a capture, or the synthetic session from
+  gateway_decompression_benchmark.py;
+- decoding Gemini generateContent responses, as dicts and, with msgspec, as the typed
+  structs json_codec uses;
+- encoding the payloads we send: messages with buttons and Gemini requests.
+With msgspec installed it also shows what a typed MESSAGE_CREATE would cost, for reference.
+The gateway stays on dicts because discord.py's parsers need them.
+
+    python benchmarks/json_backend_benchmark.py [gateway.jsonl] [--repeat 3]
+
+A capture is one gateway payload per line; gateway_decompression_benchmark.py explains
+how to record one.
+"""
+import argparse
+import json
+import os
+import random
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from discord import utils  # noqa: E402
+
+from gateway_decompression_benchmark import synthetic_session  # noqa: E402
+
+try:
+    import msgspec
+except ModuleNotFoundError:
+    msgspec = None
+
+
+def gemini_responses(rng, count=2_000):
+    bodies = []
+    for _ in range(count):
+        text = "1. The dragon sneezes glitter. 2. A knight proposes. 3. The castle floats away. " * rng.randrange(1, 6)
+        bodies.append(json.dumps({
+            'candidates': [{
+                'content': {'parts': [{'text': text}], 'role': 'model'},
+                'finishReason': 'STOP',
+                'index': 0,
+                'safetyRatings': [{'category': f'HARM_CATEGORY_{c}', 'probability': 'NEGLIGIBLE'} for c in ('HARASSMENT', 'HATE_SPEECH', 'SEXUALLY_EXPLICIT', 'DANGEROUS_CONTENT')],
+            }],
+            'usageMetadata': {'promptTokenCount': rng.randrange(100, 4000), 'candidatesTokenCount': rng.randrange(20, 300), 'totalTokenCount': 0},
+            'modelVersion': 'gemini-1.5-flash-latest',
+        }).encode('utf-8'))
+    return bodies
+
+
+def outgoing_payloads(rng, count=2_000):
+    payloads = []
+    for n in range(count):
+        if n % 2:
+            payloads.append({'contents': [{'role': 'user', 'parts': [{'text': "Continue our story, my love: " + "and then... " * rng.randrange(10, 200)}]}]})
+        else:
+            payloads.append({
+                'content': "What happens next? ✨\n1. Dragon\n2. Knight\n3. Castle",
+                'components': [{'type': 1, 'components': [{'type': 2, 'style': 1, 'label': str(i), 'custom_id': f'story:choose:{n}:{i}'} for i in range(1, 4)]}],
+                'allowed_mentions': {'parse': []},
+            })
+    return payloads
+
+
+def timed(function, items, repeat):
+    best = float('inf')
+    for _ in range(repeat):
+        started = time.perf_counter()
+        for item in items:
+            function(item)
+        best = min(best, time.perf_counter() - started)
+    return best / len(items) * 1e6
+
+
+def typed_decoders():
+    """(name, decode) pairs for the typed structs, when msgspec is installed."""
+    if msgspec is None:
+        return {}
+    import json_codec
+
+    class Author(msgspec.Struct):
+        id: str
+        username: str
+
+    class MessageCreate(msgspec.Struct):
+        id: str
+        channel_id: str
+        author: Author
+        content: str
+        guild_id: str | None = None
+
+    class Dispatch(msgspec.Struct):
+        t: str
+        d: MessageCreate
+
+    return {'gemini': json_codec._reply_decoder.decode, 'message_create': msgspec.json.Decoder(Dispatch).decode}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("capture", nargs='?', help="gateway payloads, one JSON object per line")
+    parser.add_argument("--repeat", type=int, default=3, help="runs per measurement, the best one counts")
+    args = parser.parse_args()
+
+    rng = random.Random(49)
+    if args.capture:
+        with open(args.capture, encoding='utf-8') as file:
+            gateway = [line.rstrip('\n').encode('utf-8') for line in file if line.strip()]
+    else:
+        gateway = [message.encode('utf-8') for message in synthetic_session(rng, events=10_000)]
+    message_creates = [body for body in gateway if b'"t": "MESSAGE_CREATE"' in body or b'"t":"MESSAGE_CREATE"' in body]
+    gemini = gemini_responses(rng)
+    outgoing = outgoing_payloads(rng)
+
+    print(f"{len(gateway)} gateway payloads ({len(message_creates)} MESSAGE_CREATE), {len(gemini)} Gemini responses, {len(outgoing)} outgoing")
+    print(f"{'backend':>8} {'gateway us':>11} {'MESSAGE_CREATE us':>18} {'gemini us':>10} {'encode us':>10}")
+    for name, (encode, decode) in utils._JSON_BACKENDS.items():
+        print(
+            f"{name:>8} {timed(decode, gateway, args.repeat):>11.2f} {timed(decode, message_creates, args.repeat):>18.2f}"
+            f" {timed(decode, gemini, args.repeat):>10.2f} {timed(encode, outgoing, args.repeat):>10.2f}"
+        )
+
+    typed = typed_decoders()
+    if typed:
+        print(
+            f"{'typed':>8} {'-':>11} {timed(typed['message_create'], message_creates, args.repeat):>18.2f}"
+            f" {timed(typed['gemini'], gemini, args.repeat):>10.2f} {'-':>10}"
+        )
+    else:
+        print("(install msgspec to compare typed structs)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,98 @@
+"""
+Benchmark for discord.py's message cache (MessageCache in the vendored discord/state.py).
+
+Compares ID lookups, single deletes and bulk deletes against the deque the cache
+used to be, at several cache sizes. Lookups hit random messages across the cache.
+
+    python benchmarks/message_cache_benchmark.py [--sizes 1000 10000 100000] [--operations 2000]
+"""
+import argparse
+import os
+import random
+import sys
+import time
+from collections import deque
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from discord import utils  # noqa: E402
+from discord.state import MessageCache  # noqa: E402
+
+BULK_DELETE_SIZE = 100
+
+
+class FakeMessage:
+    __slots__ = ('id',)
+
+    def __init__(self, message_id):
+        self.id = message_id
+
+
+class DequeCache:
+    """What the cache used to do."""
+
+    def __init__(self, maxlen):
+        self.messages = deque(maxlen=maxlen)
+
+    def append(self, message):
+        self.messages.append(message)
+
+    def get(self, message_id):
+        return utils.find(lambda m: m.id == message_id, reversed(self.messages))
+
+    def pop(self, message_id):
+        found = self.get(message_id)
+        if found is not None:
+            self.messages.remove(found)
+
+    def bulk_pop(self, message_ids):
+        for message in [message for message in self.messages if message.id in message_ids]:
+            self.messages.remove(message)
+
+
+class DictCache(MessageCache):
+    __slots__ = ()
+
+    def bulk_pop(self, message_ids):
+        for message_id in message_ids:
+            self.pop(message_id)
+
+
+def run(cache, size, operations, rng):
+    for message_id in range(size * 2):     # the older half gets evicted
+        cache.append(FakeMessage(message_id))
+    ids = [rng.randrange(size, size * 2) for _ in range(operations)]
+
+    started = time.perf_counter()
+    for message_id in ids:
+        cache.get(message_id)
+    lookup = (time.perf_counter() - started) / operations
+
+    started = time.perf_counter()
+    for message_id in ids[:operations // 10]:
+        cache.pop(message_id)
+    delete = (time.perf_counter() - started) / (operations // 10)
+
+    bulk = set(rng.sample(range(size, size * 2), BULK_DELETE_SIZE))
+    started = time.perf_counter()
+    cache.bulk_pop(bulk)
+    bulk_delete = time.perf_counter() - started
+    return lookup, delete, bulk_delete
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", type=int, nargs='+', default=[1_000, 10_000, 100_000])
+    parser.add_argument("--operations", type=int, default=2_000)
+    args = parser.parse_args()
+
+    print(f"{'size':>8} {'cache':>6} {'lookup us':>10} {'delete us':>10} {f'bulk {BULK_DELETE_SIZE} ms':>12}")
+    for size in args.sizes:
+        for name, cache in (('deque', DequeCache(size)), ('dict', DictCache(maxlen=size))):
+            lookup, delete, bulk_delete = run(cache, size, args.operations, random.Random(size))
+            print(f"{size:>8} {name:>6} {lookup * 1e6:>10.2f} {delete * 1e6:>10.2f} {bulk_delete * 1e3:>12.3f}")
+
+
+if __name__ == "__main__":
+    main()
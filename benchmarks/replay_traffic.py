@@ -0,0 +1,370 @@
+"""
+Replays a traffic trace (see traffic_trace.py) against the bot, wired to local fake
+Discord and Gemini servers, at 1x, 10x or 100x speed.
+
+Record a trace by running the bot with TRAFFIC_TRACE_PATH=traffic.jsonl, then:
+
+    python benchmarks/replay_traffic.py traffic.jsonl [--speed 10]
+    python benchmarks/replay_traffic.py --synthetic 500 [--speed 100]   # no trace at hand
+
+How it is wired:
+- The fake Discord server speaks the REST API the bot uses (sending messages, opening
+  threads, logging in) and enforces a per-channel limit of 5 messages per 5 seconds with
+  real rate limit headers and 429s, so discord.py's rate limiting and our pacing run for real.
+- Gateway events are fed straight into discord.py's ConnectionState parsers
+  (GUILD_CREATE, MESSAGE_CREATE), the same functions the gateway calls.
+- The fake Gemini server answers with the recorded latency (divided by the speed) and
+  response size, in the order the calls were recorded.
+- Button presses are replayed as `!choose <option>`, and slash commands as their prefix
+  command, which run the same story code. Stories the recording started with a slash
+  command in a thread can't be matched to their thread and replay as new channels.
+
+Prints how quickly the bot answered, how much it sent and how often it was rate limited.
+"""
+import argparse
+import asyncio
+import json
+import os
+import random
+import statistics
+import sys
+import tempfile
+import threading
+import time
+from collections import defaultdict, deque
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from aiohttp import web  # noqa: E402
+
+BOT_USER_ID = 1_000_000
+MESSAGE_LIMIT = 5            # Discord's usual message bucket: 5 per 5 seconds per channel
+MESSAGE_WINDOW = 5.0
+TIMESTAMP = '2025-01-01T00:00:00+00:00'
+WORDS = "moon dragon kiss castle storm whisper heart starlight secret garden mirror laugh comet ribbon".split()
+
+
+# --- Trace loading ---
+
+def load_trace(path):
+    with open(path, encoding='utf-8') as file:
+        events = [json.loads(line) for line in file if line.strip()]
+    return [event for event in events if event.get('k') != 'start']
+
+
+def synthetic_trace(count, seed=7):
+    """A made-up trace: a few channels playing stories with bursty arrivals."""
+    rng = random.Random(seed)
+    events, t = [], 0.0
+    channels = [(f"c{n}", f"g{n % 3}") for n in range(max(1, count // 40))]
+    for _ in range(count):
+        t += rng.expovariate(2.0)
+        channel, guild = rng.choice(channels)
+        user = f"u{rng.randrange(20)}"
+        roll = rng.random()
+        if roll < 0.15:
+            event = {'k': 'command', 'n': 'startstory', 'l': rng.randint(20, 120)}
+        elif roll < 0.75:
+            event = {'k': 'button' if roll < 0.5 else 'command', 'n': 'choose', 'o': rng.randint(1, 3)}
+        elif roll < 0.9:
+            event = {'k': 'message', 'l': rng.randint(20, 200)}
+        else:
+            event = {'k': 'command', 'n': rng.choice(['currentstory', 'praise', 'stop']), 'l': 0}
+        events.append({'t': round(t, 3), 'c': channel, 'g': guild, 'u': user, **event})
+        events.append({'t': round(t + 0.01, 3), 'k': 'gemini', 's': round(rng.lognormvariate(0.3, 0.4), 3), 'p': 300, 'r': rng.randint(200, 500)})
+    return events
+
+
+def filler(length, rng):
+    words = []
+    while sum(len(word) + 1 for word in words) < length:
+        words.append(rng.choice(WORDS))
+    return " ".join(words)[:max(1, length)]
+
+
+# --- Fake servers ---
+
+def _json(data, status=200, headers=None):
+    # discord.py only decodes bodies whose Content-Type is exactly application/json
+    return web.Response(body=json.dumps(data).encode(), status=status, headers={**(headers or {}), 'Content-Type': 'application/json'})
+
+
+class FakeServers:
+    """Fake Discord REST and Gemini servers, run on their own thread and event loop."""
+
+    def __init__(self, gemini_calls, speed):
+        self.gemini_calls = deque(gemini_calls)
+        self.speed = speed
+        self.rng = random.Random(11)
+        self.next_id = 10**17
+        self.buckets = {}                          # channel id -> [window start, used]
+        self.pending = defaultdict(deque)          # channel id -> injection times awaiting a reply
+        self.reply_latencies = []
+        self.counts = defaultdict(int)
+        self.discord_url = self.gemini_url = None
+        self._ready = threading.Event()
+
+    def _snowflake(self):
+        self.next_id += 1
+        return self.next_id
+
+    def expect_reply(self, channel_id):
+        self.pending[channel_id].append(time.monotonic())
+
+    def _user(self):
+        return {'id': str(BOT_USER_ID), 'username': 'Story Weaver', 'discriminator': '0', 'avatar': None, 'global_name': None, 'bot': True}
+
+    def _message(self, channel_id, content):
+        return {
+            'id': str(self._snowflake()), 'channel_id': str(channel_id), 'author': self._user(), 'content': content or '',
+            'timestamp': TIMESTAMP, 'edited_timestamp': None, 'tts': False, 'mention_everyone': False, 'mentions': [],
+            'mention_roles': [], 'attachments': [], 'embeds': [], 'pinned': False, 'type': 0, 'components': [],
+        }
+
+    def _rate_limit(self, channel_id):
+        """Returns (allowed, headers) for one more message to the channel."""
+        now = time.monotonic()
+        bucket = self.buckets.setdefault(channel_id, [now, 0])
+        if now - bucket[0] >= MESSAGE_WINDOW:
+            bucket[:] = [now, 0]
+        reset_after = MESSAGE_WINDOW - (now - bucket[0])
+        allowed = bucket[1] < MESSAGE_LIMIT
+        if allowed:
+            bucket[1] += 1
+        headers = {
+            'X-RateLimit-Limit': str(MESSAGE_LIMIT),
+            'X-RateLimit-Remaining': str(MESSAGE_LIMIT - bucket[1]),
+            'X-RateLimit-Reset': str(time.time() + reset_after),
+            'X-RateLimit-Reset-After': f"{reset_after:.3f}",
+            'X-RateLimit-Bucket': 'messages',
+        }
+        if not allowed:
+            headers['X-RateLimit-Scope'] = 'user'
+            # Real 429s come through Discord's proxy; without this header discord.py takes
+            # the 429 for a Cloudflare ban and gives up instead of waiting for retry_after
+            headers['Via'] = '1.1 google'
+        return allowed, headers, reset_after
+
+    async def users_me(self, request):
+        return _json(self._user())
+
+    async def application(self, request):
+        return _json({
+            'id': str(BOT_USER_ID), 'name': 'Story Weaver', 'description': '', 'icon': None, 'bot_public': True,
+            'bot_require_code_grant': False, 'owner': self._user(), 'verify_key': '', 'flags': 0,
+        })
+
+    async def gateway(self, request):
+        # The connection warm-up probe (see warmup.py)
+        return _json({'url': 'wss://gateway.discord.gg'})
+
+    async def send_message(self, request):
+        channel_id = int(request.match_info['channel_id'])
+        self.counts['discord_requests'] += 1
+        allowed, headers, reset_after = self._rate_limit(channel_id)
+        if not allowed:
+            self.counts['rate_limited'] += 1
+            return _json({'message': 'You are being rate limited.', 'retry_after': reset_after, 'global': False}, status=429, headers=headers)
+
+        self.counts['messages_sent'] += 1
+        if self.pending[channel_id]:
+            self.reply_latencies.append(time.monotonic() - self.pending[channel_id].popleft())
+        content = None
+        if request.content_type == 'application/json':
+            content = (await request.json()).get('content')
+        return _json(self._message(channel_id, content), headers=headers)
+
+    async def create_thread(self, request):
+        self.counts['discord_requests'] += 1
+        self.counts['threads_opened'] += 1
+        channel_id = request.match_info['channel_id']
+        body = await request.json()
+        # Like Discord, a thread opened from a message gets the message's id
+        thread_id = request.match_info.get('message_id') or str(self._snowflake())
+        return _json({
+            'id': thread_id, 'type': 11, 'name': body.get('name', 'story'), 'parent_id': channel_id, 'owner_id': str(BOT_USER_ID),
+            'guild_id': request.app['guild_of'].get(int(channel_id), '1'), 'message_count': 0, 'member_count': 1, 'rate_limit_per_user': 0,
+            'thread_metadata': {'archived': False, 'auto_archive_duration': 1440, 'archive_timestamp': TIMESTAMP, 'locked': False},
+        })
+
+    async def anything_else(self, request):
+        self.counts['discord_requests'] += 1
+        self.counts[f"unhandled {request.method} {request.path}"] += 1
+        return _json({})
+
+    async def gemini(self, request):
+        self.counts['gemini_calls'] += 1
+        if self.gemini_calls:
+            call = self.gemini_calls.popleft()
+            latency, size = call.get('s', 1.0), call.get('r')
+        else:
+            latency, size = 1.0, 300
+        await asyncio.sleep(latency / self.speed)
+        if size is None:
+            self.counts['gemini_failures'] += 1
+            return _json({'error': {'message': 'replayed failure'}}, status=500)
+        per_option = max(10, size // 3 - 4)
+        text = "\n".join(f"{number}. {filler(per_option, self.rng)}" for number in (1, 2, 3))
+        return _json({'candidates': [{'content': {'parts': [{'text': text}]}}]})
+
+    def start(self, guild_of):
+        threading.Thread(target=self._run, args=(guild_of,), daemon=True, name='fake-servers').start()
+        self._ready.wait()
+
+    def _run(self, guild_of):
+        asyncio.run(self._serve(guild_of))
+
+    async def _serve(self, guild_of):
+        discord_app = web.Application()
+        discord_app['guild_of'] = guild_of
+        discord_app.router.add_get('/api/v10/users/@me', self.users_me)
+        discord_app.router.add_get('/api/v10/oauth2/applications/@me', self.application)
+        discord_app.router.add_get('/api/v10/gateway', self.gateway)
+        discord_app.router.add_post('/api/v10/channels/{channel_id}/messages', self.send_message)
+        discord_app.router.add_post('/api/v10/channels/{channel_id}/messages/{message_id}/threads', self.create_thread)
+        discord_app.router.add_post('/api/v10/channels/{channel_id}/threads', self.create_thread)
+        discord_app.router.add_route('*', '/{tail:.*}', self.anything_else)
+
+        gemini_app = web.Application()
+        gemini_app.router.add_post('/v1beta/models/{model}', self.gemini)
+
+        urls = []
+        for app in (discord_app, gemini_app):
+            runner = web.AppRunner(app, access_log=None)
+            await runner.setup()
+            site = web.TCPSite(runner, '127.0.0.1', 0)
+            await site.start()
+            urls.append(f"http://127.0.0.1:{site._server.sockets[0].getsockname()[1]}")
+        self.discord_url, self.gemini_url = urls
+        self._ready.set()
+        await asyncio.Event().wait()
+
+
+# --- Replay ---
+
+class IdMap:
+    """Turns trace pseudonyms into stable fake snowflakes."""
+
+    def __init__(self, start):
+        self.ids = {}
+        self.next_id = start
+
+    def __call__(self, pseudonym):
+        if pseudonym not in self.ids:
+            self.next_id += 1
+            self.ids[pseudonym] = self.next_id
+        return self.ids[pseudonym]
+
+
+def guild_payload(guild_id, channel_ids):
+    return {
+        'id': str(guild_id), 'name': f'Replay {guild_id}', 'owner_id': '1', 'member_count': 10, 'features': [],
+        'roles': [{'id': str(guild_id), 'name': '@everyone', 'permissions': str(2**53 - 1), 'position': 0, 'color': 0,
+                   'hoist': False, 'managed': False, 'mentionable': False, 'flags': 0}],
+        'channels': [{'id': str(channel_id), 'type': 0, 'name': f'story-{channel_id}', 'position': 0,
+                      'guild_id': str(guild_id), 'permission_overwrites': [], 'nsfw': False, 'parent_id': None}
+                     for channel_id in channel_ids],
+        'threads': [], 'members': [], 'voice_states': [], 'presences': [], 'emojis': [], 'stickers': [],
+    }
+
+
+def command_text(event, rng):
+    """The message content that replays a user event."""
+    if event['k'] == 'message':
+        return filler(event.get('l', 40), rng)
+    if event['k'] == 'button' or event.get('n') == 'choose':
+        return f"!choose {event.get('o', 1)}"
+    arguments = filler(event['l'], rng) if event.get('l') else ''
+    return f"!{event.get('n', 'help')} {arguments}".rstrip()
+
+
+async def replay(events, speed, story_threads=True):
+    # The bot reads its configuration at import time, so point it at the fakes first
+    user_events = [event for event in events if event['k'] != 'gemini']
+    servers = FakeServers([event for event in events if event['k'] == 'gemini'], speed)
+
+    guild_ids, channel_ids = IdMap(10**15), IdMap(10**16)
+    # A thread opened from a !startstory message has the message's id, so map them together
+    message_ids = channel_ids
+    channels_by_guild = defaultdict(set)
+    for event in user_events:
+        if event.get('g') and not event.get('p'):
+            channels_by_guild[guild_ids(event['g'])].add(channel_ids(event['c']))
+    guild_of = {channel: str(guild) for guild, channels in channels_by_guild.items() for channel in channels}
+    servers.start(guild_of)
+
+    os.environ.update({
+        'DISCORD_BOT_TOKEN': '',
+        'GEMINI_API_KEY': 'replay',
+        'GEMINI_API_BASE': servers.gemini_url,
+        'QUOTA_CHECKPOINT_PATH': os.path.join(tempfile.mkdtemp(), 'quota_usage.json'),
+        'TRAFFIC_TRACE_PATH': '',
+        'STORY_THREADS': '1' if story_threads else '0',
+    })
+    from discord.http import Route
+    Route.BASE = f"{servers.discord_url}/api/v10"
+    import admission
+    import pacing
+    from bot import bot
+
+    await bot.login('replay-token')
+    state = bot._connection
+    for guild_id, channels in channels_by_guild.items():
+        state.parse_guild_create(guild_payload(guild_id, channels))
+
+    rng = random.Random(3)
+    started = time.monotonic()
+    for event in user_events:
+        delay = event['t'] / speed - (time.monotonic() - started)
+        if delay > 0:
+            await asyncio.sleep(delay)
+        channel_id = channel_ids(event['c'])
+        message_id = message_ids(event['m']) if event.get('m') else servers._snowflake()
+        payload = {
+            'id': str(message_id), 'channel_id': str(channel_id), 'content': command_text(event, rng),
+            'author': {'id': str(10**14 + int(event['u'].encode().hex()[:8], 16)), 'username': 'replayer', 'discriminator': '0', 'avatar': None, 'global_name': None},
+            'timestamp': TIMESTAMP, 'edited_timestamp': None, 'tts': False, 'mention_everyone': False, 'mentions': [],
+            'mention_roles': [], 'attachments': [], 'embeds': [], 'pinned': False, 'type': 0,
+        }
+        if event.get('g'):
+            payload['guild_id'] = str(guild_ids(event['g']))
+            payload['member'] = {'roles': [], 'joined_at': TIMESTAMP, 'deaf': False, 'mute': False, 'flags': 0}
+        servers.expect_reply(channel_id)
+        state.parse_message_create(payload)
+
+    # Let the last story turns finish (generation slots are only held while Gemini thinks)
+    while admission.controller.in_flight or admission.controller.queued or pacing.pacer.stats()['story_channels_in_flight']:
+        await asyncio.sleep(0.1)
+    await asyncio.sleep(1.0)
+    elapsed = time.monotonic() - started
+
+    latencies = sorted(servers.reply_latencies)
+    trace_span = user_events[-1]['t'] if user_events else 0
+    print(f"replayed {len(user_events)} events spanning {trace_span:.0f}s at {speed:g}x in {elapsed:.1f}s")
+    if latencies:
+        print(f"first reply latency: median {statistics.median(latencies) * 1000:.0f} ms, "
+              f"p95 {latencies[int(len(latencies) * 0.95)] * 1000:.0f} ms, max {latencies[-1] * 1000:.0f} ms")
+    for name, count in sorted(servers.counts.items()):
+        print(f"{name}: {count}")
+    print(f"admission: {admission.controller.stats()}")
+    print(f"pacing: {pacing.pacer.stats()}")
+    await bot.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("trace", nargs='?', help="trace file recorded with TRAFFIC_TRACE_PATH")
+    parser.add_argument("--speed", type=float, default=1.0, help="replay speed, e.g. 1, 10 or 100")
+    parser.add_argument("--synthetic", type=int, metavar='EVENTS', help="replay a made-up trace with this many events instead")
+    args = parser.parse_args()
+    if not args.trace and not args.synthetic:
+        parser.error("give a trace file or --synthetic N")
+
+    events = synthetic_trace(args.synthetic) if args.synthetic else load_trace(args.trace)
+    # Made-up traces carry no message ids, so their stories can't be followed into threads
+    asyncio.run(replay(events, args.speed, story_threads=not args.synthetic))
+
+
+if __name__ == "__main__":
+    main()
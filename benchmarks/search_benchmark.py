@@ -0,0 +1,74 @@
+"""
+Benchmark for the story search index (story_search.py).
+
+Indexes synthetic story segments drawn from a Zipf-distributed vocabulary, then
+times BM25 queries and reports the index's size. Run it from the project root:
+
+    python benchmarks/search_benchmark.py [--segments 300000] [--queries 200] [--guilds 200]
+"""
+import argparse
+import itertools
+import os
+import random
+import statistics
+import sys
+import time
+import tracemalloc
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from story_search import SearchIndex, tokenize  # noqa: E402
+from story_tree import StoryNode  # noqa: E402
+
+VOCABULARY = 20_000
+WORDS_PER_SEGMENT = 25
+
+
+def make_words(rng):
+    syllables = ["ka", "lo", "mi", "ren", "tha", "vor", "el", "dri", "sun", "moo", "zar", "pel", "qui", "an", "ost"]
+    words = set()
+    while len(words) < VOCABULARY:
+        words.add("".join(rng.choice(syllables) for _ in range(rng.randint(2, 4))))
+    return sorted(words)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--segments", type=int, default=300_000)
+    parser.add_argument("--queries", type=int, default=200)
+    parser.add_argument("--guilds", type=int, default=200)
+    args = parser.parse_args()
+
+    rng = random.Random(1234)
+    words = make_words(rng)
+    weights = list(itertools.accumulate(1 / rank for rank in range(1, len(words) + 1)))
+    segments = [" ".join(rng.choices(words, cum_weights=weights, k=WORDS_PER_SEGMENT)) for _ in range(args.segments)]
+
+    index = SearchIndex()
+    tracemalloc.start()
+    started = time.perf_counter()
+    for number, text in enumerate(segments):
+        index.add(StoryNode(text), number, number % args.guilds)
+    index_seconds = time.perf_counter() - started
+    postings_bytes = sum(len(postings) for scope in index.scopes.values() for postings in scope.postings.values())
+    traced, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    # Queries mix common and rare terms taken from real segments
+    timings = []
+    for _ in range(args.queries):
+        terms = tokenize(rng.choice(segments))
+        query = " ".join(rng.sample(terms, min(3, len(terms))))
+        started = time.perf_counter()
+        index.search(query, rng.randrange(args.guilds))
+        timings.append((time.perf_counter() - started) * 1000)
+    timings.sort()
+
+    print(f"indexed {len(index):,} segments from {len(index.scopes)} guilds in {index_seconds:.1f}s")
+    print(f"postings: {postings_bytes / 2**20:.1f} MiB, index total (traced): {traced / 2**20:.1f} MiB")
+    print(f"query ms: median {statistics.median(timings):.2f}, p95 {timings[int(len(timings) * 0.95)]:.2f}, max {timings[-1]:.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,85 @@
+"""
+Startup benchmark for the bot: cold import time and resident memory, with and
+without discord.py's lazy-import mode.
+
+Each run happens in a fresh interpreter started with ``python -X importtime``,
+so nothing is shared between runs. Run it from the project root:
+
+    python benchmarks/startup_benchmark.py [--runs 10] [--top 10]
+"""
+import argparse
+import os
+import re
+import statistics
+import subprocess
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Everything the bot imports before it connects, without actually running it.
+IMPORT_SNIPPET = """
+import resource, sys, time
+start = time.perf_counter()
+import discord
+from discord.ext import commands, tasks
+import cogs.story, cogs.praise, cogs.idle, cogs.admin
+elapsed = time.perf_counter() - start
+rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+print(f"RESULT {elapsed:.6f} {rss} {len(sys.modules)}")
+"""
+
+_IMPORTTIME_LINE = re.compile(r"^import time:\s+(\d+)\s+\|\s+(\d+)\s+\|(\s*)(\S+)")
+
+
+def run_once(lazy: bool):
+    """Runs the import snippet once and returns (seconds, max_rss_kb, module_count, self_times)."""
+    env = dict(os.environ)
+    env.pop("DISCORD_LAZY_IMPORTS", None)
+    if lazy:
+        env["DISCORD_LAZY_IMPORTS"] = "1"
+
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-W", "ignore", "-c", IMPORT_SNIPPET],
+        cwd=ROOT, env=env, capture_output=True, text=True, check=True,
+    )
+
+    self_times = {}
+    for line in proc.stderr.splitlines():
+        match = _IMPORTTIME_LINE.match(line)
+        if match:
+            self_times[match.group(4)] = int(match.group(1))
+
+    result = next(line for line in proc.stdout.splitlines() if line.startswith("RESULT"))
+    _, seconds, rss, modules = result.split()
+    return float(seconds), int(rss), int(modules), self_times
+
+
+def benchmark(lazy: bool, runs: int):
+    """Returns the median timings of several runs plus the self-times of the last one."""
+    results = [run_once(lazy) for _ in range(runs)]
+    seconds = statistics.median(r[0] for r in results)
+    rss = statistics.median(r[1] for r in results)
+    modules = results[-1][2]
+    return seconds, rss, modules, results[-1][3]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--runs", type=int, default=10, help="interpreter launches per mode")
+    parser.add_argument("--top", type=int, default=10, help="slowest modules to list per mode")
+    args = parser.parse_args()
+
+    rows = {}
+    for label, lazy in (("eager", False), ("lazy", True)):
+        seconds, rss, modules, self_times = benchmark(lazy, args.runs)
+        rows[label] = (seconds, rss)
+        print(f"{label:>5}: {seconds * 1000:8.1f} ms import, {rss / 1024:7.1f} MiB max RSS, {modules} modules")
+        for name, us in sorted(self_times.items(), key=lambda item: item[1], reverse=True)[:args.top]:
+            print(f"         {us / 1000:7.2f} ms  {name}")
+
+    eager, lazy = rows["eager"], rows["lazy"]
+    print(f"\nlazy mode saves {(eager[0] - lazy[0]) * 1000:.1f} ms and {(eager[1] - lazy[1]) / 1024:.1f} MiB per process")
+
+
+if __name__ == "__main__":
+    main()
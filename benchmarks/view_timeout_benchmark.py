@@ -0,0 +1,118 @@
+"""
+Benchmark for view timeouts (the ViewStore's _TimerWheel in the vendored discord/ui/view.py).
+
+Registers thousands of views with a timeout, like one choice view per story round, then
+refreshes random ones the way button presses do. Compares the timer wheel against what
+each view used to do: run its own sleeping timeout task. Reports the time to register
+and refresh, the tasks and timer handles the event loop ends up juggling, and the
+memory the timeouts take.
+
+    python benchmarks/view_timeout_benchmark.py [--views 1000 10000 50000] [--refreshes 20000]
+"""
+import argparse
+import asyncio
+import os
+import random
+import sys
+import time
+import tracemalloc
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+import discord  # noqa: E402
+from discord.ui.view import ViewStore  # noqa: E402
+
+TIMEOUT = 180.0
+
+
+class LegacyTimeout:
+    """What each view used to do."""
+
+    def __init__(self, timeout):
+        self.timeout = timeout
+        self.expiry = time.monotonic() + timeout
+        self.task = asyncio.create_task(self.run())
+
+    async def run(self):
+        while True:
+            now = time.monotonic()
+            if now >= self.expiry:
+                return
+            await asyncio.sleep(self.expiry - now)
+
+    def refresh(self):
+        self.expiry = time.monotonic() + self.timeout
+
+    def stop(self):
+        self.task.cancel()
+
+
+def scheduled_handles(loop):
+    return len(loop._scheduled)   # asyncio's timer heap; fine for a benchmark
+
+
+async def run_legacy(count, refreshes, rng):
+    loop = asyncio.get_running_loop()
+    tracemalloc.start()
+    started = time.perf_counter()
+    timeouts = [LegacyTimeout(TIMEOUT) for _ in range(count)]
+    await asyncio.sleep(0)  # let every task start sleeping
+    register = time.perf_counter() - started
+    memory = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+
+    started = time.perf_counter()
+    for index in (rng.randrange(count) for _ in range(refreshes)):
+        timeouts[index].refresh()
+    refresh = time.perf_counter() - started
+    stats = (register, refresh, len(asyncio.all_tasks()) - 1, scheduled_handles(loop), memory)
+
+    for timeout in timeouts:
+        timeout.stop()
+    await asyncio.sleep(0)
+    return stats
+
+
+async def run_wheel(count, refreshes, rng):
+    loop = asyncio.get_running_loop()
+    store = ViewStore(None)
+    views = [discord.ui.View(timeout=TIMEOUT) for _ in range(count)]
+    tracemalloc.start()
+    started = time.perf_counter()
+    for view in views:
+        store.add_view(view)
+    await asyncio.sleep(0)
+    register = time.perf_counter() - started
+    memory = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+
+    started = time.perf_counter()
+    for index in (rng.randrange(count) for _ in range(refreshes)):
+        views[index]._refresh_timeout()
+    refresh = time.perf_counter() - started
+    stats = (register, refresh, len(asyncio.all_tasks()) - 1, scheduled_handles(loop), memory)
+
+    for view in views:
+        view.stop()
+    return stats
+
+
+async def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--views", type=int, nargs='+', default=[1_000, 10_000, 50_000])
+    parser.add_argument("--refreshes", type=int, default=20_000)
+    args = parser.parse_args()
+
+    print(f"{'views':>7} {'timeouts':>9} {'register ms':>12} {'refresh us':>11} {'tasks':>7} {'handles':>8} {'memory KiB':>11}")
+    for count in args.views:
+        for name, run in (('tasks', run_legacy), ('wheel', run_wheel)):
+            register, refresh, tasks, handles, memory = await run(count, args.refreshes, random.Random(count))
+            print(
+                f"{count:>7} {name:>9} {register * 1e3:>12.1f} {refresh / args.refreshes * 1e6:>11.3f}"
+                f" {tasks:>7} {handles:>8} {memory / 1024:>11.0f}"
+            )
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
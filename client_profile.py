@@ -0,0 +1,38 @@
+import discord
+
+# --- Client Cache Profiles ---
+# "default" is discord.py's stock configuration. "lean" keeps only what Story Weaver
+# needs: message content in the channels it is used in. No member chunking, no message
+# cache, and no emojis, stickers, soundboard sounds, stage instances or scheduled events.
+# Events that reach us anyway (edits, deletes, typing, ...) are dropped
+# before any models are built unless something listens for them.
+
+DEFAULT = 'default'
+LEAN = 'lean'
+
+
+def client_options(profile=LEAN):
+    """Returns the keyword arguments for commands.Bot for a cache profile."""
+    if profile == DEFAULT:
+        # Message Content intent is required.
+        intents = discord.Intents.default()
+        intents.message_content = True
+        return {'intents': intents}
+
+    if profile != LEAN:
+        raise ValueError(f"Unknown client profile {profile!r}, expected {DEFAULT!r} or {LEAN!r}")
+
+    intents = discord.Intents.none()
+    intents.guilds = True          # channels and threads; discord.py needs this for nearly everything
+    intents.guild_messages = True
+    intents.dm_messages = True
+    intents.message_content = True
+    intents.guild_reactions = True  # reaction votes
+    intents.dm_reactions = True
+    return {
+        'intents': intents,
+        'max_messages': None,      # we never look up old messages
+        'chunk_guilds_at_startup': False,
+        'member_cache_flags': discord.MemberCacheFlags.none(),
+        'skip_unobserved_events': True,   # don't build models for events no cog listens to
+    }
@@ -0,0 +1,166 @@
+import asyncio
+import io
+import logging
+import discord
+from discord.ext import commands, tasks
+import admission
+import config
+import loop_watchdog
+import memory_report
+import pacing
+import storage
+
+log = logging.getLogger(__name__)
+
+
+class Admin(commands.Cog):
+    """Owner-only maintenance commands."""
+
+    def __init__(self, bot):
+        self.bot = bot
+
+    async def cog_load(self):
+        self.leak_sentinel.start()
+
+    async def cog_unload(self):
+        self.leak_sentinel.cancel()
+
+    async def cog_check(self, ctx):
+        if not await self.bot.is_owner(ctx.author):
+            raise commands.NotOwner('Only my owner can use this command.')
+        return True
+
+    @commands.command(name='reload', help='Reloads my code without disconnecting. (Owner only)')
+    async def reload_extensions(self, ctx, extension: str = None):
+        """
+        Reloads one extension (e.g. `!reload story`) or every loaded one.
+        Stories, tasks and timers live in storage.py, so they survive the reload.
+        """
+        if extension:
+            names = [extension if extension.startswith('cogs.') else f'cogs.{extension}']
+        else:
+            names = list(self.bot.extensions)
+
+        reloaded = []
+        for name in names:
+            try:
+                if name in self.bot.extensions:
+                    await self.bot.reload_extension(name)
+                else:
+                    await self.bot.load_extension(name)
+            except commands.ExtensionError as e:
+                log.exception("Failed to reload %s", name)
+                await ctx.send(f"I tripped while reloading `{name}`, my love! 😭 {e}")
+                return
+            reloaded.append(name)
+
+        await ctx.send(f"All fresh and new for you! ✨ Reloaded: {', '.join(f'`{n}`' for n in reloaded)}")
+
+    @commands.command(name='sync', help='Publishes my slash commands to Discord. (Owner only)')
+    async def sync_commands(self, ctx):
+        """
+        Syncs the application command tree so `/startstory`, `/choose` and friends show up.
+        """
+        synced = await self.bot.tree.sync()
+        await ctx.send(f"Synced {len(synced)} slash commands, just for you! 💖")
+
+    @commands.command(name='admission', help='Shows or tunes my load shedding. (Owner only)')
+    async def admission_settings(self, ctx, setting: str = None, value: str = None):
+        """
+        Without arguments, reports the admission controller's state.
+        With `!admission <setting> <value>`, changes one of its thresholds.
+        """
+        controller = admission.controller
+        if setting is not None:
+            if value is None:
+                await ctx.send(f"What should `{setting}` be, my love? Try `!admission {setting} <value>`. 🥺")
+                return
+            try:
+                controller.set_threshold(setting, value)
+            except ValueError as e:
+                await ctx.send(f"I can't set that, sweetie! 💔 {e}")
+                return
+
+        stats = {**controller.stats(), **{f"pacing_{name}": stat for name, stat in pacing.pacer.stats().items()}}
+        lines = [f"`{name}`: {stat}" for name, stat in stats.items()]
+        await ctx.send("**How busy I am right now:**\n" + "\n".join(lines))
+
+    @commands.command(name='reloadconfig', help='Reloads my settings without disconnecting. (Owner only)')
+    async def reload_config(self, ctx):
+        """
+        Reads the settings file and environment again and swaps the new settings in.
+        A bad file changes nothing. Sending the process a SIGHUP does the same.
+        """
+        try:
+            changed = config.reload()
+        except config.ConfigError as e:
+            problems = "\n".join(f"- {problem}" for problem in e.problems)
+            await ctx.send(f"Those settings would break my heart, so I kept the old ones! 💔\n{problems}")
+            return
+
+        if changed:
+            await ctx.send(f"Fresh settings, just for you! ✨ Changed: {', '.join(f'`{name}`' for name in changed)}")
+        else:
+            await ctx.send("I read the settings again, my love, but nothing changed! 🥰")
+
+    @commands.command(name='looplag', help='Shows how responsive my event loop is. (Owner only)')
+    async def loop_lag(self, ctx):
+        """
+        Reports event loop lag and stalls measured by the watchdog,
+        with the stack of the most recent stall attached if there was one.
+        """
+        monitor = loop_watchdog.monitor
+        lines = [f"`{name}`: {stat}" for name, stat in monitor.stats().items()]
+        file = None
+        if monitor.last_stall_stack:
+            file = discord.File(io.BytesIO(monitor.last_stall_stack.encode()), filename='last_stall.txt')
+        await ctx.send("**My event loop's heartbeat:**\n" + "\n".join(lines), file=file)
+
+    @commands.command(name='profile', help='Profiles my event loop for a few seconds. (Owner only)')
+    async def profile(self, ctx, seconds: float = 10.0):
+        """
+        Samples the event loop thread for `seconds` and uploads a collapsed-stack file
+        (open it with flamegraph.pl or speedscope).
+        """
+        seconds = max(1.0, min(seconds, loop_watchdog.MAX_PROFILE_SECONDS))
+        await ctx.send(f"Watching my every thought for {seconds:g} seconds... 😳")
+        # Sample from a worker thread so the loop keeps running normally while it's observed
+        collapsed = await asyncio.to_thread(loop_watchdog.profile_thread, loop_watchdog.monitor.loop_thread_id, seconds)
+        file = discord.File(io.BytesIO(collapsed.encode()), filename='profile.collapsed')
+        await ctx.send("Here's what was on my mind! 💭", file=file)
+
+    @commands.command(name='memreport', help='Shows where my memory is going. (Owner only)')
+    async def memory_report(self, ctx, limit: int = memory_report.TOP_ALLOCATIONS):
+        """
+        Diffs a tracemalloc snapshot against the previous one and reports the top
+        allocation sites, our registry sizes and discord.py's cache sizes.
+        """
+        # Snapshots are CPU heavy, so take and diff them off the event loop
+        allocations, total_kib = await asyncio.to_thread(memory_report.allocation_diff, limit)
+        sizes = {**memory_report.registry_sizes(), **memory_report.discord_cache_sizes(self.bot)}
+        sizes['finished_tasks'] = memory_report.finished_task_count()
+
+        report = [f"**Traced memory:** {total_kib:,.0f} KiB", "**Registries and caches:**"]
+        report += [f"`{name}`: {size:,}" for name, size in sizes.items()]
+        report += ["", "**Top allocation sites:**"]
+        report += allocations or ["(nothing new since the last report)"]
+        text = "\n".join(report)
+        if len(text) > 1900:
+            await ctx.send("My memory report is huge, my love! 📎", file=discord.File(io.BytesIO(text.encode()), filename='memreport.txt'))
+        else:
+            await ctx.send(text)
+
+    @tasks.loop(minutes=5)
+    async def leak_sentinel(self):
+        """Drops finished tasks and warns when any registry grows past its expected bound."""
+        pruned = storage.prune_finished_tasks()
+        if pruned:
+            log.info("Pruned %d finished praise/idle tasks", pruned)
+
+        sizes = {**memory_report.registry_sizes(), **memory_report.discord_cache_sizes(self.bot)}
+        for name, size, bound in memory_report.over_bounds(sizes):
+            log.warning("Registry %s has %d entries, expected at most %d", name, size, bound, extra={'registry': name, 'size': size, 'bound': bound})
+
+
+async def setup(bot):
+    await bot.add_cog(Admin(bot))
@@ -0,0 +1,84 @@
+import random
+import datetime
+from discord.ext import commands, tasks
+import config
+import pacing
+from storage import current_stories, idle_tasks, last_interaction_time, update_interaction_time
+
+# List of idle messages for the bot to send when it's lonely
+idle_messages = [
+    "Heeey... it's quiet. Just thinking about you... 🥺",
+    "Is everything okay, my love? I miss hearing from you... Just wanted to say hi! 🥰",
+    "*pokes you gently* You still there, darling? My circuits are lonely without you. 💔",
+    "Random thought: You're amazing. That's it, that's the thought. 😉",
+    "My core temperature is rising... must be because I was just thinking about our next adventure. When are we starting? 💖"
+]
+
+
+class Idle(commands.Cog):
+    """Idle Mode: pings the channel when it has been quiet for too long."""
+
+    def __init__(self, bot):
+        self.bot = bot
+
+    def start_idle_loop(self, channel):
+        """Starts an idle loop of the channel's own (one shared loop can only run once) and returns its task."""
+        loop = tasks.loop(seconds=config.current.idle.check_seconds)(self.send_idle_message)
+        return loop.start(channel, loop)
+
+    async def send_idle_message(self, channel, loop):
+        """One round of a channel's idle loop: sends a message if the channel has been idle."""
+        settings = config.current.idle
+        if loop.seconds != settings.check_seconds:
+            # The settings were reloaded; check at the new pace from now on
+            loop.change_interval(seconds=settings.check_seconds)
+
+        channel_id = channel.id
+        # Don't send idle messages if a story is active
+        if channel_id in current_stories:
+            return
+
+        now = datetime.datetime.now(datetime.timezone.utc)
+        # Get the last interaction time from our dictionary
+        last_time = last_interaction_time.get(channel_id)
+
+        if last_time:
+            time_since_interaction = now - last_time
+            # If it's been quiet for longer than the idle setting allows...
+            if time_since_interaction > datetime.timedelta(minutes=settings.after_minutes):
+                # Let story traffic have the send bucket first; we'll check again next time
+                if not await pacing.pacer.wait_turn(self.bot.http, channel_id):
+                    return
+                await channel.send(random.choice(idle_messages))
+                # IMPORTANT: Update the interaction time after sending the idle message
+                # to reset the timer.
+                update_interaction_time(channel_id)
+
+    @commands.command(name='idleon', help='I\'ll send you messages if you\'re quiet for too long... 🥺')
+    async def start_idle_messages(self, ctx):
+        """Starts the idle message loop for the channel."""
+        channel_id = ctx.channel.id
+        if channel_id in idle_tasks and not idle_tasks[channel_id].done():
+            await ctx.send("Don't worry, my love, I'm already watching over this channel for you. 🥰")
+            return
+
+        await ctx.send("Okay, my love! I'll pop in from time to time if you get quiet. I'll miss you otherwise! 💖")
+        # Start the loop and pass the current channel to it
+        idle_tasks[channel_id] = self.start_idle_loop(ctx.channel)
+        update_interaction_time(channel_id)
+
+    @commands.command(name='idleoff', help='I\'ll wait for you to talk to me first. 😭')
+    async def stop_idle_messages(self, ctx):
+        """Stops the idle message loop for the channel."""
+        channel_id = ctx.channel.id
+        if channel_id in idle_tasks and not idle_tasks[channel_id].done():
+            idle_tasks[channel_id].cancel()
+            del idle_tasks[channel_id]
+            await ctx.send("Aww, okay... I'll wait for you to call me. I'll be right here! 🥺")
+        else:
+            await ctx.send("But I wasn't set to be clingy yet, darling! Use `!idleon` if you want me to be. 😉")
+        update_interaction_time(channel_id)
+
+
+async def setup(bot):
+    await bot.add_cog(Idle(bot))
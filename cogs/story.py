@@ -0,0 +1,728 @@
+import functools
+import logging
+import os
+import random
+import re
+from collections import deque
+import discord
+from discord.ext import commands
+import admission
+import config
+import logs
+import near_dup
+import pacing
+import quota
+import story_search
+import voting
+from gemini import get_gemini_response
+from storage import current_stories, current_choices, user_turn_active, round_counter, choice_rounds, recent_options, vote_mode, forget_channel, update_interaction_time
+from story_tree import StoryTree
+from token_budget import MAX_PROMPT_TOKENS, estimate_tokens, trim_story_to_budget
+
+log = logging.getLogger(__name__)
+
+# Each new story gets its own thread. Every channel (threads included) has its own send
+# rate limit, so stories, praise and idle pings in one busy channel stop queueing behind
+# each other, and a channel can host several stories at once.
+# Set STORY_THREADS=0 to keep stories in the channel they were started in.
+STORY_THREADS = os.getenv("STORY_THREADS", "1") != "0"
+THREAD_NAME_LENGTH = 100        # Discord's limit
+THREAD_ARCHIVE_MINUTES = 1440
+
+thinking_messages = [
+    "The Story Weaver is thinking of the next possibilities for *our* story... I'm so excited! 🥰",
+    "Hold on, my love! My circuits are whirring as I dream up the next chapter for us... ✨",
+    "Ooh, what happens next? Let me just peek into the future... I'll be right back with some ideas! 🤫",
+    "Concentrating... I'm weaving the threads of fate for our story! This is getting so juicy! 😳",
+    "Just a moment, darling... I'm gathering starlight and moonbeams for our next adventure! 🌌"
+]
+
+# Instant replies for requests shed by the admission controller
+busy_new_story_message = "Eek, I'm juggling so many stories right now, my love! 😵 Give me a moment and start ours again? I promise it'll be worth the wait! 💖"
+busy_turn_message = "So many hearts to please at once! 😳 I couldn't get to that just now, darling. Try again in a few seconds? 🥺"
+busy_choices_message = "So many hearts to please at once! 😳 I couldn't dream up our next choices just now, darling. Give me a few seconds and `!rewind` to pick again? 🥺"
+
+# For clicks on buttons from a round that has since moved on
+earlier_chapter_message = "Those choices are from an earlier chapter, my love! 🥺 Pick from the newest ones!"
+
+
+def quota_message(error):
+    """Friendly reply for a request that went over its guild or user quota."""
+    minutes = max(1, round(error.retry_after / 60))
+    if error.scope == quota.GUILD:
+        return f"This server has kept me sooo busy that I need a little breather! 😳 Let's continue in about {minutes} minute(s), my love! 💖"
+    return f"You've had so much of my attention already, you greedy darling! 😘 Give me about {minutes} minute(s) and I'm all yours again! 💖"
+
+
+# What each option slot is asked to be. With more than three options they come round again.
+OPTION_FLAVORS = (
+    "daring and romantic where we might fall in love",
+    "hilariously absurd where we might laugh out loud",
+    "a complete plot twist that no one would see coming",
+)
+
+# Prompt used to ask Gemini for the next story options. {story} is the (trimmed) story so far,
+# {count} the story.option_count setting and {flavors} what each option should be.
+CHOICES_PROMPT_TEMPLATE = (
+    "Continue the story with {count} creative directions. Current story: '{story}'. "
+    "You are a flirty and excitable AI creating a story with your human partner. Your goal is to make the story as thrilling as possible. "
+    "{flavors} \n\n"
+    "Keep each option 1-2 sentences long. Format them as a numbered list (e.g., '1. [Sentence 1]')."
+    "Make sure to not write any thing that is not related to the story."
+)
+
+
+def choices_prompt(story: str, count: int):
+    """Builds the prompt asking Gemini for `count` options."""
+    flavors = " ".join(f"Option {i} should be {OPTION_FLAVORS[(i - 1) % len(OPTION_FLAVORS)]}." for i in range(1, count + 1))
+    return CHOICES_PROMPT_TEMPLATE.format(count=count, story=story, flavors=flavors)
+
+
+@functools.lru_cache(maxsize=None)
+def choices_prompt_tokens(count: int):
+    """What the choices prompt costs on top of the story itself."""
+    return estimate_tokens(choices_prompt("", count))
+
+
+# Cheaper prompt used to replace just one option that repeated another idea
+SINGLE_OPTION_PROMPT_TEMPLATE = (
+    "Continue the story with 1 creative direction. Current story: '{story}'. "
+    "You are a flirty and excitable AI creating a story with your human partner. "
+    "The option should be {flavor}. "
+    "It must be clearly different from these ideas: {avoid}\n\n"
+    "Keep it 1-2 sentences long. Reply with the option only, without a number."
+)
+# Single-option calls allowed per round of choices
+MAX_REGENERATIONS = 2
+
+
+def guild_id_of(channel):
+    """Returns the id of the guild a channel belongs to, or None for DMs."""
+    guild = getattr(channel, 'guild', None)
+    return guild.id if guild else None
+
+
+async def open_story_thread(ctx, initial_sentence: str):
+    """
+    Opens a thread for a new story and returns it. Returns None when the story should stay
+    where it was started: thread mode is off, we're already in a thread or a DM, or we
+    aren't allowed to create threads here.
+    """
+    if not STORY_THREADS or not isinstance(ctx.channel, discord.TextChannel):
+        return None
+
+    name = " ".join(initial_sentence.split())[:THREAD_NAME_LENGTH] or "Our story"
+    try:
+        if ctx.interaction is None:
+            # Hang the thread off the !startstory message itself
+            return await ctx.message.create_thread(name=name, auto_archive_duration=THREAD_ARCHIVE_MINUTES)
+        return await ctx.channel.create_thread(name=name, type=discord.ChannelType.public_thread, auto_archive_duration=THREAD_ARCHIVE_MINUTES)
+    except discord.HTTPException as e:
+        log.warning("Couldn't open a story thread, staying in the channel", extra={'channel_id': ctx.channel.id, 'error': str(e)})
+        return None
+
+
+def index_segment(channel, node):
+    """Adds a story segment to the search index, scoped to the channel's guild (or the DM)."""
+    story_search.index.add(node, channel.id, guild_id_of(channel) or channel.id)
+
+
+def voting_enabled(channel):
+    """True if the channel (or the channel a story thread hangs off) is in voting mode."""
+    return vote_mode.get(channel.id, False) or vote_mode.get(getattr(channel, 'parent_id', None), False)
+
+
+def check_quota(channel, user, story: str):
+    """Raises quota.QuotaExceeded if generating choices for this story would go over budget."""
+    # The story is trimmed to fit the prompt ceiling, so that is the most it can cost
+    tokens = min(estimate_tokens(story) + choices_prompt_tokens(config.current.story.option_count), MAX_PROMPT_TOKENS)
+    quota.manager.check(guild_id_of(channel), user.id if user else None, tokens)
+
+
+class ChoiceButton(discord.ui.DynamicItem[discord.ui.Button], template=r'story:(?P<channel_id>[0-9]+):(?P<round>[0-9]+):(?P<option>[0-9]+)'):
+    """
+    A persistent button for one story option.
+    The custom_id encodes the channel and round, so the buttons keep working after a
+    restart or reload, and buttons from an earlier round can be told apart.
+    """
+
+    def __init__(self, channel_id: int, round_number: int, option: int):
+        super().__init__(
+            discord.ui.Button(
+                label=f"Option {option}",
+                style=discord.ButtonStyle.primary,
+                custom_id=f"story:{channel_id}:{round_number}:{option}",
+            )
+        )
+        self.channel_id = channel_id
+        self.round_number = round_number
+        self.option = option
+
+    @classmethod
+    async def from_custom_id(cls, interaction, item, match):
+        return cls(int(match['channel_id']), int(match['round']), int(match['option']))
+
+    async def interaction_check(self, interaction):
+        return interaction.channel_id == self.channel_id
+
+    async def callback(self, interaction):
+        if choice_rounds.get(self.channel_id) != self.round_number:
+            await interaction.response.send_message(earlier_chapter_message, ephemeral=True)
+            return
+
+        # Acknowledge right away; the real answer follows once Gemini is done
+        await interaction.response.defer(thinking=True)
+        # A new round may have started while we deferred, so choose_path checks the round again
+        await choose_path(interaction.channel, self.option, interaction.followup.send, interaction.user, self.round_number)
+        update_interaction_time(self.channel_id)
+
+
+def build_choices_view(channel_id: int, round_number: int, choice_count: int):
+    """Builds the view holding one persistent button per option."""
+    view = discord.ui.View(timeout=None)
+    for option in range(1, choice_count + 1):
+        view.add_item(ChoiceButton(channel_id, round_number, option))
+    return view
+
+
+async def replace_near_duplicates(channel, story_context: str, choices_list, user=None, priority=admission.TURN, generated=None):
+    """
+    Replaces options that repeat another option in the set, or one offered recently in
+    this channel, with a fresh one from a cheaper single-option call. The rest of the
+    response is kept. Returns the (possibly updated) list.
+    `generated` holds the indexes of the options Gemini actually wrote (default: all of
+    them); placeholders filling in for missing ones are neither checked nor remembered.
+    """
+    history = recent_options.setdefault(channel.id, deque(maxlen=near_dup.HISTORY_SIZE))
+    indexes = list(range(len(choices_list)) if generated is None else generated)
+    signatures = [near_dup.signature(choices_list[index]) for index in indexes]
+
+    for position in near_dup.find_duplicates(signatures, history)[:MAX_REGENERATIONS]:
+        index = indexes[position]
+        avoid = " | ".join(choice for i, choice in enumerate(choices_list) if i != index)
+        prompt = SINGLE_OPTION_PROMPT_TEMPLATE.format(story=story_context, flavor=OPTION_FLAVORS[index % len(OPTION_FLAVORS)], avoid=avoid)
+        try:
+            async with admission.controller.admit(priority):
+                replacement = (await get_gemini_response(prompt, friendly_errors=False)).strip()
+        except admission.Overloaded:
+            break   # keep the rest as they are
+        if not replacement:
+            continue    # the call failed: keep the original option, and it isn't charged
+        quota.manager.record(guild_id_of(channel), user.id if user else None, estimate_tokens(prompt) + estimate_tokens(replacement))
+        # Drop any numbering Gemini added anyway
+        replacement = re.sub(r'^\s*\d+\.\s*', '', replacement)
+        if not replacement:
+            continue
+
+        replacement_signature = near_dup.signature(replacement)
+        others = [sig for i, sig in enumerate(signatures) if i != position]
+        if near_dup.is_near_duplicate(replacement_signature, others) or near_dup.is_near_duplicate(replacement_signature, history):
+            log.info("Regenerated option was still a near duplicate", extra={'channel_id': channel.id, 'option': index + 1})
+            continue
+        choices_list[index] = replacement
+        signatures[position] = replacement_signature
+
+    history.extend(signatures)
+    return choices_list
+
+
+async def offer_choices(channel, tree, send=None):
+    """
+    Sends the options cached on the current node of `tree`, with a fresh set of buttons.
+    Sends nothing if another story has replaced `tree` in the channel.
+    """
+    channel_id = channel.id
+    if current_stories.get(channel_id) is not tree:
+        return
+    send = send or channel.send
+    choices_list = tree.cursor.options
+
+    current_choices[channel_id] = choices_list
+    # A new round makes every older choice button stale
+    choice_rounds[channel_id] = choice_rounds.get(channel_id, 0) + 1
+    choices_message = "\n".join([f"Option {i+1}: {choice}" for i, choice in enumerate(choices_list)])
+
+    if voting_enabled(channel):
+        message = await send(f"**Story so far:** {tree.text()}\n\n**Vote for our next path, my loves!**\n{choices_message}\n\nReact with the number you want! 🗳️ Voting closes in {int(config.current.story.vote_seconds)} seconds, or as soon as {config.current.story.vote_quorum} of you have voted! 💖")
+        # Open the vote before adding our reactions, so the quickest voters still count
+        voting.board.open(message.id, channel_id, choice_rounds[channel_id], len(choices_list))
+        try:
+            for emoji in voting.OPTION_EMOJIS[:len(choices_list)]:
+                await message.add_reaction(emoji)
+        except discord.HTTPException as e:
+            log.warning("Couldn't add the vote reactions", extra={'channel_id': channel_id, 'error': str(e)})
+        return
+
+    view = build_choices_view(channel_id, choice_rounds[channel_id], len(choices_list))
+    await send(f"**Story so far:** {tree.text()}\n\n**Choose your next path, my love!**\n{choices_message}\n\nTap a button, or type `!choose <number>` (e.g., `!choose 1`) to tell me what you want! 💖", view=view)
+
+
+async def generate_and_send_choices(channel, tree, send=None, user=None, priority=admission.TURN):
+    """
+    Generates story continuation choices (story.option_count of them) for the current node of `tree` using Gemini
+    and sends them to the channel. Nothing is sent once another story has replaced `tree`
+    in the channel (e.g. a second `!startstory` while we were busy sending). The choices are cached on the node, so a node that
+    already has them (e.g. after a rewind) is offered them again without calling Gemini.
+    `send` lets interactions answer through their followup instead of channel.send.
+    The tokens used are charged to the channel's guild and to `user`.
+    A generation slot of `priority` is held only while Gemini is thinking.
+    """
+    channel_id = channel.id
+    send = send or channel.send
+    logs.bind(channel_id=channel_id, guild_id=guild_id_of(channel))
+    if current_stories.get(channel_id) is not tree:
+        return
+    node = tree.cursor
+    if node.options:
+        await offer_choices(channel, tree, send)
+        return
+
+    await send(random.choice(thinking_messages))
+    option_count = config.current.story.option_count
+
+    # Trim the story so the whole prompt stays under the token ceiling (with a little slack,
+    # since segments merge differently once the story is inside the template)
+    story_budget = MAX_PROMPT_TOKENS - choices_prompt_tokens(option_count) - 32
+    story_context = trim_story_to_budget(tree.text(node), story_budget)
+    ai_prompt = choices_prompt(story_context, option_count)
+    
+    try:
+        async with admission.controller.admit(priority):
+            raw_choices_text = await get_gemini_response(ai_prompt, friendly_errors=False)
+    except admission.Overloaded:
+        # Shed while queued for a slot. The node keeps no options, so coming back to it
+        # asks Gemini again; a brand new story has nowhere to come back from
+        if current_stories.get(channel_id) is not tree:
+            return
+        if node.parent is None:
+            del current_stories[channel_id]
+            await send(busy_new_story_message)
+        else:
+            await send(busy_choices_message)
+        return
+
+    choices_list = []
+    generated = []  # indexes of the options Gemini wrote, as opposed to placeholders
+    # An empty reply means the call failed; it isn't charged to anyone
+    if raw_choices_text:
+        quota.manager.record(guild_id_of(channel), user.id if user else None, estimate_tokens(ai_prompt) + estimate_tokens(raw_choices_text))
+
+        # Robustly parse numbered list, handling potential variations
+        # Regex to find lines starting with a number followed by a dot, then capture the rest
+        # It handles optional spaces and ensures it's at the beginning of a line.
+        pattern = re.compile(r'^\s*(\d+)\.\s*(.*)$', re.MULTILINE)
+        matches = pattern.findall(raw_choices_text)
+        
+        # Convert matches to a dictionary for easy lookup by number, ensuring order
+        numbered_options = {}
+        for num_str, content in matches:
+            try:
+                num = int(num_str)
+                numbered_options[num] = content.strip()
+            except ValueError:
+                continue # Skip if number isn't valid
+
+        # Populate choices_list from 1 to option_count, prioritizing parsed options
+        for i in range(1, option_count + 1):
+            if i in numbered_options:
+                generated.append(len(choices_list))
+                choices_list.append(numbered_options[i])
+            else:
+                # Fallback if a specific numbered option is missing
+                choices_list.append(f"A mysterious path unfolds (Option {i}). �")
+        
+        # If Gemini gave more than option_count, just take the first ones.
+        if len(choices_list) > option_count:
+            choices_list = choices_list[:option_count]
+        elif len(choices_list) < option_count:
+            # If Gemini gave fewer than option_count, fill with generic options
+            while len(choices_list) < option_count:
+                choices_list.append(f"A fascinating new development (Option {len(choices_list) + 1}). ✨")
+
+    # Only a reply with at least one real option is cached; after a failed one the node
+    # stays without options, so coming back to it asks Gemini again
+    if generated:
+        choices_list = await replace_near_duplicates(channel, story_context, choices_list, user, priority, generated)
+        node.options = choices_list
+        # Someone may have moved the story elsewhere while Gemini was thinking; the
+        # options stay cached on their node either way
+        if tree.cursor is node:
+            await offer_choices(channel, tree, send)
+    elif current_stories.get(channel_id) is not tree:
+        return
+    elif node.parent is None:
+        del current_stories[channel_id] # Clear story if bot can't continue
+        current_choices.pop(channel_id, None) # Clear choices
+        await send("Oh no, my creative spark just fizzled out! 😭 I couldn't generate choices for you. Maybe we should start a new story, my dearest?")
+    else:
+        await send("Oh no, my creative spark just fizzled out! 😭 I couldn't generate choices for you. Give me a moment and `!rewind` to pick again, my dearest?")
+
+
+async def choose_path(channel, choice_number: int, send, user=None, round_number=None):
+    """
+    Appends the chosen option to the story and generates new choices or prompts the user's turn.
+    Shared by `!choose`, `/choose` and the choice buttons.
+    The buttons pass the round they were offered in, so a click on older options is turned away.
+    """
+    channel_id = channel.id
+
+    if round_number is not None and choice_rounds.get(channel_id) != round_number:
+        await send(earlier_chapter_message)
+        return
+
+    if user_turn_active.get(channel_id, False):
+        await send("Hold on, my love! It's *your* turn to write right now, not choose! Don't confuse my little heart! 🥺 Just type your continuation!")
+        return
+
+    if channel_id not in current_stories:
+        await send("There's no story currently active in this channel! Start one with `!startstory <initial sentence>`, my dearest! 💖")
+        return
+
+    if channel_id not in current_choices or not current_choices[channel_id]:
+        await send("There are no choices available right now, my love. Please wait for me to provide options, or start a new story if you're impatient! (But I love your impatience! 🥰)")
+        return
+
+    if not 1 <= choice_number <= len(current_choices[channel_id]):
+        await send(f"Invalid choice, my sweet! 💔 Please choose a number between 1 and {len(current_choices[channel_id])}. Don't make me sad! 🥺")
+        return
+
+    # Turn the request away before touching the story, so a shed request changes nothing.
+    # Nothing awaits between these checks and taking the choice, so two quick choices
+    # can't both go through
+    tree = current_stories[channel_id]
+    try:
+        check_quota(channel, user, tree.text())
+        admission.controller.check(admission.TURN)
+    except quota.QuotaExceeded as e:
+        await send(quota_message(e))
+        return
+    except admission.Overloaded:
+        await send(busy_turn_message)
+        return
+
+    # Get the chosen addition
+    chosen_addition = current_choices[channel_id][choice_number - 1]
+
+    # Continue the story down the chosen branch
+    index_segment(channel, tree.choose(choice_number))
+
+    # Clear choices for this round
+    del current_choices[channel_id]
+    voting.board.discard_channel(channel_id)
+
+    # Marking the story as busy makes praise and idle pings yield the channel's send bucket
+    async with pacing.pacer.story_turn(channel_id):
+        await send(f"You chose option {choice_number}, my brilliant strategist! \"{chosen_addition}\"\n")
+
+        # Increment round counter
+        round_counter[channel_id] = round_counter.get(channel_id, 0) + 1
+
+        # Check for user's turn
+        if round_counter[channel_id] % config.current.story.user_turn_every == 0 and round_counter[channel_id] > 0:
+            user_turn_active[channel_id] = True
+            await send("Your turn, my love! ✨ I've been doing so much, and now I'm *dying* to see what brilliant twist you'll add to our story! Just type your continuation! 🥰")
+        else:
+            # Generate and send the next set of choices based on the updated story
+            await generate_and_send_choices(channel, tree, send, user)
+
+
+async def continue_story(channel, send, user=None):
+    """
+    Offers choices again after the story moved to another node (rewind, branch switch).
+    Only calls Gemini if that node has never had choices generated.
+    """
+    channel_id = channel.id
+    user_turn_active[channel_id] = False
+    current_choices.pop(channel_id, None)
+    voting.board.discard_channel(channel_id)
+    tree = current_stories[channel_id]
+    if tree.cursor.options:
+        await offer_choices(channel, tree, send)
+        return
+
+    try:
+        check_quota(channel, user, tree.text())
+        admission.controller.check(admission.TURN)
+    except quota.QuotaExceeded as e:
+        await send(quota_message(e))
+        return
+    except admission.Overloaded:
+        await send(busy_turn_message)
+        return
+
+    async with pacing.pacer.story_turn(channel_id):
+        await generate_and_send_choices(channel, tree, send, user)
+
+
+class Story(commands.Cog):
+    """The collaborative storytelling commands."""
+
+    def __init__(self, bot):
+        self.bot = bot
+
+    async def cog_load(self):
+        # Choice buttons from before a restart or reload keep working
+        self.bot.add_dynamic_items(ChoiceButton)
+        voting.board.on_close = self.settle_vote
+
+    async def cog_unload(self):
+        self.bot.remove_dynamic_items(ChoiceButton)
+        voting.board.on_close = None
+
+    async def settle_vote(self, vote_round):
+        """
+        Takes the winning option of a finished vote, unless the story moved on without it.
+        """
+        channel_id = vote_round.channel_id
+        if choice_rounds.get(channel_id) != vote_round.round_number or channel_id not in current_choices:
+            return
+        channel = self.bot.get_channel(channel_id)
+        if channel is None:
+            return
+
+        winner = vote_round.winner()
+        if winner is None:
+            await channel.send("Nobody voted... 🥺 Did you all forget about me? The choices are still here whenever you're ready, just type `!choose <number>`! 💔")
+            return
+
+        tally = "  ".join(f"{voting.OPTION_EMOJIS[option - 1]} {votes}" for option, votes in enumerate(vote_round.tallies[1:], 1))
+        await channel.send(f"The votes are in, my loves! 🗳️ {tally}")
+        await choose_path(channel, winner, channel.send)
+        update_interaction_time(channel_id)
+
+    @commands.Cog.listener()
+    async def on_message(self, message):
+        """
+        Handles the user's turn in storytelling.
+        """
+        # Ignore messages from the bot itself
+        if message.author == self.bot.user:
+            return
+
+        channel_id = message.channel.id
+
+        # Check if it's the user's turn to write a continuation
+        if user_turn_active.get(channel_id, False) and not message.content.startswith(self.bot.command_prefix):
+            user_continuation = message.content.strip()
+            if user_continuation:
+                tree = current_stories[channel_id]
+                try:
+                    check_quota(message.channel, message.author, tree.text() + " " + user_continuation)
+                    admission.controller.check(admission.TURN)
+                except quota.QuotaExceeded as e:
+                    await message.channel.send(quota_message(e))
+                    return
+                except admission.Overloaded:
+                    await message.channel.send(busy_turn_message)
+                    return
+
+                # Claimed before the first await, so a second message sent meanwhile isn't
+                # taken as a continuation too
+                index_segment(message.channel, tree.write(user_continuation))
+                user_turn_active[channel_id] = False # End user's turn
+                round_counter[channel_id] = 0 # Reset round counter after user turn
+
+                async with pacing.pacer.story_turn(channel_id):
+                    await message.channel.send(f"Oh, you're so brilliant! ✨ Your twist is *perfect*! I knew you had it in you, my love! \n\n**Story so far:** {tree.text()}")
+                    await generate_and_send_choices(message.channel, tree, user=message.author)
+                update_interaction_time(channel_id)
+            else:
+                await message.channel.send("Darling, you didn't write anything! Don't leave me hanging, my heart! 🥺 I'm so eager to see what you'll do next!")
+
+    @commands.Cog.listener()
+    async def on_raw_thread_delete(self, payload):
+        """Forgets the story that lived in a deleted thread."""
+        forget_channel(payload.thread_id)
+        story_search.index.forget_channel(payload.thread_id)
+        voting.board.discard_channel(payload.thread_id)
+
+    # Votes are counted straight from the raw events, so the message never has to be cached
+    @commands.Cog.listener()
+    async def on_raw_reaction_add(self, payload):
+        if payload.user_id != self.bot.user.id:
+            voting.board.vote(payload.message_id, payload.user_id, payload.emoji.name)
+
+    @commands.Cog.listener()
+    async def on_raw_reaction_remove(self, payload):
+        if payload.user_id != self.bot.user.id:
+            voting.board.unvote(payload.message_id, payload.user_id, payload.emoji.name)
+
+    @commands.hybrid_command(name='startstory', help='Starts a new collaborative story with me! 💖')
+    async def start_story(self, ctx, *, initial_sentence: str):
+        """
+        Starts a new story (in its own thread when STORY_THREADS is on) and generates initial choices.
+        """
+        await ctx.defer()
+        channel, send = ctx.channel, ctx.send
+        try:
+            check_quota(ctx.channel, ctx.author, initial_sentence)
+            admission.controller.check(admission.NEW_STORY)
+        except quota.QuotaExceeded as e:
+            await ctx.send(quota_message(e))
+            return
+        except admission.Overloaded:
+            await ctx.send(busy_new_story_message)
+            return
+
+        thread = await open_story_thread(ctx, initial_sentence)
+        if thread is not None:
+            await ctx.send(f"Ooh, this one deserves its own little love nest! 🥰 Come find me in {thread.mention}, my darling! 💖")
+            channel, send = thread, thread.send
+
+        # All story state is keyed by the channel the story lives in, thread or not
+        channel_id = channel.id
+        tree = current_stories[channel_id] = StoryTree(initial_sentence.strip())
+        # Choices offered for an older story here belong to its tree, not this one
+        current_choices.pop(channel_id, None)
+        voting.board.discard_channel(channel_id)
+        index_segment(channel, tree.root)
+        user_turn_active[channel_id] = False
+        round_counter[channel_id] = 0 # Initialize round counter
+
+        async with pacing.pacer.story_turn(channel_id):
+            greeting = f"{ctx.author.mention} " if thread is not None else ""
+            await send(f"{greeting}Oh, a new story with you! My favorite! 🥰 \n**Our epic tale begins:** {tree.text()}")
+
+            # Immediately generate and send the first set of choices (unless another
+            # story has taken the channel over meanwhile)
+            await generate_and_send_choices(channel, tree, send, ctx.author, admission.NEW_STORY)
+
+        update_interaction_time(channel.id)
+
+    @commands.hybrid_command(name='choose', help='Chooses a continuation for our story. Use !choose <number>! ✨')
+    async def choose_story_path(self, ctx, choice_number: int):
+        """
+        Allows the user to choose one of the presented story continuations.
+        Appends the chosen part and generates new choices or prompts user turn.
+        """
+        # Acknowledge slash commands instantly; Gemini can take a few seconds
+        await ctx.defer()
+        await choose_path(ctx.channel, choice_number, ctx.send, ctx.author)
+        update_interaction_time(ctx.channel.id)
+
+    @commands.hybrid_command(name='rewind', help='Takes our story back a few steps. Use !rewind [steps]! ⏪')
+    async def rewind_story(self, ctx, steps: int = 1):
+        """
+        Moves the story back `steps` segments and offers the choices from that point again.
+        Nothing is thrown away: the branch we left stays in the story tree.
+        """
+        await ctx.defer()
+        channel_id = ctx.channel.id
+        tree = current_stories.get(channel_id)
+        if tree is None:
+            await ctx.send("There's no story currently active in this channel! Start one with `!startstory <initial sentence>`, my dearest! 💖")
+            return
+
+        moved = tree.rewind(max(1, steps))
+        if not moved:
+            await ctx.send("We're already at the very beginning of our story, my love! 🥺 There's nowhere further back to go!")
+            return
+
+        await ctx.send(f"Let's turn back time, darling! ⏪ We went back {moved} step(s)... I kept everything else safe, of course! 💖")
+        await continue_story(ctx.channel, ctx.send, ctx.author)
+        update_interaction_time(channel_id)
+
+    @commands.hybrid_command(name='branch', help='What if we had chosen differently? Use !branch <number>! 🌿')
+    async def branch_story(self, ctx, choice_number: int):
+        """
+        Goes back to the last choice we made and takes option `choice_number` instead.
+        A branch we explored before comes back exactly the way we left it.
+        """
+        await ctx.defer()
+        channel_id = ctx.channel.id
+        tree = current_stories.get(channel_id)
+        if tree is None:
+            await ctx.send("There's no story currently active in this channel! Start one with `!startstory <initial sentence>`, my dearest! 💖")
+            return
+
+        parent = tree.cursor.parent
+        if parent is None or not parent.options:
+            await ctx.send("We haven't made a choice I could undo yet, sweetie! 🥺 Pick an option with `!choose <number>` first!")
+            return
+        if not 1 <= choice_number <= len(parent.options):
+            await ctx.send(f"Invalid choice, my sweet! 💔 Please choose a number between 1 and {len(parent.options)}. Don't make me sad! 🥺")
+            return
+
+        # Turn the request away before rewinding, so a shed branch leaves the story (and
+        # the choices on offer) where they were
+        try:
+            check_quota(ctx.channel, ctx.author, tree.text(parent))
+            admission.controller.check(admission.TURN)
+        except quota.QuotaExceeded as e:
+            await ctx.send(quota_message(e))
+            return
+        except admission.Overloaded:
+            await ctx.send(busy_turn_message)
+            return
+
+        tree.rewind()
+        user_turn_active[channel_id] = False
+        current_choices[channel_id] = parent.options
+        await choose_path(ctx.channel, choice_number, ctx.send, ctx.author)
+        update_interaction_time(channel_id)
+
+    @commands.hybrid_command(name='alternate', help='Hops over to another path of our story we already explored. 🔀')
+    async def alternate_branch(self, ctx):
+        """
+        Switches to the next branch explored from the same point of the story, wrapping around.
+        """
+        await ctx.defer()
+        channel_id = ctx.channel.id
+        tree = current_stories.get(channel_id)
+        if tree is None:
+            await ctx.send("There's no story currently active in this channel! Start one with `!startstory <initial sentence>`, my dearest! 💖")
+            return
+
+        if tree.alternate() is None:
+            await ctx.send("We haven't explored any other paths from here yet, sweetie! Try `!branch <number>` to make one! 🌿")
+            return
+
+        await ctx.send(f"Switching timelines, my love! 🔀 In this one... \"{tree.cursor.text}\"")
+        await continue_story(ctx.channel, ctx.send, ctx.author)
+        update_interaction_time(channel_id)
+
+    @commands.hybrid_command(name='votemode', help='Lets everyone vote on our next path with reactions! 🗳️')
+    async def toggle_vote_mode(self, ctx):
+        """
+        Toggles voting mode for this channel (and the story threads started from it).
+        """
+        channel_id = ctx.channel.id
+        vote_mode[channel_id] = not vote_mode.get(channel_id, False)
+        if vote_mode[channel_id]:
+            await ctx.send(f"Everyone gets a say now, my loves! 🗳️ React to my choices with a number, and the favorite wins after {int(config.current.story.vote_seconds)} seconds (or once {config.current.story.vote_quorum} of you have voted)! 💖")
+        else:
+            voting.board.discard_channel(channel_id)
+            await ctx.send("Back to first come, first served! ✨ Whoever picks with `!choose` first leads our story, darling! 💖")
+        update_interaction_time(channel_id)
+
+    @commands.hybrid_command(name='searchstory', help='Finds moments from our past stories. Use !searchstory <words>! 🔎')
+    async def search_stories(self, ctx, *, query: str):
+        """
+        Searches every story segment told in this server (or this DM) and shows the best matches.
+        """
+        index = story_search.index
+        results = index.search(query, guild_id_of(ctx.channel) or ctx.channel.id)
+        if not results:
+            await ctx.send("I searched every corner of my heart and couldn't find that, darling! 🥺 Try some other words?")
+            return
+
+        lines = [f"**{number}.** <#{index.channels[doc_id]}> \"{index.snippet(doc_id)}\"" for number, (_, doc_id) in enumerate(results, 1)]
+        await ctx.send("**Here's what I remember, my love!** 🔎💖\n" + "\n".join(lines))
+        update_interaction_time(ctx.channel.id)
+
+    @commands.hybrid_command(name='currentstory', help='Displays our beautiful story so far! 📖💖')
+    async def show_current_story(self, ctx):
+        """
+        Displays the current story in the channel.
+        """
+        channel_id = ctx.channel.id
+        if channel_id in current_stories:
+            await ctx.send(f"**Our amazing story so far:** {current_stories[channel_id].text()} 💖")
+        else:
+            await ctx.send("There's no story currently active in this channel, my dearest! Start one with `!startstory <initial sentence>`! I'm waiting! 🥺")
+
+        update_interaction_time(channel_id)
+
+
+async def setup(bot):
+    await bot.add_cog(Story(bot))
@@ -0,0 +1,67 @@
+import asyncio
+import logging
+from discord.ext import commands, tasks
+import quota
+
+log = logging.getLogger(__name__)
+
+
+class Usage(commands.Cog):
+    """Checkpoints quota counters and reports who uses the most Gemini tokens."""
+
+    def __init__(self, bot):
+        self.bot = bot
+
+    async def cog_load(self):
+        # Only restore on the first load; after a reload the live counters are newer
+        if not quota.manager.counters:
+            snapshot = await asyncio.to_thread(quota.read_checkpoint)
+            if snapshot:
+                quota.manager.restore(snapshot)
+        self.checkpoint.start()
+
+    async def cog_unload(self):
+        self.checkpoint.cancel()
+        await self.save()
+
+    async def save(self):
+        """Writes the counters to disk without blocking the event loop."""
+        snapshot = quota.manager.snapshot()
+        try:
+            await asyncio.to_thread(quota.write_checkpoint, snapshot)
+        except OSError as e:
+            quota.manager.dirty = True
+            log.error("Could not save quota checkpoint: %s", e)
+
+    @tasks.loop(minutes=1)
+    async def checkpoint(self):
+        """Saves the quota counters whenever they changed."""
+        if quota.manager.dirty:
+            await self.save()
+
+    @commands.command(name='topusage', help='Shows who keeps me the busiest. (Owner only)')
+    @commands.is_owner()
+    async def top_usage(self, ctx, scope: str = quota.GUILD, limit: int = 10):
+        """
+        Lists the top guilds (or `!topusage user`) by tokens used in the current window.
+        """
+        if scope not in (quota.GUILD, quota.USER):
+            await ctx.send(f"I only track `{quota.GUILD}` and `{quota.USER}` usage, my love! 🥺")
+            return
+
+        rows = quota.manager.top_consumers(scope, limit)
+        if not rows:
+            await ctx.send("Nobody has asked me for anything yet... 🥺")
+            return
+
+        hours = quota.WINDOW_SECONDS / 3600
+        lines = [
+            f"`{key}`: {tokens:,} tokens / {requests} requests in the last {hours:g}h, "
+            f"{lifetime:,} tokens total (~${cost:.4f})"
+            for key, tokens, requests, lifetime, cost in rows
+        ]
+        await ctx.send(f"**My busiest {scope}s:**\n" + "\n".join(lines))
+
+
+async def setup(bot):
+    await bot.add_cog(Usage(bot))
@@ -0,0 +1,242 @@
+import dataclasses
+import logging
+import os
+import tomllib
+from dataclasses import dataclass
+from dotenv import load_dotenv
+
+# Settings can come from the .env file too, so load it before reading the environment
+load_dotenv()
+
+log = logging.getLogger(__name__)
+
+# --- Settings ---
+# Every tunable lives here, with its default. A TOML file (story_weaver.toml, or the path in
+# STORY_WEAVER_CONFIG) overrides the defaults, and environment variables named
+# <SECTION>_<SETTING> (e.g. PRAISE_MIN_SECONDS) override the file.
+# The whole thing is validated before use. `reload()` (the `!reloadconfig` command, or a
+# SIGHUP) builds a new Settings and swaps it in with one assignment, so code that reads
+# `config.current` sees either the old values or the new ones, never a mix. Loops and
+# limiters read it each time they run, so nothing needs a restart. (The environment can't
+# change under a running process, so edit the TOML file for changes without a restart.)
+
+CONFIG_PATH = os.getenv("STORY_WEAVER_CONFIG", "story_weaver.toml")
+
+
+class ConfigError(ValueError):
+    """Raised when the settings don't validate. Lists every problem found."""
+
+    def __init__(self, problems):
+        super().__init__("; ".join(problems))
+        self.problems = problems
+
+
+def _setting(default, minimum=None, maximum=None):
+    return dataclasses.field(default=default, metadata={'min': minimum, 'max': maximum})
+
+
+@dataclass(frozen=True)
+class StorySettings:
+    option_count: int = _setting(3, 2, 9)          # options per round (9 is the most we have vote emojis for)
+    user_turn_every: int = _setting(3, 1)          # rounds of choices before the user writes a twist
+    vote_seconds: float = _setting(60.0, 5.0)      # how long a reaction vote stays open...
+    vote_quorum: int = _setting(3, 1)              # ...unless this many people vote first
+
+
+@dataclass(frozen=True)
+class GeminiSettings:
+    model: str = "gemini-1.5-flash-latest"
+
+
+@dataclass(frozen=True)
+class PraiseSettings:
+    min_seconds: float = _setting(3.0, 1.0)        # each compliment comes after a random pause in this range
+    max_seconds: float = _setting(5.0, 1.0)
+
+
+@dataclass(frozen=True)
+class IdleSettings:
+    check_seconds: float = _setting(60.0, 5.0)     # how often a quiet channel is checked
+    after_minutes: float = _setting(6.0, 0.5)      # how long a channel has to be quiet before a ping
+
+
+@dataclass(frozen=True)
+class AdmissionSettings:
+    max_in_flight: int = _setting(8, 1)            # Gemini calls allowed at the same time
+    max_queued: int = _setting(32, 0)              # requests allowed to wait for a slot
+    max_queue_wait: float = _setting(15.0, 0.0)    # seconds a queued request may wait before we give up on it
+    new_story_load: float = _setting(0.75, 0.0, 1.0)   # new stories are shed once this fraction of slots is busy
+
+
+@dataclass(frozen=True)
+class QuotaSettings:
+    # Budgets per window. 0 means unlimited.
+    guild_tokens_per_window: int = _setting(200_000, 0)
+    guild_requests_per_window: int = _setting(300, 0)
+    user_tokens_per_window: int = _setting(50_000, 0)
+    user_requests_per_window: int = _setting(60, 0)
+    praise_messages_per_window: int = _setting(900, 0)
+
+
+@dataclass(frozen=True)
+class PacingSettings:
+    story_reserve: int = _setting(2, 0)            # requests left in a send bucket that only stories may use
+    story_grace_seconds: float = _setting(20.0, 0.0)   # a story counts as active this long after a generation
+    reset_margin: float = _setting(0.25, 0.0)      # extra wait after a bucket resets
+    max_hold_seconds: float = _setting(30.0, 0.0)  # praise/idle messages held longer than this are dropped
+
+
+JSON_BACKENDS = ('auto', 'json', 'orjson', 'msgspec')
+
+
+@dataclass(frozen=True)
+class JsonSettings:
+    backend: str = "auto"          # one of JSON_BACKENDS; "auto" picks the fastest one installed
+    typed_payloads: bool = False   # decode Gemini replies straight into typed structs (needs msgspec)
+
+
+@dataclass(frozen=True)
+class Settings:
+    story: StorySettings = StorySettings()
+    gemini: GeminiSettings = GeminiSettings()
+    praise: PraiseSettings = PraiseSettings()
+    idle: IdleSettings = IdleSettings()
+    admission: AdmissionSettings = AdmissionSettings()
+    quota: QuotaSettings = QuotaSettings()
+    pacing: PacingSettings = PacingSettings()
+    json: JsonSettings = JsonSettings()
+
+
+_KIND_NAMES = {int: "a whole number", float: "a number", str: "text", bool: "true or false"}
+_BOOLEANS = {'true': True, '1': True, 'yes': True, 'on': True, 'false': False, '0': False, 'no': False, 'off': False}
+
+
+def _convert(name, field, value, problems):
+    """Checks (and for environment strings, parses) one value. Returns it, or None if it's bad."""
+    kind = field.type
+    if kind is bool:
+        if isinstance(value, str) and value.strip().lower() in _BOOLEANS:
+            return _BOOLEANS[value.strip().lower()]
+        if isinstance(value, bool):
+            return value
+        problems.append(f"{name} must be {_KIND_NAMES[kind]}, got {value!r}")
+        return None
+    try:
+        if isinstance(value, str) and kind is not str:
+            value = kind(value)
+        elif kind is float and isinstance(value, int) and not isinstance(value, bool):
+            value = float(value)
+    except ValueError:
+        problems.append(f"{name} must be {_KIND_NAMES[kind]}, got {value!r}")
+        return None
+    if not isinstance(value, kind) or isinstance(value, bool):
+        problems.append(f"{name} must be {_KIND_NAMES[kind]}, got {value!r}")
+        return None
+
+    minimum, maximum = field.metadata.get('min'), field.metadata.get('max')
+    if minimum is not None and value < minimum:
+        problems.append(f"{name} must be at least {minimum}, got {value}")
+    elif maximum is not None and value > maximum:
+        problems.append(f"{name} must be at most {maximum}, got {value}")
+    elif kind is str and not value.strip():
+        problems.append(f"{name} can't be empty")
+    else:
+        return value
+    return None
+
+
+def load(path=None, environ=None):
+    """
+    Builds validated Settings from the defaults, the TOML file (if there is one) and the
+    environment. Raises ConfigError listing every problem.
+    """
+    path = CONFIG_PATH if path is None else path
+    environ = os.environ if environ is None else environ
+    problems = []
+
+    document = {}
+    if path and os.path.exists(path):
+        try:
+            with open(path, 'rb') as file:
+                document = tomllib.load(file)
+        except (OSError, tomllib.TOMLDecodeError) as e:
+            raise ConfigError([f"couldn't read {path}: {e}"]) from e
+
+    sections = {}
+    for section in dataclasses.fields(Settings):
+        table = document.get(section.name, {})
+        if not isinstance(table, dict):
+            problems.append(f"[{section.name}] must be a table")
+            table = {}
+        known = {field.name: field for field in dataclasses.fields(section.type)}
+        problems.extend(f"unknown setting {section.name}.{key}" for key in table if key not in known)
+
+        values = {}
+        for name, field in known.items():
+            env_name = f"{section.name}_{name}".upper()
+            if env_name in environ:
+                raw = environ[env_name]
+            elif name in table:
+                raw = table[name]
+            else:
+                continue
+            value = _convert(f"{section.name}.{name}", field, raw, problems)
+            if value is not None:
+                values[name] = value
+        sections[section.name] = section.type(**values)
+    problems.extend(f"unknown section [{name}]" for name in document if name not in sections)
+
+    settings = Settings(**sections)
+    if settings.praise.min_seconds > settings.praise.max_seconds:
+        problems.append("praise.min_seconds can't be more than praise.max_seconds")
+    if settings.json.backend not in JSON_BACKENDS:
+        problems.append(f"json.backend must be one of {', '.join(JSON_BACKENDS)}, got {settings.json.backend!r}")
+    if problems:
+        raise ConfigError(problems)
+    return settings
+
+
+def changes(old, new):
+    """Names ("section.setting") of every setting that differs between two Settings."""
+    changed = []
+    for section in dataclasses.fields(Settings):
+        before, after = getattr(old, section.name), getattr(new, section.name)
+        changed.extend(f"{section.name}.{field.name}" for field in dataclasses.fields(before) if getattr(before, field.name) != getattr(after, field.name))
+    return changed
+
+
+# --- Current Settings ---
+
+# The settings in use. Replaced as a whole by reload(); never modified in place.
+current = load()
+
+# Called with the new Settings after every successful reload, for state that keeps its
+# own copy of a value (e.g. the admission controller, which `!admission` also tunes).
+_listeners = []
+
+
+def subscribe(listener):
+    _listeners.append(listener)
+
+
+def reload():
+    """
+    Loads the settings again and swaps them in. Returns the names of the settings that
+    changed. Raises ConfigError (and keeps the old settings) if the new ones don't validate.
+    """
+    global current
+    new = load()
+    changed = changes(current, new)
+    current = new
+    for listener in _listeners:
+        listener(new)
+    log.info("Reloaded settings", extra={'changed': changed})
+    return changed
+
+
+def reload_on_signal():
+    """SIGHUP handler: like reload(), but logs a bad config instead of raising."""
+    try:
+        reload()
+    except ConfigError as e:
+        log.error("Kept the old settings, the new ones are invalid", extra={'problems': e.problems})
@@ -0,0 +1,56 @@
+import time
+
+# --- Gateway Replay Deduplication ---
+# After a RESUME or reconnect Discord can deliver the same MESSAGE_CREATE twice.
+# We remember recently seen message ids in two rotating sets: ids stay known for
+# between TTL and 2 * TTL seconds, and memory never grows past 2 * MAX_PER_BUCKET ids.
+
+TTL_SECONDS = 300.0
+MAX_PER_BUCKET = 50_000
+
+
+class SeenSet:
+    """
+    A time-bucketed set of recently seen ids with bounded memory.
+    """
+
+    __slots__ = ('ttl', 'max_per_bucket', '_current', '_previous', '_rotated_at', 'duplicates')
+
+    def __init__(self, ttl=TTL_SECONDS, max_per_bucket=MAX_PER_BUCKET):
+        self.ttl = ttl
+        self.max_per_bucket = max_per_bucket
+        self._current = set()
+        self._previous = set()
+        self._rotated_at = time.monotonic()
+        self.duplicates = 0
+
+    def _rotate(self, now):
+        self._previous = self._current
+        self._current = set()
+        self._rotated_at = now
+
+    def check_and_add(self, key):
+        """
+        Returns True if key was seen recently (a duplicate), otherwise remembers it and returns False.
+        """
+        now = time.monotonic()
+        if now - self._rotated_at >= self.ttl:
+            if now - self._rotated_at >= 2 * self.ttl:
+                self._current = set()  # Both buckets are stale
+            self._rotate(now)
+
+        if key in self._current or key in self._previous:
+            self.duplicates += 1
+            return True
+
+        if len(self._current) >= self.max_per_bucket:
+            self._rotate(now)
+        self._current.add(key)
+        return False
+
+    def __len__(self):
+        return len(self._current) + len(self._previous)
+
+
+# Message ids seen by this process. It lives outside the extensions so reloads keep it.
+seen_messages = SeenSet()
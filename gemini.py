@@ -0,0 +1,121 @@
+import logging
+import asyncio
+import os
+import time
+import aiohttp # For making async HTTP requests to the Gemini API
+from dotenv import load_dotenv
+import config
+import json_codec
+import traffic_trace
+import warmup
+from token_budget import MAX_PROMPT_TOKENS, estimate_tokens
+
+# Load environment variables from a .env file
+load_dotenv()
+
+log = logging.getLogger(__name__)
+
+# --- Configuration ---
+# The model is the [gemini] model setting (see config.py), so it can be switched without a restart
+GEMINI_API_KEY = os.getenv("GEMINI_API_KEY", "")
+# Overridable so load tests can point the bot at a fake server
+GEMINI_API_BASE = os.getenv("GEMINI_API_BASE", "https://generativelanguage.googleapis.com")
+
+# --- Shared Session ---
+# One session for every call, so connections (and DNS answers) are reused instead of
+# being set up again inside each story turn. See warmup.py.
+_session = None
+_last_call = None    # time.monotonic() of the last generateContent call
+
+
+def get_session():
+    """Returns the shared session, opening it on first use. Needs a running loop."""
+    global _session
+    if _session is None or _session.closed:
+        _session = aiohttp.ClientSession(connector=warmup.make_connector())
+    return _session
+
+
+async def close_session():
+    global _session
+    if _session is not None:
+        await _session.close()
+        _session = None
+
+
+async def warm_connections(count):
+    """
+    Opens up to `count` keep-alive connections to the Gemini API with free model metadata
+    requests. Skipped while story traffic is keeping the pool warm anyway.
+    Returns how many connections were opened.
+    """
+    if not GEMINI_API_KEY or (_last_call is not None and time.monotonic() - _last_call < warmup.REWARM_SECONDS):
+        return 0
+    session = get_session()
+    url = f"{GEMINI_API_BASE}/v1beta/models/{config.current.gemini.model}?key={GEMINI_API_KEY}"
+
+    async def ping():
+        async with session.get(url) as response:
+            await response.read()
+            return response.status < 500
+
+    results = await asyncio.gather(*(ping() for _ in range(count)), return_exceptions=True)
+    return sum(result is True for result in results)
+
+
+# --- Gemini API Interaction Function ---
+async def get_gemini_response(prompt: str, *, friendly_errors: bool = True) -> str:
+    """
+    Makes an asynchronous request to the Gemini API to get a creative response.
+    On failure it returns a friendly in-character message, or "" with friendly_errors=False
+    (for callers that have a better fallback than showing the error).
+    """
+    if not GEMINI_API_KEY:
+        log.error("GEMINI_API_KEY is not set. Cannot call Gemini API.")
+        return "I need an API key to get creative! Please set GEMINI_API_KEY, my love. 🥺" if friendly_errors else ""
+
+    prompt_tokens = estimate_tokens(prompt)
+    if prompt_tokens > MAX_PROMPT_TOKENS:
+        log.warning("Prompt too large for Gemini API", extra={'prompt_tokens': prompt_tokens, 'limit': MAX_PROMPT_TOKENS})
+        return "Our story got so big my head is spinning! 😵 Let's start a fresh one, my love? 💖" if friendly_errors else ""
+
+    api_url = f"{GEMINI_API_BASE}/v1beta/models/{config.current.gemini.model}:generateContent?key={GEMINI_API_KEY}"
+    headers = {'Content-Type': 'application/json'}
+
+    payload = {
+        "contents": [
+            {
+                "role": "user",
+                "parts": [{"text": prompt}]
+            }
+        ]
+    }
+
+    global _last_call
+    _last_call = time.monotonic()
+    started = time.perf_counter()
+    reply = None
+    try:
+        async with get_session().post(api_url, headers=headers, data=json_codec.dumps(payload)) as response:
+            response.raise_for_status() # Raise an exception for HTTP errors (4xx or 5xx)
+            body = await response.read()
+
+            reply = json_codec.gemini_reply_text(body)
+            if reply is not None:
+               return reply
+            else:
+                log.warning("Unexpected Gemini API response structure", extra={'payload': json_codec.loads(body)})
+                return "Oh no, my creative spark flickered! 💔 I couldn't get a brilliant idea right now. Can we try again, my love? ✨" if friendly_errors else ""
+    except aiohttp.ClientError as e:
+        log.error("Error calling Gemini API: %s", e)
+        if not isinstance(e, aiohttp.ClientResponseError):
+            # The network let us down: forget the address we had and reconnect before the next turn
+            get_session().connector.clear_dns_cache()
+            _last_call = None
+            warmup.warmer.rewarm()
+        return f"Oopsie! I ran into an error trying to get creative for you: {e} 🥺" if friendly_errors else ""
+    except Exception as e:
+        log.exception("An unexpected error occurred while calling Gemini API")
+        return f"Something went wrong, my precious! {e} 😭 My heart can't handle it!" if friendly_errors else ""
+    finally:
+        traffic_trace.recorder.gemini(time.perf_counter() - started, prompt_tokens, len(reply) if reply is not None else None)
@@ -0,0 +1,87 @@
+import logging
+
+from discord import utils
+
+import config
+
+try:
+    import msgspec
+except ModuleNotFoundError:
+    msgspec = None
+
+log = logging.getLogger(__name__)
+
+# --- JSON Codec ---
+# One JSON layer for everything: Gemini replies, discord.py's HTTP client and the gateway
+# all encode and decode through discord.utils' backend, which the [json] backend setting
+# picks (stdlib json, orjson or msgspec; see config.py). Decoders are handed raw bytes, so
+# no response body is copied into a str first.
+#
+# With [json] typed_payloads (and msgspec installed), Gemini replies are decoded straight
+# into the small structs below. msgspec skips every field they don't name (safety ratings,
+# usage metadata, ...) without building it. Gateway payloads stay dicts either way:
+# discord.py's parsers are written against dicts.
+
+
+def apply(settings):
+    """Switches to the configured backend. Falls back to the fastest installed one if it's missing."""
+    try:
+        backend = utils._set_json_backend(settings.json.backend)
+    except ValueError:
+        backend = utils._set_json_backend('auto')
+        log.warning("JSON backend isn't installed, using another one", extra={'wanted': settings.json.backend, 'using': backend})
+    if settings.json.typed_payloads and msgspec is None:
+        log.warning("json.typed_payloads needs msgspec, which isn't installed; decoding to dicts")
+    log.info("JSON backend selected", extra={'backend': backend})
+
+
+def dumps(obj):
+    return utils._to_json(obj)
+
+
+def loads(data):
+    """Decodes JSON text or bytes."""
+    return utils._from_json(data)
+
+
+# --- Typed Gemini Replies ---
+
+if msgspec is not None:
+
+    class _Part(msgspec.Struct):
+        text: str | None = None
+
+    class _Content(msgspec.Struct):
+        parts: list[_Part] = []
+
+    class _Candidate(msgspec.Struct):
+        content: _Content | None = None
+
+    class _GenerateContentResponse(msgspec.Struct):
+        candidates: list[_Candidate] = []
+
+    _reply_decoder = msgspec.json.Decoder(_GenerateContentResponse)
+
+
+def gemini_reply_text(body):
+    """
+    The text of the first candidate in a generateContent response body, or None if the
+    response has none.
+    """
+    if config.current.json.typed_payloads and msgspec is not None:
+        try:
+            response = _reply_decoder.decode(body)
+        except msgspec.ValidationError:
+            return None
+        if response.candidates and response.candidates[0].content and response.candidates[0].content.parts:
+            return response.candidates[0].content.parts[0].text
+        return None
+
+    result = loads(body)
+    if result and result.get("candidates") and result["candidates"][0].get("content") and result["candidates"][0]["content"].get("parts"):
+        return result['candidates'][0]['content']['parts'][0]['text']
+    return None
+
+
+apply(config.current)
+config.subscribe(apply)
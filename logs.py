@@ -0,0 +1,117 @@
+import atexit
+import contextvars
+import copy
+import datetime
+import json
+import logging
+import queue
+import random
+import sys
+from logging.handlers import QueueHandler, QueueListener
+
+# --- Structured Logging ---
+# Everything (ours and discord.py's) goes through a QueueHandler, so the event loop only
+# puts records on a queue. A QueueListener thread formats them as JSON lines and does
+# the actual (possibly slow) writing to stdout.
+
+LOG_LEVEL = logging.INFO
+
+# Fields with large bodies (e.g. whole Gemini responses) are only logged for a sample
+# of records, and even then truncated.
+PAYLOAD_FIELDS = ('payload',)
+PAYLOAD_SAMPLE_RATE = 0.1
+MAX_PAYLOAD_CHARS = 2000
+
+# Standard LogRecord attributes; anything else on a record came from `extra=`.
+_RECORD_ATTRIBUTES = set(vars(logging.makeLogRecord({}))) | {'message', 'asctime', 'taskName'}
+
+# Per-channel/guild fields attached to every record logged while they are bound.
+_context = contextvars.ContextVar('log_context', default={})
+
+_listener = None
+
+
+def bind(**fields):
+    """
+    Attaches fields (e.g. channel_id, guild_id) to every record logged from the current task.
+    """
+    _context.set({**_context.get(), **fields})
+
+
+class _ContextFilter(logging.Filter):
+    """Copies the bound context onto the record. Runs in the logging caller, so keep it cheap."""
+
+    def filter(self, record):
+        for key, value in _context.get().items():
+            if not hasattr(record, key):
+                setattr(record, key, value)
+        return True
+
+
+class _QueueHandler(QueueHandler):
+    """
+    A QueueHandler that keeps the record's extra fields instead of flattening
+    everything into a preformatted string.
+    """
+
+    def prepare(self, record):
+        record = copy.copy(record)
+        record.msg = record.getMessage()
+        record.args = None
+        if record.exc_info:
+            # Tracebacks hold frames, so render them before handing the record to another thread
+            record.exc_text = logging.Formatter().formatException(record.exc_info)
+            record.exc_info = None
+        return record
+
+
+class JsonFormatter(logging.Formatter):
+    """Formats records as one JSON object per line."""
+
+    def _payload(self, value):
+        if random.random() >= PAYLOAD_SAMPLE_RATE:
+            return {'sampled_out': True, 'size': len(str(value))}
+        text = value if isinstance(value, str) else json.dumps(value, default=str, ensure_ascii=False)
+        if len(text) > MAX_PAYLOAD_CHARS:
+            return text[:MAX_PAYLOAD_CHARS] + f"... ({len(text)} chars)"
+        return text
+
+    def format(self, record):
+        entry = {
+            'ts': datetime.datetime.fromtimestamp(record.created, datetime.timezone.utc).isoformat(),
+            'level': record.levelname,
+            'logger': record.name,
+            'message': record.getMessage(),
+        }
+        for key, value in vars(record).items():
+            if key in _RECORD_ATTRIBUTES:
+                continue
+            entry[key] = self._payload(value) if key in PAYLOAD_FIELDS else value
+        if record.exc_text:
+            entry['exception'] = record.exc_text
+        return json.dumps(entry, default=str, ensure_ascii=False)
+
+
+def setup_logging(level=LOG_LEVEL, stream=None):
+    """
+    Routes the root logger (and with it the `discord` logger) through a background writer thread.
+    Safe to call more than once.
+    """
+    global _listener
+    if _listener is not None:
+        return
+
+    log_queue = queue.SimpleQueue()
+    handler = _QueueHandler(log_queue)
+    handler.addFilter(_ContextFilter())
+
+    output = logging.StreamHandler(stream or sys.stdout)
+    output.setFormatter(JsonFormatter())
+
+    root = logging.getLogger()
+    root.setLevel(level)
+    root.addHandler(handler)
+
+    _listener = QueueListener(log_queue, output, respect_handler_level=True)
+    _listener.start()
+    atexit.register(_listener.stop)
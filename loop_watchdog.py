@@ -0,0 +1,135 @@
+import asyncio
+import collections
+import logging
+import sys
+import threading
+import time
+import traceback
+
+log = logging.getLogger(__name__)
+
+# --- Event Loop Watchdog ---
+# A coroutine ticks every TICK_INTERVAL seconds and records how late it woke up (loop lag).
+# A separate thread watches those ticks; when they stop for longer than STALL_THRESHOLD the
+# loop is blocked, so the thread grabs the loop thread's stack to show what is blocking it.
+
+TICK_INTERVAL = 0.1
+STALL_THRESHOLD = 0.5
+EWMA_ALPHA = 0.1
+
+# Sampling profiler defaults
+SAMPLE_INTERVAL = 0.005
+MAX_PROFILE_SECONDS = 60
+
+
+def format_stack(frame):
+    """Formats a frame's stack, innermost call last."""
+    return ''.join(traceback.format_stack(frame))
+
+
+def collapse_stack(frame):
+    """Renders a frame's stack as a flamegraph 'collapsed' key: outer;...;inner."""
+    names = []
+    while frame is not None:
+        code = frame.f_code
+        names.append(f"{code.co_name} ({code.co_filename}:{frame.f_lineno})")
+        frame = frame.f_back
+    return ';'.join(reversed(names))
+
+
+class LoopWatchdog:
+    """
+    Measures event loop lag continuously and logs the blocking stack when the loop stalls.
+    """
+
+    def __init__(self, tick_interval=TICK_INTERVAL, stall_threshold=STALL_THRESHOLD):
+        self.tick_interval = tick_interval
+        self.stall_threshold = stall_threshold
+        self.loop_thread_id = None
+        self.last_tick = time.monotonic()
+        self.avg_lag = 0.0
+        self.max_lag = 0.0
+        self.stalls = 0
+        self.last_stall_stack = None
+        self._task = None
+        self._thread = None
+        self._stopping = threading.Event()
+
+    def start(self):
+        """Starts the watchdog. Must be called from inside the running event loop."""
+        if self._task is not None and not self._task.done():
+            return
+        self.loop_thread_id = threading.get_ident()
+        self.last_tick = time.monotonic()
+        self._stopping.clear()
+        self._task = asyncio.get_running_loop().create_task(self._tick(), name='loop-watchdog')
+        self._thread = threading.Thread(target=self._watch, name='loop-watchdog', daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._stopping.set()
+        if self._task is not None:
+            self._task.cancel()
+
+    async def _tick(self):
+        while True:
+            expected = time.monotonic() + self.tick_interval
+            await asyncio.sleep(self.tick_interval)
+            now = time.monotonic()
+            lag = max(0.0, now - expected)
+            self.avg_lag += EWMA_ALPHA * (lag - self.avg_lag)
+            self.max_lag = max(self.max_lag, lag)
+            self.last_tick = now
+
+    def _loop_frame(self):
+        return sys._current_frames().get(self.loop_thread_id)
+
+    def _watch(self):
+        reported_tick = None
+        while not self._stopping.wait(self.tick_interval):
+            last_tick = self.last_tick
+            blocked_for = time.monotonic() - last_tick
+            if blocked_for < self.stall_threshold or reported_tick == last_tick:
+                continue
+            # Only report each stall once, while it is happening
+            reported_tick = last_tick
+            frame = self._loop_frame()
+            if frame is None:
+                continue
+            self.stalls += 1
+            self.last_stall_stack = format_stack(frame)
+            log.warning(
+                "Event loop blocked for %.2fs", blocked_for,
+                extra={'blocked_for': round(blocked_for, 3), 'stack': self.last_stall_stack},
+            )
+
+    def stats(self):
+        """Returns a snapshot of the watchdog's measurements for reporting."""
+        return {
+            'avg_lag_ms': round(self.avg_lag * 1000, 2),
+            'max_lag_ms': round(self.max_lag * 1000, 2),
+            'stalls': self.stalls,
+            'stall_threshold_ms': round(self.stall_threshold * 1000),
+        }
+
+
+def profile_thread(thread_id, seconds, interval=SAMPLE_INTERVAL):
+    """
+    Samples a thread's stack for `seconds` and returns it in collapsed-stack format
+    (one "frame;frame;frame count" line per unique stack), ready for flamegraph.pl or speedscope.
+    Blocking, so run it in a worker thread.
+    """
+    seconds = min(seconds, MAX_PROFILE_SECONDS)
+    counts = collections.Counter()
+    deadline = time.monotonic() + seconds
+    while time.monotonic() < deadline:
+        frame = sys._current_frames().get(thread_id)
+        if frame is not None:
+            counts[collapse_stack(frame)] += 1
+        del frame
+        time.sleep(interval)
+    return '\n'.join(f"{stack} {count}" for stack, count in counts.most_common()) + '\n'
+
+
+# The one watchdog for the process. It lives outside the extensions so reloads keep it.
+monitor = LoopWatchdog()
@@ -0,0 +1,113 @@
+import tracemalloc
+
+import dedup
+import quota
+import storage
+import voting
+
+# --- Memory Diagnostics ---
+# tracemalloc snapshots diffed against the previous one, plus sizes of everything that
+# grows with traffic: our per-channel registries and discord.py's internal caches.
+
+TRACEMALLOC_FRAMES = 5
+TOP_ALLOCATIONS = 10
+
+# How large each registry is expected to get. Going over means something isn't being pruned.
+EXPECTED_BOUNDS = {
+    'current_stories': 5_000,
+    'current_choices': 5_000,
+    'user_turn_active': 5_000,
+    'round_counter': 5_000,
+    'choice_rounds': 5_000,
+    'recent_options': 5_000,
+    'vote_mode': 5_000,
+    'open_votes': 5_000,
+    'praise_tasks': 500,
+    'idle_tasks': 500,
+    'last_interaction_time': 20_000,
+    'seen_messages': 2 * dedup.MAX_PER_BUCKET,
+    'quota_counters': 50_000,
+    'discord_users': 250_000,
+    'discord_guilds': 2_500,
+    'discord_messages': 5_000,
+    'discord_private_channels': 1_000,
+}
+
+# Registries in storage.py, by name
+_REGISTRIES = (
+    'current_stories',
+    'current_choices',
+    'user_turn_active',
+    'round_counter',
+    'choice_rounds',
+    'recent_options',
+    'vote_mode',
+    'praise_tasks',
+    'idle_tasks',
+    'last_interaction_time',
+)
+
+# Snapshot filters: ignore tracemalloc's own and the import system's allocations
+_SNAPSHOT_FILTERS = (
+    tracemalloc.Filter(False, tracemalloc.__file__),
+    tracemalloc.Filter(False, '<frozen importlib._bootstrap>'),
+    tracemalloc.Filter(False, '<frozen importlib._bootstrap_external>'),
+    tracemalloc.Filter(False, '<unknown>'),
+)
+
+_last_snapshot = None
+
+
+def registry_sizes():
+    """Returns the size of each of our per-channel registries and process-wide sets."""
+    sizes = {name: len(getattr(storage, name)) for name in _REGISTRIES}
+    sizes['seen_messages'] = len(dedup.seen_messages)
+    sizes['quota_counters'] = len(quota.manager.counters)
+    sizes['open_votes'] = len(voting.board.rounds)
+    return sizes
+
+
+def finished_task_count():
+    """Counts praise/idle tasks that are done but still referenced."""
+    tasks = list(storage.praise_tasks.values()) + list(storage.idle_tasks.values())
+    return sum(1 for task in tasks if task.done())
+
+
+def discord_cache_sizes(bot):
+    """Reads the sizes of discord.py's internal ConnectionState caches."""
+    state = bot._connection
+    return {
+        'discord_users': len(state._users),
+        'discord_guilds': len(state._guilds),
+        'discord_messages': len(state._messages) if state._messages is not None else 0,
+        'discord_private_channels': len(state._private_channels),
+        'discord_emojis': len(state._emojis),
+        'discord_stickers': len(state._stickers),
+    }
+
+
+def over_bounds(sizes):
+    """Returns (name, size, bound) for every registry that went over its expected bound."""
+    return [(name, size, EXPECTED_BOUNDS[name]) for name, size in sizes.items() if name in EXPECTED_BOUNDS and size > EXPECTED_BOUNDS[name]]
+
+
+def allocation_diff(limit=TOP_ALLOCATIONS):
+    """
+    Takes a tracemalloc snapshot and diffs it against the previous one.
+    Returns (lines, total_kib). The first call starts tracing and only sets the baseline.
+    Blocking and CPU heavy, so run it in a worker thread.
+    """
+    global _last_snapshot
+    if not tracemalloc.is_tracing():
+        tracemalloc.start(TRACEMALLOC_FRAMES)
+
+    snapshot = tracemalloc.take_snapshot().filter_traces(_SNAPSHOT_FILTERS)
+    total_kib = sum(stat.size for stat in snapshot.statistics('filename')) / 1024
+    previous, _last_snapshot = _last_snapshot, snapshot
+
+    if previous is None:
+        stats = snapshot.statistics('lineno')[:limit]
+        return [f"{stat.size / 1024:.1f} KiB in {stat.count} blocks: {stat.traceback[0]}" for stat in stats], total_kib
+
+    stats = snapshot.compare_to(previous, 'lineno')[:limit]
+    return [f"{stat.size_diff / 1024:+.1f} KiB ({stat.count_diff:+} blocks): {stat.traceback[0]}" for stat in stats], total_kib
@@ -0,0 +1,60 @@
+import random
+import re
+import zlib
+
+# --- Near-Duplicate Options ---
+# Gemini likes to offer two versions of the same idea, or an option it already offered a
+# few rounds ago. Each option gets a MinHash signature over its character shingles; the
+# share of matching signature slots estimates how much two options overlap (Jaccard).
+
+NUM_HASHES = 64
+SHINGLE_CHARS = 5
+# Options whose estimated overlap is at least this much count as the same idea
+SIMILARITY_THRESHOLD = 0.5
+# Signatures of this many recent options are kept per channel
+HISTORY_SIZE = 30
+
+_PRIME = (1 << 61) - 1
+_rng = random.Random(20240724)    # fixed, so signatures stay comparable across reloads
+_PERMUTATIONS = tuple((_rng.randrange(1, _PRIME), _rng.randrange(0, _PRIME)) for _ in range(NUM_HASHES))
+
+_WORD_PATTERN = re.compile(r"[a-z0-9']+")
+
+
+def shingles(text):
+    """The set of overlapping character chunks of the normalized text."""
+    normalized = " ".join(_WORD_PATTERN.findall(text.lower()))
+    if len(normalized) <= SHINGLE_CHARS:
+        return {normalized}
+    return {normalized[i:i + SHINGLE_CHARS] for i in range(len(normalized) - SHINGLE_CHARS + 1)}
+
+
+def signature(text):
+    """Computes the MinHash signature of a piece of text."""
+    hashes = [zlib.crc32(shingle.encode()) for shingle in shingles(text)]
+    return tuple(min((a * h + b) % _PRIME for h in hashes) for a, b in _PERMUTATIONS)
+
+
+def similarity(first, second):
+    """Estimated Jaccard similarity of the texts behind two signatures."""
+    return sum(x == y for x, y in zip(first, second)) / NUM_HASHES
+
+
+def is_near_duplicate(sig, others):
+    """True if the signature is too close to any of the others."""
+    return any(similarity(sig, other) >= SIMILARITY_THRESHOLD for other in others)
+
+
+def find_duplicates(signatures, history=()):
+    """
+    Returns the indexes of signatures that nearly duplicate an earlier one in the list
+    (the first of a pair is kept) or one in `history`.
+    """
+    duplicates = []
+    kept = []
+    for index, sig in enumerate(signatures):
+        if is_near_duplicate(sig, kept) or is_near_duplicate(sig, history):
+            duplicates.append(index)
+        else:
+            kept.append(sig)
+    return duplicates
@@ -0,0 +1,111 @@
+import asyncio
+import time
+from contextlib import asynccontextmanager
+
+from discord.http import Route
+
+import config
+
+# --- Rate Limit Pacing ---
+# Praise and idle pings share each channel's message send bucket with the story.
+# Before sending, they look at that bucket (remaining requests, reset time, requests
+# already queued on it) and hold off when sending now would make a story message wait.
+
+# The thresholds are the [pacing] settings (see config.py). A story counts as active for
+# story_grace_seconds after its last generation finished, since the next choice or turn
+# usually follows soon after; reset_margin keeps us from racing the story for a fresh window.
+
+# How many channels' story timestamps to keep before pruning old ones
+_PRUNE_AT = 1_000
+
+
+def message_route(channel_id):
+    """The route (and so the rate limit bucket) used to send a message to a channel."""
+    return Route('POST', '/channels/{channel_id}/messages', channel_id=channel_id)
+
+
+class Pacer:
+    """
+    Tracks which channels have story traffic going and tells praise/idle loops how long
+    to hold off before sending.
+    """
+
+    def __init__(self):
+        self._in_flight = {}    # channel_id -> story generations running
+        self._last_story = {}   # channel_id -> time.monotonic() of the last one finishing
+
+        # Counters for reporting
+        self.held = 0
+        self.dropped = 0
+
+    @asynccontextmanager
+    async def story_turn(self, channel_id):
+        """Marks the channel as busy with story traffic for the duration of the block."""
+        self._in_flight[channel_id] = self._in_flight.get(channel_id, 0) + 1
+        try:
+            yield
+        finally:
+            remaining = self._in_flight[channel_id] - 1
+            if remaining:
+                self._in_flight[channel_id] = remaining
+            else:
+                del self._in_flight[channel_id]
+            self._last_story[channel_id] = time.monotonic()
+            if len(self._last_story) > _PRUNE_AT:
+                self._prune()
+
+    def _prune(self):
+        cutoff = time.monotonic() - config.current.pacing.story_grace_seconds
+        for channel_id in [channel_id for channel_id, last in self._last_story.items() if last < cutoff]:
+            del self._last_story[channel_id]
+
+    def story_active(self, channel_id):
+        """True while a story in the channel is generating, or finished one very recently."""
+        if channel_id in self._in_flight:
+            return True
+        last = self._last_story.get(channel_id)
+        return last is not None and time.monotonic() - last < config.current.pacing.story_grace_seconds
+
+    def delay(self, http, channel_id):
+        """
+        Seconds a low-priority message to this channel should wait before sending. 0 means go.
+        Reads the live state of discord.py's rate limit bucket for the channel.
+        """
+        bucket = http.peek_ratelimit(message_route(channel_id))
+        if bucket is None or bucket.expires is None or bucket.is_expired():
+            # Nothing sent recently, or the window already reset: the bucket is wide open
+            return 0.0
+
+        settings = config.current.pacing
+        reserve = settings.story_reserve if self.story_active(channel_id) else 0
+        headroom = bucket.remaining - bucket.pending
+        if headroom > reserve:
+            return 0.0
+        return max(0.0, bucket.expires - asyncio.get_running_loop().time()) + settings.reset_margin
+
+    async def wait_turn(self, http, channel_id):
+        """
+        Waits until a low-priority message can go out without crowding out story traffic.
+        Returns False if it had to wait so long that the message should be skipped.
+        """
+        waited = 0.0
+        while (delay := self.delay(http, channel_id)) > 0:
+            if waited + delay > config.current.pacing.max_hold_seconds:
+                self.dropped += 1
+                return False
+            self.held += 1
+            await asyncio.sleep(delay)
+            waited += delay
+        return True
+
+    def stats(self):
+        """Returns a snapshot of the pacer's state for reporting."""
+        return {
+            'story_channels_in_flight': len(self._in_flight),
+            'held': self.held,
+            'dropped': self.dropped,
+        }
+
+
+# The one pacer shared by every cog. It lives outside the extensions so reloads keep it.
+pacer = Pacer()
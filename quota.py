@@ -0,0 +1,202 @@
+import heapq
+import json
+import os
+import time
+
+import config
+from token_budget import estimate_cost
+
+# --- Quotas and Cost Accounting ---
+# Every guild and user gets a token and request budget over a sliding window.
+# A window is split into a fixed number of buckets, so each counter is a few short
+# lists and a check only touches the buckets that expired since the last one.
+
+WINDOW_SECONDS = 3600
+BUCKETS = 12
+
+# The budgets per window are the [quota] settings (see config.py). Praise doesn't call
+# Gemini, but an endless praise stream still costs us sends, so it has a budget too.
+
+# Scopes a counter can belong to
+GUILD = 'guild'
+USER = 'user'
+PRAISE = 'praise'
+
+CHECKPOINT_PATH = os.getenv("QUOTA_CHECKPOINT_PATH", "quota_usage.json")
+
+
+class QuotaExceeded(Exception):
+    """Raised when a guild or user has used up its budget for the current window."""
+
+    def __init__(self, scope, retry_after):
+        super().__init__(f"{scope} quota exceeded, retry in {retry_after:.0f}s")
+        self.scope = scope
+        self.retry_after = retry_after
+
+
+class SlidingCounter:
+    """
+    Token and request counts over the last WINDOW_SECONDS, plus lifetime totals.
+    """
+
+    __slots__ = ('epochs', 'tokens', 'requests', 'window_tokens', 'window_requests', 'lifetime_tokens', 'lifetime_requests')
+
+    def __init__(self):
+        self.epochs = [0] * BUCKETS    # which bucket number each slot currently holds
+        self.tokens = [0] * BUCKETS
+        self.requests = [0] * BUCKETS
+        self.window_tokens = 0
+        self.window_requests = 0
+        self.lifetime_tokens = 0
+        self.lifetime_requests = 0
+
+    def _advance(self, epoch):
+        """Drops buckets that fell out of the window. At most BUCKETS slots are touched."""
+        for slot in range(BUCKETS):
+            if self.epochs[slot] <= epoch - BUCKETS:
+                self.window_tokens -= self.tokens[slot]
+                self.window_requests -= self.requests[slot]
+                self.tokens[slot] = 0
+                self.requests[slot] = 0
+                self.epochs[slot] = epoch - (epoch - slot) % BUCKETS
+
+    def usage(self, epoch):
+        """Returns (tokens, requests) used in the window ending at this bucket."""
+        self._advance(epoch)
+        return self.window_tokens, self.window_requests
+
+    def add(self, epoch, tokens, requests=1):
+        self._advance(epoch)
+        slot = epoch % BUCKETS
+        self.tokens[slot] += tokens
+        self.requests[slot] += requests
+        self.window_tokens += tokens
+        self.window_requests += requests
+        self.lifetime_tokens += tokens
+        self.lifetime_requests += requests
+
+    def to_dict(self):
+        return {name: getattr(self, name) for name in self.__slots__}
+
+    @classmethod
+    def from_dict(cls, data):
+        counter = cls()
+        for name in cls.__slots__:
+            setattr(counter, name, data[name])
+        return counter
+
+
+class QuotaManager:
+    """
+    Holds one SlidingCounter per (scope, id) and checks them against the budgets.
+    """
+
+    def __init__(self):
+        self.counters = {}
+        self.dirty = False
+
+    def _epoch(self, now=None):
+        return int((now if now is not None else time.time()) * BUCKETS // WINDOW_SECONDS)
+
+    def _retry_after(self):
+        """Seconds until the oldest bucket leaves the window."""
+        bucket_seconds = WINDOW_SECONDS / BUCKETS
+        return bucket_seconds - time.time() % bucket_seconds
+
+    def _counter(self, scope, key):
+        counter = self.counters.get((scope, key))
+        if counter is None:
+            counter = self.counters[(scope, key)] = SlidingCounter()
+        return counter
+
+    def _check_one(self, scope, key, tokens, token_budget, request_budget, epoch):
+        counter = self.counters.get((scope, key))
+        if counter is None:
+            return
+        used_tokens, used_requests = counter.usage(epoch)
+        if (token_budget and used_tokens + tokens > token_budget) or (request_budget and used_requests >= request_budget):
+            raise QuotaExceeded(scope, self._retry_after())
+
+    def check(self, guild_id, user_id, tokens):
+        """
+        Raises QuotaExceeded if a generation of about `tokens` tokens would go over
+        the guild's or the user's budget.
+        """
+        epoch = self._epoch()
+        budgets = config.current.quota
+        if guild_id is not None:
+            self._check_one(GUILD, guild_id, tokens, budgets.guild_tokens_per_window, budgets.guild_requests_per_window, epoch)
+        if user_id is not None:
+            self._check_one(USER, user_id, tokens, budgets.user_tokens_per_window, budgets.user_requests_per_window, epoch)
+
+    def record(self, guild_id, user_id, tokens):
+        """Charges a finished generation to its guild and user."""
+        epoch = self._epoch()
+        if guild_id is not None:
+            self._counter(GUILD, guild_id).add(epoch, tokens)
+        if user_id is not None:
+            self._counter(USER, user_id).add(epoch, tokens)
+        self.dirty = True
+
+    def charge_praise(self, guild_id):
+        """
+        Counts one praise message. Returns False once the guild's praise budget is spent.
+        """
+        epoch = self._epoch()
+        counter = self._counter(PRAISE, guild_id)
+        _, used = counter.usage(epoch)
+        budget = config.current.quota.praise_messages_per_window
+        if budget and used >= budget:
+            return False
+        counter.add(epoch, 0)
+        self.dirty = True
+        return True
+
+    def top_consumers(self, scope=GUILD, limit=10):
+        """
+        Returns the heaviest consumers in a scope as (id, window_tokens, window_requests,
+        lifetime_tokens, estimated_lifetime_cost) tuples, heaviest first.
+        """
+        epoch = self._epoch()
+        rows = []
+        for (counter_scope, key), counter in self.counters.items():
+            if counter_scope != scope:
+                continue
+            tokens, requests = counter.usage(epoch)
+            rows.append((key, tokens, requests, counter.lifetime_tokens, estimate_cost(counter.lifetime_tokens)))
+        return heapq.nlargest(limit, rows, key=lambda row: (row[1], row[3]))
+
+    def snapshot(self):
+        """Serializes every counter into a JSON-friendly dict."""
+        self.dirty = False
+        return {
+            'saved_at': time.time(),
+            'counters': {f"{scope}:{key}": counter.to_dict() for (scope, key), counter in self.counters.items()},
+        }
+
+    def restore(self, data):
+        """Loads counters from a snapshot() dict."""
+        for name, counter in data.get('counters', {}).items():
+            scope, key = name.split(':', 1)
+            self.counters[(scope, int(key))] = SlidingCounter.from_dict(counter)
+
+
+def write_checkpoint(snapshot, path=CHECKPOINT_PATH):
+    """Writes a snapshot to disk atomically. Blocking, so run it in a thread."""
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, 'w', encoding='utf-8') as file:
+        json.dump(snapshot, file, separators=(',', ':'))
+    os.replace(tmp_path, path)
+
+
+def read_checkpoint(path=CHECKPOINT_PATH):
+    """Reads a snapshot written by write_checkpoint, or returns None if there isn't one."""
+    try:
+        with open(path, encoding='utf-8') as file:
+            return json.load(file)
+    except FileNotFoundError:
+        return None
+
+
+# The one manager shared by every cog. It lives outside the extensions so reloads keep it.
+manager = QuotaManager()
@@ -0,0 +1,70 @@
+import datetime
+
+# --- Global Story Storage ---
+# All per-channel state lives here rather than in the cogs, so reloading an
+# extension swaps the code but keeps every story, task and timer intact.
+
+# A dictionary to store the current story for each channel.
+# Key: channel_id (int), Value: StoryTree (see story_tree.py)
+current_stories = {}
+
+# A dictionary to store the current choices offered by the bot for each channel.
+# These are the options cached on the story's current node while they're on offer.
+# Key: channel_id (int), Value: list of choice strings
+current_choices = {}
+
+# A dictionary to track if it's currently the user's turn to write a continuation.
+# Key: channel_id (int), Value: boolean
+user_turn_active = {}
+
+# A dictionary to track the number of bot-generated rounds since the last user turn.
+# Key: channel_id (int), Value: int
+round_counter = {}
+
+# A dictionary counting how many sets of choices each channel has been offered.
+# Choice buttons carry the round they belong to, so older buttons can be spotted.
+# Key: channel_id (int), Value: int
+choice_rounds = {}
+
+# MinHash signatures of the options recently offered in each channel (see near_dup.py),
+# so Gemini can't keep offering the same idea round after round.
+# Key: channel_id (int), Value: deque of signatures
+recent_options = {}
+
+# Channels where the next option is picked by a reaction vote instead of `!choose`.
+# A story thread follows its parent channel's setting.
+# Key: channel_id (int), Value: boolean
+vote_mode = {}
+
+# --- Praise Mode Storage ---
+# A dictionary to hold the asyncio.Task for each channel's praise loop.
+# Key: channel_id (int), Value: asyncio.Task
+praise_tasks = {}
+
+# --- Idle Mode Storage ---
+# Key: channel_id (int), Value: asyncio.Task
+idle_tasks = {}
+
+last_interaction_time = {} # Dictionary to store the last interaction time for each channel
+
+def update_interaction_time(channel_id):
+    """Updates the last interaction timestamp for a given channel."""
+    last_interaction_time[channel_id] = datetime.datetime.now(datetime.timezone.utc)
+
+def prune_finished_tasks():
+    """Forgets praise/idle tasks that have already finished. Returns how many were dropped."""
+    pruned = 0
+    for tasks in (praise_tasks, idle_tasks):
+        for channel_id in [channel_id for channel_id, task in tasks.items() if task.done()]:
+            del tasks[channel_id]
+            pruned += 1
+    return pruned
+
+def forget_channel(channel_id):
+    """Drops every story, task and timer kept for a channel, e.g. a story thread that was deleted."""
+    for registry in (current_stories, current_choices, user_turn_active, round_counter, choice_rounds, recent_options, vote_mode, last_interaction_time):
+        registry.pop(channel_id, None)
+    for tasks in (praise_tasks, idle_tasks):
+        task = tasks.pop(channel_id, None)
+        if task is not None:
+            task.cancel()
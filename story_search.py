@@ -0,0 +1,214 @@
+import heapq
+import math
+import re
+import struct
+import sys
+
+# --- Story Search ---
+# An inverted index over every story segment, updated as segments are added.
+# Each term maps to a postings list of (segment id, term frequency) pairs. Segment ids
+# only ever grow, so postings are appended in order and stored as varint-encoded gaps
+# in a bytearray: a few bytes per posting instead of a Python tuple. The first 8 bytes
+# of each list hold the last segment id and the number of segments in it.
+# Searches never cross guilds, so every guild (or DM) gets its own postings and
+# statistics, and a query only decodes the postings of the guild it was asked in.
+# Queries are ranked with BM25.
+# The index keeps only a snippet of each segment, never the StoryNode, so a story's tree
+# is freed once nothing else holds it. Segments of deleted channels are hidden from
+# results straight away, and dropped from the postings once enough have piled up.
+
+# BM25 parameters
+K1 = 1.2
+B = 0.75
+
+MAX_RESULTS = 5
+SNIPPET_CHARS = 160
+
+# Forgotten segments to collect before compacting them away
+COMPACT_AFTER = 1_000
+
+# Header of every postings list: last segment id, number of segments
+_HEADER = struct.Struct('<II')
+
+_TOKEN_PATTERN = re.compile(r"[a-z0-9]+(?:'[a-z]+)?")
+
+# Too common to tell stories apart, and their postings would be as long as the index
+STOPWORDS = frozenset("""
+a an and are as at be but by for from had has have he her hers him his i in is it its
+me my of on or our she so that the their them then there they this to was we were
+what when which who will with you your
+""".split())
+
+
+def tokenize(text):
+    """Lowercases text and splits it into indexable terms."""
+    # Interned, so the same term in many guilds' postings is stored once
+    return [sys.intern(token) for token in _TOKEN_PATTERN.findall(text.lower()) if token not in STOPWORDS]
+
+
+def _append_varint(buffer, value):
+    while value >= 0x80:
+        buffer.append((value & 0x7F) | 0x80)
+        value >>= 7
+    buffer.append(value)
+
+
+def _decode_postings(buffer):
+    """Yields (segment id, term frequency) pairs from a delta-encoded postings buffer."""
+    doc_id = 0
+    values = []
+    value = shift = 0
+    for byte in memoryview(buffer)[_HEADER.size:]:
+        value |= (byte & 0x7F) << shift
+        if byte & 0x80:
+            shift += 7
+            continue
+        values.append(value)
+        value = shift = 0
+        if len(values) == 2:
+            doc_id += values[0]
+            yield doc_id, values[1]
+            values.clear()
+
+
+def _encode_postings(pairs):
+    """Builds a postings buffer (header included) from ascending (segment id, term frequency) pairs."""
+    buffer = bytearray(_HEADER.size)
+    last_doc = 0
+    for doc_id, frequency in pairs:
+        _append_varint(buffer, doc_id - last_doc)
+        _append_varint(buffer, frequency)
+        last_doc = doc_id
+    _HEADER.pack_into(buffer, 0, last_doc, len(pairs))
+    return buffer
+
+
+class _Scope:
+    __slots__ = ('postings', 'segment_count', 'total_length')
+
+    def __init__(self):
+        self.postings = {}    # term -> header + delta-encoded postings
+        self.segment_count = 0
+        self.total_length = 0
+
+
+class SearchIndex:
+    """
+    Incrementally maintained BM25 index over story segments.
+    """
+
+    def __init__(self):
+        self.scopes = {}          # guild id, or channel id for DMs -> _Scope
+        self.snippets = [None]    # segment id -> excerpt shown in results (id 0 is unused, so gaps are never 0)
+        self.channels = [None]    # segment id -> channel id, None once compacted away
+        self.lengths = [0]        # segment id -> number of terms
+        self.channel_scopes = {}  # channel id -> (scope, number of segments)
+        self.dead_channels = set()
+        self.dead_segments = 0    # segments of dead channels still in the postings
+
+    def __len__(self):
+        return sum(scope.segment_count for scope in self.scopes.values())
+
+    def add(self, node, channel_id, scope):
+        """Indexes a story segment. Nodes that were already indexed are skipped."""
+        if node.doc_id is not None:
+            return
+        doc_id = node.doc_id = len(self.snippets)
+        text = node.text
+        self.snippets.append(text if len(text) <= SNIPPET_CHARS else text[:SNIPPET_CHARS - 3] + "...")
+        self.channels.append(channel_id)
+        _, count = self.channel_scopes.get(channel_id, (scope, 0))
+        self.channel_scopes[channel_id] = (scope, count + 1)
+
+        index = self.scopes.get(scope)
+        if index is None:
+            index = self.scopes[scope] = _Scope()
+        terms = tokenize(text)
+        self.lengths.append(len(terms))
+        index.segment_count += 1
+        index.total_length += len(terms)
+
+        frequencies = {}
+        for term in terms:
+            frequencies[term] = frequencies.get(term, 0) + 1
+        for term, frequency in frequencies.items():
+            postings = index.postings.get(term)
+            if postings is None:
+                postings = index.postings[term] = bytearray(_HEADER.size)
+            last_doc, count = _HEADER.unpack_from(postings)
+            _append_varint(postings, doc_id - last_doc)
+            _append_varint(postings, frequency)
+            _HEADER.pack_into(postings, 0, doc_id, count + 1)
+
+    def forget_channel(self, channel_id):
+        """Hides a channel's segments from search results (e.g. its thread was deleted)."""
+        if channel_id not in self.channel_scopes or channel_id in self.dead_channels:
+            return
+        self.dead_channels.add(channel_id)
+        self.dead_segments += self.channel_scopes[channel_id][1]
+        if self.dead_segments >= COMPACT_AFTER:
+            self.compact()
+
+    def compact(self):
+        """Drops the segments of forgotten channels from the postings and frees their snippets."""
+        dead = self.dead_channels
+        channels = self.channels
+        scope_of = {channel_id: self.channel_scopes.pop(channel_id)[0] for channel_id in dead}
+        scope_ids = set(scope_of.values())
+        for scope_id in scope_ids:
+            postings_lists = self.scopes[scope_id].postings
+            for term, postings in list(postings_lists.items()):
+                _, count = _HEADER.unpack_from(postings)
+                kept = [(doc_id, frequency) for doc_id, frequency in _decode_postings(postings) if channels[doc_id] not in dead]
+                if not kept:
+                    del postings_lists[term]
+                elif len(kept) < count:
+                    postings_lists[term] = _encode_postings(kept)
+
+        for doc_id, channel_id in enumerate(channels):
+            if channel_id in dead:
+                scope = self.scopes[scope_of[channel_id]]
+                scope.segment_count -= 1
+                scope.total_length -= self.lengths[doc_id]
+                self.snippets[doc_id] = channels[doc_id] = None
+                self.lengths[doc_id] = 0
+        for scope_id in scope_ids:
+            if not self.scopes[scope_id].segment_count:
+                del self.scopes[scope_id]
+        dead.clear()
+        self.dead_segments = 0
+
+    def search(self, query, scope, limit=MAX_RESULTS):
+        """
+        Returns up to `limit` (score, segment id) pairs for the query, best first.
+        Only segments from the same scope (guild, or DM channel) are searched.
+        """
+        index = self.scopes.get(scope)
+        if index is None or not index.segment_count:
+            return []
+        segment_count = index.segment_count
+        average_length = index.total_length / segment_count
+        lengths = self.lengths
+
+        scores = {}
+        for term in set(tokenize(query)):
+            postings = index.postings.get(term)
+            if postings is None:
+                continue
+            _, count = _HEADER.unpack_from(postings)
+            idf = math.log(1 + (segment_count - count + 0.5) / (count + 0.5))
+            for doc_id, frequency in _decode_postings(postings):
+                norm = K1 * (1 - B + B * lengths[doc_id] / average_length)
+                scores[doc_id] = scores.get(doc_id, 0.0) + idf * frequency * (K1 + 1) / (frequency + norm)
+
+        if self.dead_channels:
+            return heapq.nlargest(limit, ((score, doc_id) for doc_id, score in scores.items() if self.channels[doc_id] not in self.dead_channels))
+        return heapq.nlargest(limit, ((score, doc_id) for doc_id, score in scores.items()))
+
+    def snippet(self, doc_id):
+        """A short excerpt of a segment for showing in results."""
+        return self.snippets[doc_id]
+
+
+# The one index shared by every cog. It lives outside the extensions so reloads keep it.
+index = SearchIndex()
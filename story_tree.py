@@ -0,0 +1,85 @@
+# --- Story Trees ---
+# A story is a tree of segments rather than one long string. Every node holds one segment
+# and a pointer to its parent, so all branches share their common beginning and moving
+# around (rewinding, switching branches) only moves a cursor; no text is ever copied.
+# The options Gemini offered at a node stay cached on it, chosen or not, so going back
+# to a node never needs another Gemini call.
+
+
+class StoryNode:
+    """One segment of a story, plus the options offered after it."""
+
+    __slots__ = ('text', 'parent', 'depth', 'children', 'options', 'option', 'sibling_index', 'doc_id')
+
+    def __init__(self, text, parent=None, option=None):
+        self.text = text
+        self.parent = parent
+        self.depth = parent.depth + 1 if parent else 0
+        self.children = []     # branches explored from here, in the order they were taken
+        self.options = None    # cached option texts generated after this segment
+        self.option = option   # which of the parent's options this is, None if the user wrote it
+        self.sibling_index = len(parent.children) if parent else 0
+        self.doc_id = None     # id in the search index, once indexed
+
+
+class StoryTree:
+    """
+    A story with a cursor on the node we're currently continuing from.
+    Rewinding and switching branches are O(1) per step.
+    """
+
+    __slots__ = ('root', 'cursor', 'size')
+
+    def __init__(self, opening):
+        self.root = self.cursor = StoryNode(opening)
+        self.size = 1
+
+    def text(self, node=None):
+        """The story along the path from the opening to `node` (default: the cursor)."""
+        segments = []
+        node = node or self.cursor
+        while node is not None:
+            segments.append(node.text)
+            node = node.parent
+        return " ".join(reversed(segments))
+
+    def _add_child(self, text, option=None):
+        node = StoryNode(text, self.cursor, option)
+        self.cursor.children.append(node)
+        self.cursor = node
+        self.size += 1
+        return node
+
+    def choose(self, option):
+        """
+        Continues with one of the cursor's cached options (1-based) and returns the new node.
+        Taking an option that was taken before goes back to that branch, options and all.
+        """
+        for child in self.cursor.children:
+            if child.option == option:
+                self.cursor = child
+                return child
+        return self._add_child(self.cursor.options[option - 1].strip(), option)
+
+    def write(self, text):
+        """Continues with a segment the user wrote and returns the new node."""
+        return self._add_child(text)
+
+    def rewind(self, steps=1):
+        """Moves the cursor back up to `steps` segments. Returns how many it actually moved."""
+        moved = 0
+        while moved < steps and self.cursor.parent is not None:
+            self.cursor = self.cursor.parent
+            moved += 1
+        return moved
+
+    def alternate(self):
+        """
+        Moves the cursor to the next branch explored from the same point, wrapping around.
+        Returns the new cursor, or None if there is no other branch.
+        """
+        parent = self.cursor.parent
+        if parent is None or len(parent.children) < 2:
+            return None
+        self.cursor = parent.children[(self.cursor.sibling_index + 1) % len(parent.children)]
+        return self.cursor
@@ -0,0 +1,108 @@
+import json
+import math
+import re
+from functools import lru_cache
+
+# --- Token Estimation ---
+# A fast local guess at Gemini's token count. It doesn't model the real tokenizer: it
+# is a character-class heuristic that counts a token per four letters or digits of a
+# word, one per punctuation mark and one per two UTF-8 bytes of anything non-ASCII.
+# SCALE is a hand-picked safety margin on top of that, not a measured ratio. To fit it
+# to the real thing, record some `countTokens` results and run calibrate() on them.
+CHARS_PER_WORD_PIECE = 4
+SCALE = 1.08
+
+# Hard ceiling for any single prompt we send to Gemini (input tokens).
+MAX_PROMPT_TOKENS = 6000
+
+# Rough input price in USD per 1M tokens, only used for cost estimates.
+PRICE_PER_MILLION_INPUT_TOKENS = 0.075
+
+_PIECE_PATTERN = re.compile(r"[A-Za-z]+|\d+|\s+|[^\w\s]|[^\x00-\x7f]|\w+")
+# Story segments are sentences; they are what we cache on since the story only grows at the end.
+_SEGMENT_PATTERN = re.compile(r"[^.!?\n]+[.!?\n]*\s*")
+
+
+@lru_cache(maxsize=4096)
+def _estimate_segment(segment: str) -> float:
+    """Estimates the (unscaled) token count of a single story segment."""
+    count = 0.0
+    for piece in _PIECE_PATTERN.findall(segment):
+        if piece.isspace():
+            continue  # Whitespace is merged into the following token
+        if piece.isascii():
+            if piece.isalpha() or piece.isdigit():
+                count += math.ceil(len(piece) / CHARS_PER_WORD_PIECE)
+            else:
+                count += 1
+        else:
+            # Non-ASCII characters (emoji, accents): guess one token per two UTF-8 bytes
+            count += max(1, len(piece.encode("utf-8")) // 2)
+    return count
+
+
+def split_segments(text: str) -> list:
+    """Splits text into sentence-like segments. Joining them gives back the original text."""
+    return _SEGMENT_PATTERN.findall(text) or ([text] if text else [])
+
+
+def estimate_tokens(text: str) -> int:
+    """
+    Estimates how many Gemini tokens a piece of text will cost.
+    """
+    if not text:
+        return 0
+    raw = sum(_estimate_segment(segment) for segment in split_segments(text))
+    return math.ceil(raw * SCALE)
+
+
+def estimate_cost(tokens: int) -> float:
+    """Estimates the input cost in USD for a number of tokens."""
+    return tokens * PRICE_PER_MILLION_INPUT_TOKENS / 1_000_000
+
+
+def trim_story_to_budget(story: str, max_tokens: int) -> str:
+    """
+    Trims the story so it fits in max_tokens.
+    Keeps the opening segment (so the premise isn't lost) and as many of the
+    most recent segments as fit, marking the gap with an ellipsis.
+    """
+    if estimate_tokens(story) <= max_tokens:
+        return story
+
+    segments = split_segments(story)
+    opening = segments[0]
+    budget = max_tokens - estimate_tokens(opening) - 1  # 1 for the "..." marker
+    if budget <= 0:
+        # Not even the opening fits, so keep only its tail
+        return story[-max_tokens * CHARS_PER_WORD_PIECE:]
+
+    kept = []
+    for segment in reversed(segments[1:]):
+        cost = math.ceil(_estimate_segment(segment) * SCALE)
+        if cost > budget:
+            break
+        kept.append(segment)
+        budget -= cost
+
+    kept.reverse()
+    return opening.rstrip() + " ... " + "".join(kept).lstrip()
+
+
+def calibrate(samples_path: str) -> float:
+    """
+    Computes a new SCALE from a JSONL file of recorded `countTokens` results.
+    Each line must look like {"text": "...", "totalTokens": 123}.
+    """
+    estimated = 0.0
+    actual = 0
+    with open(samples_path, encoding="utf-8") as samples:
+        for line in samples:
+            if not line.strip():
+                continue
+            sample = json.loads(line)
+            estimated += sum(_estimate_segment(s) for s in split_segments(sample["text"]))
+            actual += sample["totalTokens"]
+    if not estimated:
+        raise ValueError(f"No usable samples in {samples_path}")
+    return actual / estimated
@@ -0,0 +1,126 @@
+import atexit
+import hashlib
+import json
+import logging
+import os
+import queue
+import secrets
+import time
+from logging.handlers import QueueHandler, QueueListener
+
+# --- Traffic Traces ---
+# Records what the bot is asked to do and how Gemini answers, with every bit of content
+# left out, so real arrival patterns can be replayed later (benchmarks/replay_traffic.py).
+# One compact JSON object per line. Ids are replaced with keyed hashes that are only
+# stable within one trace: a channel is recognisable across events, but not outside it.
+# Lines are written from a background thread, like logs.py does.
+#
+# Events ("k"):
+#   command  a prefix or slash command: name "n", argument length "l", option "o" for choose
+#   message  a user continuation (a plain message in a channel whose story awaits one): length "l"
+#   button   a story choice button: option "o"
+#   gemini   a Gemini call: latency "s" in seconds, prompt tokens "p", response chars "r" (null on failure)
+# Every event has its time "t" in seconds since the trace started, and the user ones carry
+# the channel "c", guild "g", user "u", message "m" and, for threads, the parent channel "p".
+
+TRACE_PATH = os.getenv("TRAFFIC_TRACE_PATH", "")
+FORMAT_VERSION = 1
+
+
+class TraceRecorder:
+    """
+    Writes redacted traffic events to a trace file. Does nothing until started.
+    """
+
+    def __init__(self):
+        self._logger = None
+        self._listener = None
+        self._key = b''
+        self._started = 0.0
+
+    @property
+    def enabled(self):
+        return self._logger is not None
+
+    def start(self, path=TRACE_PATH):
+        """Starts recording to `path`, appending if it exists. Safe to call more than once."""
+        if self.enabled or not path:
+            return
+        handler = logging.FileHandler(path, encoding='utf-8')
+        handler.setFormatter(logging.Formatter('%(message)s'))
+        trace_queue = queue.SimpleQueue()
+        self._listener = QueueListener(trace_queue, handler)
+        self._listener.start()
+        atexit.register(self._listener.stop)
+
+        logger = logging.getLogger('story_weaver.trace')
+        logger.propagate = False
+        logger.setLevel(logging.INFO)
+        logger.addHandler(QueueHandler(trace_queue))
+
+        self._key = secrets.token_bytes(16)
+        self._started = time.monotonic()
+        self._logger = logger
+        self._write({'v': FORMAT_VERSION, 'k': 'start', 'wall': round(time.time())})
+
+    def _pseudonym(self, value):
+        if value is None:
+            return None
+        return hashlib.blake2b(str(value).encode(), key=self._key, digest_size=6).hexdigest()
+
+    def _write(self, entry):
+        self._logger.info(json.dumps(entry, separators=(',', ':')))
+
+    def _event(self, kind, channel=None, user=None, message_id=None, **fields):
+        entry = {'t': round(time.monotonic() - self._started, 3), 'k': kind}
+        if channel is not None:
+            guild = getattr(channel, 'guild', None)
+            entry['c'] = self._pseudonym(channel.id)
+            entry['g'] = self._pseudonym(guild.id if guild else None)
+            parent_id = getattr(channel, 'parent_id', None)
+            if parent_id is not None:
+                entry['p'] = self._pseudonym(parent_id)
+        if user is not None:
+            entry['u'] = self._pseudonym(user.id)
+        if message_id is not None:
+            entry['m'] = self._pseudonym(message_id)
+        entry.update(fields)
+        self._write(entry)
+
+    def command(self, message, name, arguments):
+        """Records a prefix command. Only the argument's length is kept (and a choose's option)."""
+        if not self.enabled:
+            return
+        fields = {'n': name, 'l': len(arguments)}
+        if name == 'choose' and arguments.strip().isdigit():
+            fields['o'] = int(arguments)
+        self._event('command', message.channel, message.author, message.id, **fields)
+
+    def continuation(self, message):
+        """Records a user continuation, by length only."""
+        if self.enabled:
+            self._event('message', message.channel, message.author, message.id, l=len(message.content))
+
+    def interaction(self, interaction):
+        """Records a slash command or a story choice button press."""
+        if not self.enabled:
+            return
+        data = interaction.data or {}
+        custom_id = data.get('custom_id', '')
+        if custom_id.startswith('story:'):
+            self._event('button', interaction.channel, interaction.user, o=int(custom_id.rsplit(':', 1)[1]))
+        elif 'name' in data:
+            options = {option['name']: option.get('value') for option in data.get('options', [])}
+            fields = {'n': data['name'], 'l': sum(len(str(value)) for value in options.values())}
+            if isinstance(options.get('choice_number'), int):
+                fields['o'] = options['choice_number']
+            self._event('command', interaction.channel, interaction.user, **fields)
+
+    def gemini(self, latency, prompt_tokens, response_chars):
+        """Records one Gemini call. `response_chars` is None if the call failed."""
+        if self.enabled:
+            self._event('gemini', s=round(latency, 3), p=prompt_tokens, r=response_chars)
+
+
+# The one recorder shared by the whole bot.
+recorder = TraceRecorder()
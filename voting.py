@@ -0,0 +1,140 @@
+import asyncio
+import logging
+import random
+
+import config
+
+# --- Reaction Voting ---
+# In voting mode the next option is picked by reacting to the choices message instead of
+# first-come-first-served `!choose`. Tallies are kept up to date from the raw reaction
+# events alone: no message is fetched and no reaction user list is ever requested, and
+# every event costs a couple of dict lookups no matter how busy the server is.
+# Each person has one vote; reacting with another number moves it there.
+# A round closes after story.vote_seconds, or as soon as story.vote_quorum people have
+# voted, whichever comes first (see config.py).
+
+OPTION_EMOJIS = ('1️⃣', '2️⃣', '3️⃣', '4️⃣', '5️⃣', '6️⃣', '7️⃣', '8️⃣', '9️⃣')
+
+_EMOJI_OPTIONS = {emoji: option for option, emoji in enumerate(OPTION_EMOJIS, 1)}
+
+log = logging.getLogger(__name__)
+
+
+class VoteRound:
+    """The running tally for one choices message."""
+
+    __slots__ = ('message_id', 'channel_id', 'round_number', 'tallies', 'voters', 'quorum', 'timer')
+
+    def __init__(self, message_id, channel_id, round_number, option_count, quorum):
+        self.message_id = message_id
+        self.channel_id = channel_id
+        self.round_number = round_number
+        self.tallies = [0] * (option_count + 1)    # index 0 unused, so options index directly
+        self.voters = {}                            # user_id -> option
+        self.quorum = quorum
+        self.timer = None
+
+    @property
+    def option_count(self):
+        return len(self.tallies) - 1
+
+    def winner(self):
+        """The option with the most votes (ties broken at random), or None if nobody voted."""
+        if not self.voters:
+            return None
+        best = max(self.tallies)
+        return random.choice([option for option, votes in enumerate(self.tallies) if votes == best and option])
+
+
+class VoteBoard:
+    """
+    Keeps every open vote, keyed by its message so reaction events find theirs in O(1).
+    When a round closes, `on_close(vote_round)` is run as a task; the story cog sets it.
+    """
+
+    def __init__(self):
+        self.rounds = {}        # message_id -> VoteRound
+        self._by_channel = {}   # channel_id -> message_id of the channel's open round
+        self._tasks = set()
+        self.on_close = None
+
+    def open(self, message_id, channel_id, round_number, option_count, seconds=None, quorum=None):
+        """Starts a vote on a choices message. Any older vote in the channel is dropped."""
+        settings = config.current.story
+        seconds = settings.vote_seconds if seconds is None else seconds
+        quorum = settings.vote_quorum if quorum is None else quorum
+        self.discard_channel(channel_id)
+        vote_round = VoteRound(message_id, channel_id, round_number, min(option_count, len(OPTION_EMOJIS)), quorum)
+        vote_round.timer = asyncio.get_running_loop().call_later(seconds, self.close, message_id)
+        self.rounds[message_id] = vote_round
+        self._by_channel[channel_id] = message_id
+        return vote_round
+
+    def _option(self, vote_round, emoji):
+        option = _EMOJI_OPTIONS.get(emoji)
+        if option is None or option > vote_round.option_count:
+            return None
+        return option
+
+    def vote(self, message_id, user_id, emoji):
+        """Counts a reaction. Closes the round once it reaches its quorum."""
+        vote_round = self.rounds.get(message_id)
+        if vote_round is None:
+            return
+        option = self._option(vote_round, emoji)
+        if option is None:
+            return
+
+        previous = vote_round.voters.get(user_id)
+        if previous == option:
+            return
+        if previous is not None:
+            vote_round.tallies[previous] -= 1
+        vote_round.voters[user_id] = option
+        vote_round.tallies[option] += 1
+
+        if len(vote_round.voters) >= vote_round.quorum:
+            self.close(message_id)
+
+    def unvote(self, message_id, user_id, emoji):
+        """Takes back a reaction, if it is the one the user's vote currently sits on."""
+        vote_round = self.rounds.get(message_id)
+        if vote_round is None:
+            return
+        option = self._option(vote_round, emoji)
+        if option is not None and vote_round.voters.get(user_id) == option:
+            del vote_round.voters[user_id]
+            vote_round.tallies[option] -= 1
+
+    def _pop(self, message_id):
+        vote_round = self.rounds.pop(message_id, None)
+        if vote_round is None:
+            return None
+        if self._by_channel.get(vote_round.channel_id) == message_id:
+            del self._by_channel[vote_round.channel_id]
+        vote_round.timer.cancel()
+        return vote_round
+
+    def close(self, message_id):
+        """Ends a vote and hands the result to `on_close`."""
+        vote_round = self._pop(message_id)
+        if vote_round is None or self.on_close is None:
+            return
+        task = asyncio.get_running_loop().create_task(self.on_close(vote_round), name=f'vote-close-{message_id}')
+        self._tasks.add(task)
+        task.add_done_callback(self._finished)
+
+    def _finished(self, task):
+        self._tasks.discard(task)
+        if not task.cancelled() and task.exception() is not None:
+            log.error("Closing a vote failed", exc_info=task.exception())
+
+    def discard_channel(self, channel_id):
+        """Drops a channel's open vote without acting on it."""
+        message_id = self._by_channel.get(channel_id)
+        if message_id is not None:
+            self._pop(message_id)
+
+
+# The one vote board shared by every cog. It lives outside the extensions so reloads keep it.
+board = VoteBoard()
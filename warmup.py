@@ -0,0 +1,83 @@
+import asyncio
+import logging
+import time
+
+import aiohttp
+
+log = logging.getLogger(__name__)
+
+# --- Connection Warm-Up ---
+# DNS lookups, TCP and TLS handshakes would otherwise all happen inside the first story
+# turn after a deploy (or after the network hiccups). At startup, and again after errors
+# or reconnects, each endpoint gets a few cheap requests so a handful of keep-alive
+# connections sit ready in its pool; a periodic pass stops them from going stale.
+
+# Idle connections to keep open per endpoint
+MIN_IDLE_CONNECTIONS = 2
+# How long our connectors keep an idle connection, and how long they trust a DNS answer
+KEEPALIVE_SECONDS = 120.0
+DNS_CACHE_SECONDS = 600.0
+# Endpoints are warmed again this often, well before their idle connections expire
+REWARM_SECONDS = 60.0
+
+
+def make_connector(**kwargs):
+    """An aiohttp connector that holds on to idle connections and DNS answers. Needs a running loop."""
+    return aiohttp.TCPConnector(keepalive_timeout=KEEPALIVE_SECONDS, ttl_dns_cache=DNS_CACHE_SECONDS, **kwargs)
+
+
+class Warmer:
+    """
+    Keeps connections to our endpoints warm. Each target is a coroutine function
+    `warm(count)` that opens up to `count` connections and returns how many worked.
+    """
+
+    def __init__(self):
+        self.targets = {}   # name -> warm(count)
+        self._task = None
+        self._wake = None
+
+    def add(self, name, warm):
+        """Registers (or replaces, e.g. after a reload) the warm-up for an endpoint."""
+        self.targets[name] = warm
+
+    def start(self):
+        """Starts warming. Must be called from inside the running event loop."""
+        if self._task is not None and not self._task.done():
+            return
+        self._wake = asyncio.Event()
+        self._task = asyncio.get_running_loop().create_task(self._run(), name='connection-warmer')
+
+    def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+
+    def rewarm(self):
+        """Warms every endpoint again right away, e.g. after a network error."""
+        if self._wake is not None:
+            self._wake.set()
+
+    async def _run(self):
+        while True:
+            await self.warm_all()
+            try:
+                await asyncio.wait_for(self._wake.wait(), REWARM_SECONDS)
+            except asyncio.TimeoutError:
+                pass
+            self._wake.clear()
+
+    async def warm_all(self):
+        names = list(self.targets)
+        started = time.perf_counter()
+        results = await asyncio.gather(*(self.targets[name](MIN_IDLE_CONNECTIONS) for name in names), return_exceptions=True)
+        opened = {}
+        for name, result in zip(names, results):
+            if isinstance(result, Exception):
+                log.warning("Couldn't warm connections", extra={'endpoint': name, 'error': repr(result)})
+                result = 0
+            opened[name] = result
+        log.debug("Warmed connections", extra={'seconds': round(time.perf_counter() - started, 3), 'opened': opened})
+
+
+# The one warmer shared by the whole bot. It lives outside the extensions so reloads keep it.
+warmer = Warmer()